@@ -0,0 +1,336 @@
+"""
+Đo hiệu năng các thao tác chính trên dữ liệu giả lập: tải, lưu, tra cứu theo ID,
+sửa, xóa, tìm kiếm/lọc như trên giao diện và xuất báo cáo Excel
+
+Chạy từ thư mục gốc của dự án (không cần giao diện):
+    python -m benchmarks.farm_suite --sizes 1000,100000,1000000
+    python -m benchmarks.farm_suite --storage sqlite --output ket_qua.json
+    python -m benchmarks.farm_suite --compare benchmarks/results/truoc.json
+
+Kết quả được lưu ra file JSON để so sánh giữa các phiên bản.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+
+try:
+    import resource
+except ImportError:
+    # Windows: không có getrusage
+    resource = None
+
+from benchmarks.record_memory import PEOPLE, STATUSES, generate_activities
+from modules.activity_manager import ActivityManager
+from modules.animal_manager import AnimalManager
+from modules.auth import AuthManager, hash_password
+from modules.crop_manager import CropManager
+from modules.farm_stats import statistics_tables
+from modules.report_generator import ReportGenerator
+from modules.sqlite_storage import migrate_json_to_sqlite
+
+CROP_TYPES = ["Lúa", "Ngô", "Khoai lang", "Rau muống", "Cà chua", "Thanh long", "Cà phê"]
+ANIMAL_TYPES = ["Bò", "Lợn", "Gà", "Vịt", "Dê", "Cá"]
+CROP_STATUSES = ["Đang phát triển", "Sắp thu hoạch", "Đã thu hoạch"]
+ANIMAL_STATUSES = ["Khỏe mạnh", "Đang điều trị", "Đã xuất chuồng"]
+
+# Số lần lặp của các thao tác đo theo từng lần gọi
+LOOKUPS = 10000
+MUTATIONS = 1000
+QUERIES = 5
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+
+
+def _random_date(rng):
+    return f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2020, 2026)}"
+
+
+def generate_crops(count, seed=1):
+    """Sinh dữ liệu cây trồng giả lập"""
+    rng = random.Random(seed)
+    for i in range(1, count + 1):
+        crop_type = rng.choice(CROP_TYPES)
+        yield {
+            "id": i,
+            "name": f"{crop_type} thửa {rng.randint(1, 500)}",
+            "type": crop_type,
+            "planting_date": _random_date(rng),
+            "area": round(rng.uniform(0.1, 20), 2),
+            "status": rng.choice(CROP_STATUSES),
+            "notes": f"Ghi chú số {rng.randint(1, 10 ** 6)}",
+        }
+
+
+def generate_animals(count, seed=1):
+    """Sinh dữ liệu vật nuôi giả lập"""
+    rng = random.Random(seed)
+    for i in range(1, count + 1):
+        animal_type = rng.choice(ANIMAL_TYPES)
+        yield {
+            "id": i,
+            "name": f"Đàn {animal_type.lower()} số {rng.randint(1, 500)}",
+            "type": animal_type,
+            "entry_date": _random_date(rng),
+            "quantity": rng.randint(1, 2000),
+            "status": rng.choice(ANIMAL_STATUSES),
+            "notes": f"Ghi chú số {rng.randint(1, 10 ** 6)}",
+        }
+
+
+def generate_users(count, password_hash, seed=1):
+    """Sinh tài khoản giả lập, mọi tài khoản dùng chung một hash mật khẩu cho nhanh"""
+    rng = random.Random(seed)
+    for i in range(1, count + 1):
+        yield {
+            "username": f"congnhan{i}",
+            "password": password_hash,
+            "type": "admin" if rng.random() < 0.01 else "user",
+        }
+
+
+# Loại dữ liệu -> (lớp manager, hàm sinh dữ liệu, từ khóa tìm kiếm, bộ lọc như trên giao diện)
+DATASETS = {
+    "crops": (CropManager, generate_crops, "lua", {"status": CROP_STATUSES[0]}),
+    "animals": (AnimalManager, generate_animals, "bo", {"type": ANIMAL_TYPES[0], "status": ANIMAL_STATUSES[0]}),
+    "activities": (ActivityManager, generate_activities, "tuoi", {"status": STATUSES[0], "responsible": PEOPLE[0]}),
+}
+
+
+def _peak_rss_mb():
+    # Đỉnh bộ nhớ của cả tiến trình từ lúc chạy (ru_maxrss tính bằng KB trên Linux, byte
+    # trên macOS); None nếu hệ điều hành không hỗ trợ
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+class Recorder:
+    """
+    Đo thời gian và bộ nhớ của từng thao tác, gom kết quả theo loại dữ liệu và số dòng
+
+    Bộ nhớ của một thao tác là đỉnh bộ nhớ cấp phát (tracemalloc) trong lúc chạy, tính
+    thêm so với lúc bắt đầu; chỉ đo khi trace_memory vì tracemalloc làm chậm mọi thao tác.
+    """
+
+    def __init__(self, trace_memory):
+        self.trace_memory = trace_memory
+        self.results = []
+        if trace_memory:
+            tracemalloc.start()
+
+    def measure(self, dataset, rows, operation, func, count=1):
+        """
+        Chạy func một lần và ghi lại kết quả
+
+        Args:
+            count: Số thao tác func thực hiện (số bản ghi, số lần tra cứu...) để tính thông lượng
+        """
+        gc.collect()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        result = {
+            "dataset": dataset,
+            "rows": rows,
+            "operation": operation,
+            "count": count,
+            "seconds": elapsed,
+            "per_second": count / elapsed if elapsed > 0 else None,
+        }
+        memory = ""
+        if self.trace_memory:
+            result["traced_peak_mb"] = (tracemalloc.get_traced_memory()[1] - baseline) / 2 ** 20
+            memory = f"{result['traced_peak_mb']:>9.1f} MB"
+        self.results.append(result)
+        print(f"  {dataset:<11}{rows:>9} {operation:<18}{elapsed:>9.3f}s"
+              f"{result['per_second'] or 0:>14,.0f}/s{memory}")
+        return result
+
+
+def _write_dataset(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False)
+
+
+def run_dataset(recorder, name, rows, storage, compact, rng, report_dir):
+    manager_class, _, keyword, filters = DATASETS[name]
+
+    def new_manager():
+        return manager_class(storage=storage, db_path="data/farm.db", compact=compact)
+
+    manager = new_manager()
+    recorder.measure(name, rows, "load_data", manager.load_data, rows)
+
+    ids = [rng.randint(1, rows) for _ in range(min(LOOKUPS, rows))]
+    recorder.measure(name, rows, "get_by_id", lambda: [manager.get_record(i) for i in ids], len(ids))
+
+    # Sửa/xóa như trên giao diện: bản ghi mới thay cho bản cũ
+    targets = rng.sample(range(1, rows + 1), min(MUTATIONS, rows // 2))
+    updated = {}
+    for record_id in targets:
+        record = dict(manager.get_record(record_id))
+        record["notes" if "notes" in record else "description"] = f"Đã sửa {record_id}"
+        updated[record_id] = record
+    recorder.measure(name, rows, "update",
+                     lambda: [manager.update_record(i, record) for i, record in updated.items()], len(targets))
+    recorder.measure(name, rows, "save_data (sửa)", manager.save_data, len(targets))
+
+    deleted = rng.sample([i for i in range(1, rows + 1) if i not in updated], min(MUTATIONS, rows // 2))
+    recorder.measure(name, rows, "delete", lambda: [manager.delete_record(i) for i in deleted], len(deleted))
+    recorder.measure(name, rows, "save_data (xóa)", manager.save_data, len(deleted))
+
+    # Các truy vấn của ô tìm kiếm, bộ lọc và khoảng ngày trên màn hình quản lý
+    def keyword_search():
+        for _ in range(QUERIES):
+            len(manager.search(keyword))
+
+    def facet_filter():
+        for _ in range(QUERIES):
+            len(manager.filter_records(filters))
+
+    date_range = (date(2024, 1, 1), date(2024, 3, 31))
+
+    def date_filter():
+        for _ in range(QUERIES):
+            len(manager.records_between(*date_range))
+
+    def combined():
+        # Lọc trước rồi kiểm tra từ khóa trên kết quả đã thu hẹp như show_*_results
+        for _ in range(QUERIES):
+            [record for record in manager.filter_records(filters) if manager.matches_search(record, keyword)]
+
+    recorder.measure(name, rows, "search", keyword_search, QUERIES)
+    recorder.measure(name, rows, "filter", facet_filter, QUERIES)
+    recorder.measure(name, rows, "date_range", date_filter, QUERIES)
+    recorder.measure(name, rows, "search+filter", combined, QUERIES)
+
+    def excel_report():
+        data = manager.snapshot()
+        ReportGenerator.generate_excel_report(
+            data, name, filename=os.path.join(report_dir, f"{name}_{rows}.xlsx"), streaming=True,
+            statistics=statistics_tables(name, data))
+
+    recorder.measure(name, rows, "excel_report", excel_report, manager.totals.count())
+
+    if storage == "json":
+        # Nén nhật ký thành snapshot mới rồi tải lại từ snapshot
+        recorder.measure(name, rows, "compact", lambda: manager.storage.compact(background=False), rows)
+        reloaded = new_manager()
+        recorder.measure(name, rows, "load_data (nén)", reloaded.load_data, rows)
+
+
+def run_users(recorder, rows):
+    password_hash = hash_password("matkhau")
+    _write_dataset("data/users.json", list(generate_users(rows, password_hash)))
+    auth = AuthManager()
+    recorder.measure("users", rows, "load_users", auth.load_users, rows)
+    recorder.measure("users", rows, "login", lambda: auth.login(f"congnhan{rows}", "matkhau"), 1)
+    recorder.measure("users", rows, "register", lambda: auth.register_user("moi", "matkhau"), 1)
+
+
+def run_size(recorder, rows, storage, compact, datasets, seed):
+    print(f"{rows:,} dòng ({storage}{', dạng gọn' if compact else ''}):")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Các manager đọc/ghi thư mục data/ tương đối với thư mục hiện tại
+        os.chdir(tmp_dir)
+        try:
+            os.makedirs("data")
+            for name in DATASETS:
+                generate = DATASETS[name][1]
+                _write_dataset(f"data/{name}.json", list(generate(rows if name in datasets else 0, seed)))
+            if storage == "sqlite":
+                migrate_json_to_sqlite("data/farm.db")
+            rng = random.Random(seed)
+            for name in datasets:
+                if name == "users":
+                    run_users(recorder, rows)
+                else:
+                    run_dataset(recorder, name, rows, storage, compact, rng, tmp_dir)
+                gc.collect()
+        finally:
+            os.chdir(cwd)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_file):
+    """In tỉ lệ thời gian so với một lần chạy trước (< 1 là nhanh hơn)"""
+    with open(baseline_file, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(r["dataset"], r["rows"], r["operation"]): r for r in baseline["results"]}
+    print(f"So sánh với {baseline_file} ({baseline.get('revision') or 'không rõ phiên bản'}):")
+    for result in results:
+        old = previous.get((result["dataset"], result["rows"], result["operation"]))
+        if old is None or not old["seconds"]:
+            continue
+        ratio = result["seconds"] / old["seconds"]
+        print(f"  {result['dataset']:<11}{result['rows']:>9} {result['operation']:<18}"
+              f"{old['seconds']:>9.3f}s ->{result['seconds']:>9.3f}s  x{ratio:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Đo hiệu năng trên dữ liệu trang trại giả lập")
+    parser.add_argument("--sizes", default="1000,100000,1000000",
+                        help="Các số dòng cần đo, cách nhau bởi dấu phẩy")
+    parser.add_argument("--datasets", default="crops,animals,activities,users",
+                        help="Các loại dữ liệu cần đo (crops, animals, activities, users)")
+    parser.add_argument("--storage", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--compact-records", action="store_true", help="Giữ bản ghi ở dạng gọn (chỉ với JSON)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Đo đỉnh bộ nhớ cấp phát của từng thao tác bằng tracemalloc (chạy chậm hơn)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="File JSON lưu kết quả (mặc định benchmarks/results/<thời điểm>.json)")
+    parser.add_argument("--compare", metavar="FILE", help="File kết quả của lần chạy trước để so sánh")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    datasets = [name for name in args.datasets.split(",") if name]
+    unknown = [name for name in datasets if name not in DATASETS and name != "users"]
+    if unknown:
+        parser.error(f"Không có loại dữ liệu: {', '.join(unknown)}")
+
+    recorder = Recorder(args.trace_memory)
+    started = datetime.now()
+    for rows in sizes:
+        run_size(recorder, rows, args.storage, args.compact_records, datasets, args.seed)
+
+    output = args.output or os.path.join(RESULTS_DIR, started.strftime("%Y%m%d_%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "started": started.isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "options": vars(args),
+            "peak_rss_mb": _peak_rss_mb(),
+            "results": recorder.results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"Đã lưu kết quả vào {output}")
+
+    if args.compare:
+        compare(recorder.results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+So sánh bộ nhớ dùng cho danh sách hoạt động ở dạng dict và dạng gọn (CompactRecord)
+
+Chạy từ thư mục gốc của dự án:
+    python -m benchmarks.record_memory --rows 1000000
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from modules.activity_manager import ActivityManager
+from modules.compact_records import RecordCompactor
+from modules.json_storage import JsonStorage
+
+TYPES = ["Tưới nước", "Bón phân", "Phun thuốc", "Thu hoạch", "Cho ăn", "Tiêm phòng", "Vệ sinh chuồng"]
+STATUSES = ["Chưa thực hiện", "Đang thực hiện", "Hoàn thành"]
+PEOPLE = ["Nguyễn Văn An", "Trần Thị Bình", "Lê Văn Cường", "Phạm Thị Dung", "Hoàng Văn Em"]
+
+
+def generate_activities(count, seed=1):
+    """Sinh dữ liệu hoạt động giả lập có phân bố giống dữ liệu thật"""
+    rng = random.Random(seed)
+    for i in range(1, count + 1):
+        yield {
+            "id": i,
+            "name": f"{rng.choice(TYPES)} khu {rng.randint(1, 50)}",
+            "type": rng.choice(TYPES),
+            "date": f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2020, 2026)}",
+            "responsible": rng.choice(PEOPLE),
+            "status": rng.choice(STATUSES),
+            "description": f"Ghi chú số {rng.randint(1, 10 ** 6)}",
+        }
+
+
+def measure(data_file, record_factory):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    storage = JsonStorage(data_file, record_factory=record_factory)
+    storage.load()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(storage.records)
+    del storage
+    return {"records": count, "seconds": elapsed, "memory": current, "peak": peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Đo bộ nhớ của danh sách hoạt động")
+    parser.add_argument("--rows", type=int, default=100000, help="Số hoạt động giả lập")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_file = os.path.join(tmp_dir, "activities.json")
+        with open(data_file, "w", encoding="utf-8") as f:
+            json.dump(list(generate_activities(args.rows)), f, ensure_ascii=False)
+
+        compactor = RecordCompactor(ActivityManager.fields, ActivityManager.categorical_fields)
+        results = {
+            "dict": measure(data_file, None),
+            "compact": measure(data_file, compactor),
+        }
+
+    print(f"{'Dạng':<10}{'Bản ghi':>12}{'Thời gian tải':>16}{'Bộ nhớ':>14}{'Đỉnh':>14}")
+    for name, result in results.items():
+        print(f"{name:<10}{result['records']:>12}{result['seconds']:>15.2f}s"
+              f"{result['memory'] / 2 ** 20:>11.1f} MB{result['peak'] / 2 ** 20:>11.1f} MB")
+    saved = 1 - results["compact"]["memory"] / results["dict"]["memory"]
+    print(f"Dạng gọn tiết kiệm {saved:.0%} bộ nhớ")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
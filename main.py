@@ -1,10 +1,176 @@
-import tkinter as tk
-from views.gui import FarmManagementApp   # type: ignore
-
-def main():
-    root = tk.Tk()
-    app = FarmManagementApp(root)
-    root.mainloop()
-
-if __name__ == "__main__":
+import time
+_START = time.perf_counter()
+
+import argparse
+import os
+import sys
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# Các thư viện nặng chỉ nên được nạp khi dùng tới chức năng cần chúng
+HEAVY_MODULES = ("openpyxl", "numpy", "pandas", "lxml")
+
+class StartupProfile:
+    """Ghi lại thời gian từng giai đoạn khởi động và in bảng tổng kết"""
+
+    def __init__(self, start):
+        self.start = start
+        self.phases = [("xử lý tham số dòng lệnh", time.perf_counter() - start)]
+
+    @contextmanager
+    def phase(self, name):
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - begin))
+
+    def report(self):
+        total = time.perf_counter() - self.start
+        print("Thời gian khởi động:")
+        for name, seconds in self.phases:
+            print(f"  {name:<30} {seconds * 1000:8.1f} ms")
+        print(f"  {'tổng cộng':<30} {total * 1000:8.1f} ms")
+        loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+        print(f"Thư viện nặng đã nạp: {', '.join(loaded) if loaded else 'không có'}")
+
+class SessionProfile:
+    """
+    Đo cả phiên làm việc bằng cProfile (và tracemalloc nếu cần), ghi kết quả ra
+    thư mục khi thoát để gửi kèm báo cáo lỗi chậm
+
+    cProfile chỉ đo luồng chính (giao diện); thời gian các thao tác chạy trên luồng nền
+    (tải, lưu, xuất báo cáo) được ghi bằng modules.timing vào file .timings.json.
+    """
+
+    # Số hàm / vị trí cấp phát được liệt kê trong bản tóm tắt
+    TOP = 25
+
+    def __init__(self, directory, trace_memory=False):
+        import cProfile
+        self.directory = directory
+        self.trace_memory = trace_memory
+        self.name = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        from modules.timing import timings
+        timings.enabled = True
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start(10)
+        self.profiler.enable()
+
+    def stop(self):
+        """Dừng đo, ghi các file kết quả và in bản tóm tắt"""
+        self.profiler.disable()
+        import io
+        import pstats
+        from modules.timing import timings
+
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, self.name)
+        # File .prof mở được bằng pstats, snakeviz...
+        self.profiler.dump_stats(base + ".prof")
+        timings.dump(base + ".timings.json")
+
+        stream = io.StringIO()
+        pstats.Stats(self.profiler, stream=stream).sort_stats("cumulative").print_stats(self.TOP)
+        lines = ["Các hàm tốn thời gian nhất (tính cả hàm con, luồng chính):", stream.getvalue().strip()]
+        if self.trace_memory:
+            lines += self._memory_summary(base)
+        summary = "\n".join(lines)
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(summary + "\n")
+        print(summary)
+        print(f"Đã lưu kết quả đo vào {base}.*")
+
+    def _memory_summary(self, base):
+        import tracemalloc
+        # Chụp lúc thoát, khi dữ liệu và giao diện vẫn còn trong bộ nhớ
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        snapshot.dump(base + ".tracemalloc")
+        lines = [
+            f"Bộ nhớ cấp phát: hiện tại {current / 2 ** 20:.1f} MB, đỉnh {peak / 2 ** 20:.1f} MB",
+            "Các vị trí cấp phát nhiều bộ nhớ nhất (còn giữ lúc thoát):",
+        ]
+        lines += [f"  {stat}" for stat in snapshot.statistics("lineno")[:self.TOP]]
+        return lines
+
+def main():
+    parser = argparse.ArgumentParser(description="Hệ Thống Quản Lý Trang Trại")
+    parser.add_argument("--storage", choices=["json", "sqlite"], default="json",
+                        help="Nơi lưu dữ liệu: file JSON (mặc định) hoặc SQLite (data/farm.db)")
+    parser.add_argument("--compact-records", action="store_true",
+                        help="Giữ dữ liệu trong bộ nhớ ở dạng gọn, tiết kiệm RAM khi dữ liệu lớn (chỉ với JSON)")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="In thời gian từng giai đoạn khởi động (import, load_data, vẽ cửa sổ đầu tiên)")
+    parser.add_argument("--timings", action="store_true",
+                        help="Bật đo thời gian các thao tác ngay từ đầu (xem trong Hệ thống > Chẩn đoán hiệu năng)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Đo cả phiên làm việc bằng cProfile, lưu kết quả vào thư mục profiles/ khi thoát")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Dùng cùng --profile: đo thêm bộ nhớ cấp phát bằng tracemalloc (chạy chậm hơn)")
+    parser.add_argument("--profile-dir", default="profiles", help="Thư mục lưu kết quả của --profile")
+    parser.add_argument("--serve", action="store_true",
+                        help="Chạy máy chủ dữ liệu (không giao diện) cho nhiều máy dùng chung")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Địa chỉ máy chủ lắng nghe khi dùng --serve (0.0.0.0 để mở cho mạng nội bộ)")
+    parser.add_argument("--port", type=int, default=8765, help="Cổng của máy chủ khi dùng --serve")
+    parser.add_argument("--server", metavar="URL",
+                        help="Mở giao diện ở chế độ máy khách, dùng dữ liệu trên máy chủ (ví dụ http://192.168.1.10:8765)")
+    args = parser.parse_args()
+
+    session = SessionProfile(args.profile_dir, args.profile_memory) if args.profile else None
+    if session:
+        session.start()
+    try:
+        run(args)
+    finally:
+        if session:
+            session.stop()
+
+def run(args):
+    profile = StartupProfile(_START) if args.startup_profile else None
+    def phase(name):
+        return profile.phase(name) if profile else nullcontext()
+
+    if args.timings:
+        from modules.timing import timings
+        timings.enabled = True
+
+    if args.storage == "sqlite" and not args.server:
+        from modules.sqlite_storage import DEFAULT_DB_PATH, migrate_json_to_sqlite
+        if not os.path.exists(DEFAULT_DB_PATH):
+            # Lần đầu dùng SQLite: chuyển dữ liệu từ các file JSON hiện có
+            with phase("chuyển dữ liệu sang SQLite"):
+                migrate_json_to_sqlite(DEFAULT_DB_PATH)
+
+    if args.serve:
+        from modules.farm_service import run_server
+        os.makedirs("data", exist_ok=True)
+        run_server(args.host, args.port, storage=args.storage, compact=args.compact_records)
+        return
+
+    with phase("import tkinter"):
+        import tkinter as tk
+    with phase("import giao diện (views.gui)"):
+        from views.gui import FarmManagementApp   # type: ignore
+
+    with phase("tạo cửa sổ Tk"):
+        root = tk.Tk()
+    app = FarmManagementApp(root, storage=args.storage, startup_profile=profile,
+                            compact_records=args.compact_records, server=args.server)
+    if profile:
+        with phase("vẽ cửa sổ đầu tiên"):
+            root.update()
+        profile.report()
+    root.mainloop()
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
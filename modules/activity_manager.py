@@ -1,47 +1,39 @@
-import json
-import os
-
-class ActivityManager:
-    def __init__(self):
-        self.activities = []
-        self.data_file = "data/activities.json"
-    
-    def load_data(self):
-        """Tải dữ liệu hoạt động từ file JSON"""
-        try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, "r", encoding="utf-8") as f:
-                    self.activities = json.load(f)
-            else:
-                self.activities = []
-        except Exception as e:
-            self.activities = []
-            raise e
-    
-    def save_data(self):
-        """Lưu dữ liệu hoạt động vào file JSON"""
-        with open(self.data_file, "w", encoding="utf-8") as f:
-            json.dump(self.activities, f, ensure_ascii=False, indent=2)
-    
-    def add_activity(self, activity_data):
-        """Thêm hoạt động mới"""
-        self.activities.append(activity_data)
-    
-    def update_activity(self, activity_id, updated_data):
-        """Cập nhật thông tin hoạt động"""
-        for i, activity in enumerate(self.activities):
-            if activity["id"] == activity_id:
-                self.activities[i] = updated_data
-                return True
-        return False
-    
-    def delete_activity(self, activity_id):
-        """Xóa hoạt động"""
-        self.activities = [activity for activity in self.activities if activity["id"] != activity_id]
-    
-    def get_activity_by_id(self, activity_id):
-        """Lấy thông tin hoạt động theo ID"""
-        for activity in self.activities:
-            if activity["id"] == activity_id:
-                return activity
-        return None
\ No newline at end of file
+from modules.base_manager import BaseManager
+
+class ActivityManager(BaseManager):
+    table_name = "activities"
+    date_field = "date"
+    search_fields = ("name", "type", "responsible", "status")
+    fields = ("id", "name", "type", "date", "responsible", "status", "description")
+    categorical_fields = ("type", "status", "responsible", "date")
+    # Đếm theo ngày để biết số hoạt động mỗi ngày
+    count_fields = ("status", "type", "date")
+    facet_fields = ("status", "responsible")
+
+    @property
+    def activities(self):
+        return self.records
+
+    @activities.setter
+    def activities(self, value):
+        self.records = value
+    
+    def add_activity(self, activity_data):
+        """Thêm hoạt động mới"""
+        self.add_record(activity_data)
+    
+    def add_activities(self, activities_data):
+        """Thêm nhiều hoạt động cùng lúc (nhập dữ liệu hàng loạt)"""
+        self.add_records(activities_data)
+    
+    def update_activity(self, activity_id, updated_data):
+        """Cập nhật thông tin hoạt động"""
+        return self.update_record(activity_id, updated_data)
+    
+    def delete_activity(self, activity_id):
+        """Xóa hoạt động"""
+        return self.delete_record(activity_id)
+    
+    def get_activity_by_id(self, activity_id):
+        """Lấy thông tin hoạt động theo ID"""
+        return self.get_record(activity_id)
\ No newline at end of file
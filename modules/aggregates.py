@@ -0,0 +1,120 @@
+def to_number(value):
+    """Đọc số từ dữ liệu nhập tay ("1,5" -> 1.5); giá trị không hợp lệ tính là 0"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if value is None:
+        return 0.0
+    try:
+        return float(str(value).strip().replace(",", "."))
+    except ValueError:
+        return 0.0
+
+
+class RunningTotals:
+    """
+    Số liệu tổng hợp được cập nhật theo từng thay đổi: tổng số bản ghi, số bản ghi
+    theo giá trị của một số trường (trạng thái, loại, ngày) và tổng của các trường số
+
+    Dùng như một chỉ mục của storage (rebuild/add/remove). Trạng thái có thể được
+    lưu cùng dữ liệu (get_state/restore) để lần tải sau không phải tính lại.
+    """
+
+    # Tên dùng khi lưu trạng thái cùng dữ liệu
+    persist_name = "totals"
+
+    def __init__(self, count_fields=(), sum_fields=()):
+        """
+        Args:
+            count_fields: Các trường cần đếm số bản ghi theo từng giá trị
+            sum_fields: Các trường số cần tính tổng
+        """
+        self.count_fields = tuple(count_fields)
+        self.sum_fields = tuple(sum_fields)
+        self._source = []
+        self._state = None
+        # Tăng sau mỗi thay đổi, để nơi dùng biết kết quả tính từ dữ liệu đã cũ
+        self.version = 0
+
+    def rebuild(self, records):
+        # Chỉ tính lại khi cần, trừ khi trạng thái đã lưu được khôi phục (restore)
+        self._source = records
+        self._state = None
+        self.version += 1
+
+    def _empty_state(self):
+        return {
+            "count": 0,
+            "counts": {field: {} for field in self.count_fields},
+            "sums": {field: 0.0 for field in self.sum_fields},
+        }
+
+    def _apply(self, state, record, sign):
+        state["count"] += sign
+        for field in self.count_fields:
+            counts = state["counts"][field]
+            key = str(record.get(field) or "")
+            value = counts.get(key, 0) + sign
+            if value:
+                counts[key] = value
+            else:
+                del counts[key]
+        for field in self.sum_fields:
+            state["sums"][field] += sign * to_number(record.get(field))
+
+    def state_of(self, records):
+        """Tính trạng thái cho một danh sách bản ghi bất kỳ (dùng khi ghi snapshot)"""
+        state = self._empty_state()
+        for record in records:
+            self._apply(state, record, 1)
+        return state
+
+    def _built(self):
+        if self._state is None:
+            self._state = self.state_of(self._source)
+        return self._state
+
+    def is_built(self):
+        return self._state is not None
+
+    def add(self, record):
+        self.version += 1
+        if self._state is not None:
+            self._apply(self._state, record, 1)
+
+    def remove(self, record):
+        self.version += 1
+        if self._state is not None:
+            self._apply(self._state, record, -1)
+
+    def get_state(self):
+        """Trạng thái hiện tại (dạng JSON được) để lưu cùng dữ liệu"""
+        return self._built()
+
+    def restore(self, state):
+        """Khôi phục trạng thái đã lưu; trả về False nếu không khớp cấu hình hiện tại"""
+        if (not isinstance(state, dict)
+                or set(state.get("counts", {})) != set(self.count_fields)
+                or set(state.get("sums", {})) != set(self.sum_fields)):
+            return False
+        self._state = {
+            "count": state["count"],
+            "counts": {field: dict(counts) for field, counts in state["counts"].items()},
+            "sums": dict(state["sums"]),
+        }
+        return True
+
+    def count(self):
+        """Tổng số bản ghi"""
+        return self._built()["count"]
+
+    def counts(self, field):
+        """Số bản ghi theo từng giá trị của trường (dict giá trị -> số bản ghi)"""
+        return dict(self._built()["counts"][field])
+
+    def count_of(self, field, value):
+        """Số bản ghi có trường field bằng value"""
+        return self._built()["counts"][field].get(str(value or ""), 0)
+
+    def total(self, field):
+        """Tổng của một trường số"""
+        return self._built()["sums"][field]
\ No newline at end of file
@@ -1,103 +1,254 @@
-import json
-import os
-from hashlib import sha256
-
-class AuthManager:
-    def __init__(self):
-        self.users = []
-        self.current_user = None
-        self.users_file = "data/users.json"
-    
-    def load_users(self):
-        try:
-            if os.path.exists(self.users_file):
-                with open(self.users_file, "r", encoding="utf-8") as f:
-                    try:
-                        self.users = json.load(f)
-                        # Đảm bảo users là một list
-                        if not isinstance(self.users, list):
-                            self.users = []
-                    except json.JSONDecodeError:
-                        # Nếu file trống hoặc không hợp lệ, khởi tạo danh sách trống
-                        self.users = []
-            else:
-                # Tạo thư mục data nếu chưa tồn tại
-                os.makedirs(os.path.dirname(self.users_file), exist_ok=True)
-                # Tạo admin mặc định nếu file không tồn tại
-                self.users = [
-                    {
-                        "username": "admin",
-                        "password": self.hash_password("admin123"),
-                        "type": "admin"
-                    }
-                ]
-                self.save_users()
-        except Exception as e:
-            print(f"Error loading users: {str(e)}")
-            self.users = []
-    
-    def save_users(self):
-        """Lưu danh sách người dùng vào file JSON"""
-        with open(self.users_file, "w", encoding="utf-8") as f:
-            json.dump(self.users, f, ensure_ascii=False, indent=2)
-    
-    def hash_password(self, password):
-        """Mã hóa mật khẩu"""
-        #return sha256(password.encode("utf-8")).hexdigest()
-        return password
-    
-    def register_user(self, username, password, user_type="user"):
-        """Đăng ký người dùng mới"""
-        # Kiểm tra username đã tồn tại chưa
-        for user in self.users:
-            if user["username"] == username:
-                return {
-                    "success": False,
-                    "message": "Tên đăng nhập đã tồn tại"
-                }
-        
-        # Thêm người dùng mới
-        new_user = {
-            "username": username,
-            "password": self.hash_password(password),
-            "type": user_type
-        }
-        self.users.append(new_user)
-        self.save_users()
-        
-        return {
-            "success": True,
-            "message": "Đăng ký thành công"
-        }
-    
-    def login(self, username, password):
-        """Đăng nhập"""
-        for user in self.users:
-            if user["username"] == username and user["password"] == self.hash_password(password):
-                self.current_user = user
-                return {
-                    "success": True,
-                    "message": "Đăng nhập thành công",
-                    "user": user
-                }
-        
-        return {
-            "success": False,
-            "message": "Tên đăng nhập hoặc mật khẩu không đúng"
-        }
-    
-    def change_password(self, username, current_password, new_password):
-        """Đổi mật khẩu"""
-        for user in self.users:
-            if user["username"] == username and user["password"] == self.hash_password(current_password):
-                user["password"] = self.hash_password(new_password)
-                self.save_users()
-                return {
-                    "success": True,
-                    "message": "Đổi mật khẩu thành công"
-                }
-        
-        return {
-            "success": False,
-            "message": "Mật khẩu hiện tại không đúng"
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+
+from modules.json_storage import write_json_atomic
+
+# Mật khẩu được lưu dạng "pbkdf2_sha256$<số vòng lặp>$<salt>$<hash>"
+PASSWORD_SCHEME = "pbkdf2_sha256"
+# Thời gian mong muốn cho một lần kiểm tra mật khẩu; số vòng lặp được đo theo máy đang chạy
+TARGET_HASH_SECONDS = 0.1
+MIN_ITERATIONS = 100_000
+
+_calibrated_iterations = None
+
+
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+
+
+def calibrate_iterations(target=TARGET_HASH_SECONDS):
+    """
+    Số vòng lặp PBKDF2 để một lần băm mất khoảng target giây trên máy này
+
+    Kết quả được đo một lần cho mỗi tiến trình và không nhỏ hơn MIN_ITERATIONS.
+    """
+    global _calibrated_iterations
+    if _calibrated_iterations is None:
+        sample = 20_000
+        start = time.perf_counter()
+        _pbkdf2("calibrate", b"calibrate-salt", sample)
+        elapsed = max(time.perf_counter() - start, 1e-6)
+        iterations = int(sample * target / elapsed) // 1000 * 1000
+        _calibrated_iterations = max(iterations, MIN_ITERATIONS)
+    return _calibrated_iterations
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def hash_password(password, iterations=None):
+    """Băm mật khẩu bằng PBKDF2-SHA256 với salt ngẫu nhiên"""
+    iterations = iterations or calibrate_iterations()
+    salt = os.urandom(16)
+    return f"{PASSWORD_SCHEME}${iterations}${_b64(salt)}${_b64(_pbkdf2(password, salt, iterations))}"
+
+
+def _parse_hash(stored):
+    # (số vòng lặp, salt, hash) hoặc None nếu là mật khẩu dạng cũ (chưa băm)
+    parts = stored.split("$") if isinstance(stored, str) else []
+    if len(parts) != 4 or parts[0] != PASSWORD_SCHEME:
+        return None
+    try:
+        return int(parts[1]), base64.b64decode(parts[2]), base64.b64decode(parts[3])
+    except ValueError:
+        return None
+
+
+def verify_password(password, stored):
+    """Kiểm tra mật khẩu với giá trị đã lưu (hash PBKDF2 hoặc mật khẩu dạng cũ)"""
+    parsed = _parse_hash(stored)
+    if parsed is None:
+        return hmac.compare_digest(str(stored).encode("utf-8"), password.encode("utf-8"))
+    iterations, salt, expected = parsed
+    return hmac.compare_digest(_pbkdf2(password, salt, iterations), expected)
+
+
+def needs_rehash(stored):
+    """
+    Mật khẩu đã lưu có cần băm lại không: dạng cũ chưa băm, hoặc số vòng lặp
+    thấp hơn nhiều so với mức đo được trên máy hiện tại
+    """
+    parsed = _parse_hash(stored)
+    # Cho phép chênh lệch gấp đôi để kết quả đo dao động không làm băm lại ở mỗi lần đăng nhập
+    return parsed is None or parsed[0] * 2 < calibrate_iterations()
+
+
+LOGIN_SUCCESS = "Đăng nhập thành công"
+LOGIN_FAILED = "Tên đăng nhập hoặc mật khẩu không đúng"
+USERNAME_TAKEN = "Tên đăng nhập đã tồn tại"
+WRONG_PASSWORD = "Mật khẩu hiện tại không đúng"
+
+
+class AuthManager:
+    def __init__(self):
+        self.users = []
+        # Tên đăng nhập -> người dùng, để tra cứu không phải duyệt cả danh sách
+        self._users_by_name = {}
+        self.current_user = None
+        self.users_file = "data/users.json"
+        # Có thay đổi chưa được ghi ra file hay không
+        self.dirty = False
+        # Hash giả để đăng nhập bằng tên không tồn tại mất cùng thời gian như tên có thật
+        self._dummy_hash = None
+    
+    def load_users(self):
+        try:
+            if os.path.exists(self.users_file):
+                with open(self.users_file, "r", encoding="utf-8") as f:
+                    try:
+                        self.users = json.load(f)
+                        # Đảm bảo users là một list
+                        if not isinstance(self.users, list):
+                            self.users = []
+                    except json.JSONDecodeError:
+                        # Nếu file trống hoặc không hợp lệ, khởi tạo danh sách trống
+                        self.users = []
+            else:
+                # Tạo thư mục data nếu chưa tồn tại
+                os.makedirs(os.path.dirname(self.users_file), exist_ok=True)
+                # Tạo admin mặc định nếu file không tồn tại
+                self.users = [
+                    {
+                        "username": "admin",
+                        "password": self.hash_password("admin123"),
+                        "type": "admin"
+                    }
+                ]
+                self.save_users()
+        except Exception as e:
+            print(f"Error loading users: {str(e)}")
+            self.users = []
+        self._index_users()
+    
+    def _index_users(self):
+        self._users_by_name = {user.get("username"): user for user in self.users}
+    
+    def get_user(self, username):
+        """Tìm người dùng theo tên đăng nhập (None nếu không có)"""
+        return self._users_by_name.get(username)
+    
+    def save_users(self):
+        """Lưu danh sách người dùng vào file JSON (ghi file tạm rồi đổi tên)"""
+        write_json_atomic(self.users_file, self.users, indent=2)
+        self.dirty = False
+    
+    def hash_password(self, password):
+        """Mã hóa mật khẩu"""
+        return hash_password(password)
+    
+    def verify_password(self, password, stored):
+        """
+        Kiểm tra mật khẩu với giá trị đã lưu, không thay đổi dữ liệu
+
+        stored là None (không có người dùng) vẫn tính một hash giả để thời gian
+        trả lời không để lộ tên đăng nhập nào tồn tại.
+        """
+        if stored is None:
+            if self._dummy_hash is None:
+                self._dummy_hash = hash_password("")
+            verify_password(password, self._dummy_hash)
+            return False
+        return verify_password(password, stored)
+    
+    def set_password_hash(self, user, stored, new_hash):
+        """Thay mật khẩu đã băm lại, bỏ qua nếu mật khẩu đã bị đổi kể từ khi đọc stored"""
+        if user["password"] != stored:
+            return
+        user["password"] = new_hash
+        self.dirty = True
+        try:
+            self.save_users()
+        except OSError as e:
+            # Vẫn cho đăng nhập, lần lưu sau sẽ ghi mật khẩu đã băm
+            print(f"Error saving users: {str(e)}")
+    
+    def _check_password(self, user, password):
+        # Kiểm tra mật khẩu; mật khẩu dạng cũ (chưa băm) được băm lại ngay khi đúng
+        stored = user["password"] if user is not None else None
+        if not self.verify_password(password, stored):
+            return False
+        if needs_rehash(stored):
+            self.set_password_hash(user, stored, self.hash_password(password))
+        return True
+    
+    def register_user(self, username, password, user_type="user"):
+        """Đăng ký người dùng mới"""
+        # Kiểm tra trước để không phải băm mật khẩu khi tên đã có người dùng
+        if self.get_user(username) is not None:
+            return {
+                "success": False,
+                "message": USERNAME_TAKEN
+            }
+        return self.add_user(username, self.hash_password(password), user_type)
+    
+    def add_user(self, username, password_hash, user_type="user"):
+        """Thêm người dùng với mật khẩu đã băm (hash_password)"""
+        # Kiểm tra username đã tồn tại chưa
+        if self.get_user(username) is not None:
+            return {
+                "success": False,
+                "message": USERNAME_TAKEN
+            }
+        
+        # Thêm người dùng mới
+        new_user = {
+            "username": username,
+            "password": password_hash,
+            "type": user_type
+        }
+        self.users.append(new_user)
+        self._users_by_name[username] = new_user
+        self.dirty = True
+        self.save_users()
+        
+        return {
+            "success": True,
+            "message": "Đăng ký thành công"
+        }
+    
+    def login(self, username, password):
+        """Đăng nhập"""
+        user = self.get_user(username)
+        if self._check_password(user, password):
+            self.current_user = user
+            return {
+                "success": True,
+                "message": LOGIN_SUCCESS,
+                "user": user
+            }
+        
+        return {
+            "success": False,
+            "message": LOGIN_FAILED
+        }
+    
+    def change_password(self, username, current_password, new_password):
+        """Đổi mật khẩu"""
+        user = self.get_user(username)
+        if self._check_password(user, current_password):
+            return self.replace_password(user, user["password"], self.hash_password(new_password))
+        
+        return {
+            "success": False,
+            "message": WRONG_PASSWORD
+        }
+    
+    def replace_password(self, user, stored, new_hash):
+        """Đổi mật khẩu sang new_hash nếu mật khẩu đã lưu vẫn là stored (chưa bị đổi ở nơi khác)"""
+        if user["password"] != stored:
+            return {
+                "success": False,
+                "message": "Mật khẩu vừa bị thay đổi, vui lòng thử lại"
+            }
+        user["password"] = new_hash
+        self.dirty = True
+        self.save_users()
+        return {
+            "success": True,
+            "message": "Đổi mật khẩu thành công"
         }
\ No newline at end of file
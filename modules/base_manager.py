@@ -0,0 +1,233 @@
+from modules.aggregates import RunningTotals
+from modules.compact_records import RecordCompactor
+from modules.date_index import DateIndex, in_range
+from modules.facet_index import FacetIndex
+from modules.json_storage import JsonStorage
+from modules.search_index import SearchIndex, matches_query
+from modules.sqlite_storage import DEFAULT_DB_PATH, SQLiteStorage
+from modules.timing import timed
+
+class BaseManager:
+    """Lớp cơ sở cho các module quản lý dữ liệu, phần lưu trữ được ủy quyền cho storage"""
+
+    # Các lớp con khai báo tên bảng/file dữ liệu, trường ngày, các trường tìm kiếm,
+    # danh sách trường của bản ghi, các trường có ít giá trị khác nhau (loại, trạng thái...)
+    # các trường cần đếm theo giá trị / tính tổng trong số liệu tổng hợp
+    # và các trường có bộ lọc trên màn hình quản lý
+    table_name = None
+    date_field = None
+    search_fields = ()
+    fields = ()
+    categorical_fields = ()
+    count_fields = ("status", "type")
+    sum_fields = ()
+    facet_fields = ("type", "status")
+
+    def __init__(self, storage="json", db_path=DEFAULT_DB_PATH, compact=False):
+        """
+        Args:
+            storage: 'json' (file data/<bảng>.json), 'sqlite' hoặc một đối tượng storage có sẵn
+            db_path: Đường dẫn file SQLite khi storage='sqlite'
+            compact: Giữ bản ghi trong bộ nhớ ở dạng gọn (CompactRecord) thay vì dict (chỉ với JSON)
+        """
+        # Chỉ mục tìm kiếm trong bộ nhớ chỉ cần khi dữ liệu nằm trong bộ nhớ (JSON)
+        self.search_index = SearchIndex(self.search_fields)
+        self.totals = RunningTotals(self.count_fields, self.sum_fields)
+        self.date_index = DateIndex(self.date_field)
+        self.facet_index = FacetIndex(self.facet_fields)
+        if storage == "json":
+            record_factory = RecordCompactor(self.fields, self.categorical_fields) if compact else None
+            storage = JsonStorage(f"data/{self.table_name}.json",
+                                  [self.search_index, self.totals, self.date_index, self.facet_index],
+                                  record_factory)
+        elif storage == "sqlite":
+            # SQLite lọc và tra khoảng ngày bằng chỉ mục của chính nó, chỉ giữ số liệu tổng hợp trong bộ nhớ
+            storage = SQLiteStorage(db_path, self.table_name, self.date_field, self.search_fields,
+                                    [self.totals], self.facet_fields)
+        if self.search_index not in getattr(storage, "indexes", ()):
+            self.search_index = None
+        if self.totals not in getattr(storage, "indexes", ()):
+            # Storage có thể tự cung cấp số liệu tổng hợp (ví dụ máy chủ ở chế độ máy khách)
+            self.totals = getattr(storage, "totals", None)
+        if self.date_index not in getattr(storage, "indexes", ()):
+            self.date_index = None
+        if self.facet_index not in getattr(storage, "indexes", ()):
+            self.facet_index = None
+        self.storage = storage
+        # Chỉ được ghi khi dữ liệu đã tải xong, tránh ghi đè file bằng danh sách rỗng
+        self.loaded = False
+
+    @property
+    def records(self):
+        return self.storage.records
+
+    @records.setter
+    def records(self, value):
+        self.storage.records = value
+
+    @timed()
+    def load_data(self):
+        """Tải dữ liệu từ nơi lưu trữ"""
+        self.loaded = False
+        self.storage.load()
+        if self.totals is not None:
+            # Tính sẵn số liệu tổng hợp trên luồng tải nếu chưa có bản đã lưu
+            self.totals.count()
+        self.loaded = True
+
+    @property
+    def dirty(self):
+        """Có thay đổi chưa được lưu hay không"""
+        return self.loaded and getattr(self.storage, "dirty", True)
+
+    def check_changes(self):
+        """
+        Đọc các thay đổi do tiến trình hoặc máy khác ghi vào nơi lưu trữ (chạy được trên luồng nền)
+
+        Returns:
+            None nếu không có gì mới, ngược lại là thay đổi cần truyền cho apply_changes
+        """
+        if not self.loaded or not hasattr(self.storage, "check_changes"):
+            return None
+        return self.storage.check_changes()
+
+    @timed()
+    def apply_changes(self, changes):
+        """
+        Áp dụng kết quả của check_changes (trên luồng đang dùng dữ liệu, tức luồng giao diện)
+
+        Returns:
+            Danh sách ID các bản ghi đã thay đổi, hoặc None nếu dữ liệu đã được tải lại toàn bộ
+        """
+        return self.storage.apply_changes(changes)
+
+    def refresh(self):
+        """Nạp các thay đổi do tiến trình hoặc máy khác ghi (check_changes rồi apply_changes)"""
+        changes = self.check_changes()
+        return [] if changes is None else self.apply_changes(changes)
+
+    @timed()
+    def save_data(self):
+        """Lưu các thay đổi chưa được ghi (bỏ qua nếu dữ liệu chưa được tải hoặc không có thay đổi)"""
+        if not self.dirty:
+            return
+        self.storage.save()
+
+    def change_stamp(self):
+        """
+        Giá trị đổi sau mỗi thay đổi dữ liệu, để biết kết quả đã tính sẵn còn dùng được không
+
+        Returns:
+            None nếu không theo dõi được thay đổi (ví dụ dữ liệu trên máy chủ)
+        """
+        return getattr(self.totals, "version", None)
+
+    def next_id(self):
+        """Cấp ID mới (lớn hơn mọi ID đã có)"""
+        return self.storage.next_id()
+
+    def allocate_ids(self, count):
+        """Cấp một khối ID liên tiếp"""
+        return self.storage.allocate_ids(count)
+
+    @timed()
+    def add_record(self, record):
+        self.storage.add(record)
+
+    @timed()
+    def add_records(self, records):
+        self.storage.add_many(records)
+
+    @timed()
+    def update_record(self, record_id, updated_data):
+        return self.storage.update(record_id, updated_data)
+
+    @timed()
+    def delete_record(self, record_id):
+        return self.storage.delete(record_id)
+
+    def get_record(self, record_id):
+        return self.storage.get(record_id)
+
+    @timed()
+    def snapshot(self, date_range=None):
+        """
+        Bản chụp dữ liệu hiện tại, an toàn để đọc từ luồng nền
+
+        Args:
+            date_range: (từ ngày, đến ngày) để chỉ lấy các bản ghi trong khoảng đó
+        """
+        if date_range is not None:
+            return self.records_between(*date_range)
+        return self.storage.snapshot()
+
+    @timed()
+    def records_between(self, start=None, end=None):
+        """
+        Các bản ghi có ngày (date_field) trong khoảng [start, end], sắp xếp theo ngày
+        (theo ID nếu storage tự truy vấn khoảng ngày, ví dụ SQLite)
+
+        Args:
+            start, end: datetime.date, None là không giới hạn
+        """
+        if self.date_index is None:
+            if hasattr(self.storage, "records_between"):
+                return self.storage.records_between(start, end)
+            return [record for record in self.records if in_range(record.get(self.date_field, ""), start, end)]
+        return [self.get_record(record_id) for record_id in self.date_index.ids_between(start, end)]
+
+    @timed()
+    def facet_values(self, field):
+        """Các giá trị đang có của một trường lọc (dùng cho danh sách chọn)"""
+        if self.facet_index is None:
+            return self.storage.facet_values(field)
+        return self.facet_index.values(field)
+
+    @timed()
+    def filter_records(self, filters):
+        """
+        Lọc theo giá trị các trường phân loại, các điều kiện kết hợp theo kiểu AND
+
+        Args:
+            filters: dict trường -> giá trị, ví dụ {"type": "Lúa", "status": "Đang phát triển"}
+
+        Returns:
+            Danh sách bản ghi khớp, sắp xếp theo ID
+        """
+        if not filters:
+            return self.records
+        if self.facet_index is None:
+            return self.storage.filter(filters)
+        return [self.get_record(record_id) for record_id in self.facet_index.ids_matching(filters)]
+
+    @timed()
+    def search(self, query):
+        """
+        Tìm kiếm không phân biệt dấu theo tiền tố từ ("lua" tìm thấy "Lúa")
+
+        Returns:
+            Danh sách bản ghi khớp, sắp xếp theo ID
+        """
+        if self.search_index is None:
+            return self.storage.search(query)
+        ids = self.search_index.search(query)
+        if ids is None:
+            return self.records
+        return [self.get_record(record_id) for record_id in sorted(ids)]
+
+    def iter_search(self, query):
+        """
+        Như search() nhưng các bản ghi tìm được trong bộ nhớ được trả về dần (iterator),
+        để giao diện lấy theo từng phần mà không bị đứng; storage tự tìm kiếm (SQLite,
+        máy chủ) trả về danh sách truy vấn theo nhu cầu như search()
+        """
+        if self.search_index is None:
+            return self.storage.search(query)
+        ids = self.search_index.search(query)
+        if ids is None:
+            return self.records
+        return (self.get_record(record_id) for record_id in sorted(ids))
+
+    def matches_search(self, record, query):
+        """Kiểm tra một bản ghi có khớp truy vấn tìm kiếm không"""
+        return matches_query(record, self.search_fields, query)
\ No newline at end of file
@@ -0,0 +1,108 @@
+import sys
+from collections.abc import Mapping
+
+class CompactRecord(Mapping):
+    """
+    Bản ghi chỉ đọc lưu giá trị trong __slots__ thay vì dict
+
+    Dùng được như dict khi đọc (record["id"], record.get(...), dict(record)).
+    Trường không có trong bản ghi gốc thì để trống slot nên vòng
+    dict -> CompactRecord -> dict giữ nguyên nội dung.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _field_set = frozenset()
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self._field_set:
+            return getattr(self, key, default)
+        return default
+
+    def __contains__(self, key):
+        return key in self._field_set and hasattr(self, key)
+
+    def __iter__(self):
+        for field in self._fields:
+            if hasattr(self, field):
+                yield field
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Bản ghi chỉ đọc, hãy cập nhật bằng bản ghi mới")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __reduce__(self):
+        return (_rebuild, (self._fields, dict(self)))
+
+
+_record_classes = {}
+
+
+def record_class(fields):
+    """Lớp bản ghi có slot cho đúng các trường đã cho (dùng chung cho cùng bộ trường)"""
+    fields = tuple(fields)
+    cls = _record_classes.get(fields)
+    if cls is None:
+        reserved = [field for field in fields if not field.isidentifier() or hasattr(CompactRecord, field)]
+        if reserved:
+            raise ValueError(f"Tên trường không dùng được cho bản ghi gọn: {', '.join(reserved)}")
+        cls = type("CompactRecord_" + "_".join(fields), (CompactRecord,), {
+            "__slots__": fields,
+            "_fields": fields,
+            "_field_set": frozenset(fields),
+        })
+        _record_classes[fields] = cls
+    return cls
+
+
+def _rebuild(fields, values):
+    cls = record_class(fields)
+    record = cls.__new__(cls)
+    for key, value in values.items():
+        object.__setattr__(record, key, value)
+    return record
+
+
+class RecordCompactor:
+    """
+    Chuyển dict thành CompactRecord và intern các chuỗi lặp lại nhiều
+    (loại, trạng thái, người phụ trách, ngày) để mọi bản ghi dùng chung một đối tượng chuỗi
+    """
+
+    def __init__(self, fields, categorical_fields=()):
+        """
+        Args:
+            fields: Các trường của bản ghi, theo thứ tự
+            categorical_fields: Các trường có ít giá trị khác nhau, được intern
+        """
+        self.cls = record_class(fields)
+        self.field_set = self.cls._field_set
+        self.categorical_fields = tuple(categorical_fields)
+
+    def __call__(self, data):
+        if isinstance(data, self.cls):
+            return data
+        if not self.field_set.issuperset(data):
+            # Bản ghi có trường lạ: giữ nguyên dạng dict
+            return data
+        record = self.cls.__new__(self.cls)
+        for key, value in data.items():
+            object.__setattr__(record, key, value)
+        for field in self.categorical_fields:
+            value = data.get(field)
+            if type(value) is str:
+                object.__setattr__(record, field, sys.intern(value))
+        return record
\ No newline at end of file
@@ -1,47 +1,37 @@
-import json
-import os
-
-class CropManager:
-    def __init__(self):
-        self.crops = []
-        self.data_file = "data/crops.json"
-    
-    def load_data(self):
-        """Tải dữ liệu cây trồng từ file JSON"""
-        try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, "r", encoding="utf-8") as f:
-                    self.crops = json.load(f)
-            else:
-                self.crops = []
-        except Exception as e:
-            self.crops = []
-            raise e
-    
-    def save_data(self):
-        """Lưu dữ liệu cây trồng vào file JSON"""
-        with open(self.data_file, "w", encoding="utf-8") as f:
-            json.dump(self.crops, f, ensure_ascii=False, indent=2)
-    
-    def add_crop(self, crop_data):
-        """Thêm cây trồng mới"""
-        self.crops.append(crop_data)
-    
-    def update_crop(self, crop_id, updated_data):
-        """Cập nhật thông tin cây trồng"""
-        for i, crop in enumerate(self.crops):
-            if crop["id"] == crop_id:
-                self.crops[i] = updated_data
-                return True
-        return False
-    
-    def delete_crop(self, crop_id):
-        """Xóa cây trồng"""
-        self.crops = [crop for crop in self.crops if crop["id"] != crop_id]
-    
-    def get_crop_by_id(self, crop_id):
-        """Lấy thông tin cây trồng theo ID"""
-        for crop in self.crops:
-            if crop["id"] == crop_id:
-                return crop
-        return None
\ No newline at end of file
+from modules.base_manager import BaseManager
+
+class CropManager(BaseManager):
+    table_name = "crops"
+    date_field = "planting_date"
+    search_fields = ("name", "type", "status")
+    fields = ("id", "name", "type", "planting_date", "area", "status", "notes")
+    categorical_fields = ("type", "status", "planting_date")
+    sum_fields = ("area",)
+
+    @property
+    def crops(self):
+        return self.records
+
+    @crops.setter
+    def crops(self, value):
+        self.records = value
+    
+    def add_crop(self, crop_data):
+        """Thêm cây trồng mới"""
+        self.add_record(crop_data)
+    
+    def add_crops(self, crops_data):
+        """Thêm nhiều cây trồng cùng lúc (nhập dữ liệu hàng loạt)"""
+        self.add_records(crops_data)
+    
+    def update_crop(self, crop_id, updated_data):
+        """Cập nhật thông tin cây trồng"""
+        return self.update_record(crop_id, updated_data)
+    
+    def delete_crop(self, crop_id):
+        """Xóa cây trồng"""
+        return self.delete_record(crop_id)
+    
+    def get_crop_by_id(self, crop_id):
+        """Lấy thông tin cây trồng theo ID"""
+        return self.get_record(crop_id)
\ No newline at end of file
@@ -0,0 +1,148 @@
+import calendar
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+# Khóa trong chỉ mục: (số ngày << ID_BITS) | id, để sắp xếp theo ngày rồi theo ID bằng một số nguyên
+ID_BITS = 32
+
+
+@lru_cache(maxsize=65536)
+def parse_date(text):
+    """Đọc ngày dạng dd/mm/yyyy (hoặc yyyy-mm-dd); trả về None nếu không hợp lệ"""
+    text = str(text).strip()
+    for fmt in ("%d/%m/%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def month_range(year, month):
+    """Ngày đầu và ngày cuối của một tháng"""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def week_range(day=None):
+    """Thứ hai và chủ nhật của tuần chứa ngày day (mặc định hôm nay)"""
+    day = day or date.today()
+    monday = day - timedelta(days=day.weekday())
+    return monday, monday + timedelta(days=6)
+
+
+def parse_bound(text, end=False):
+    """
+    Đọc một đầu của khoảng ngày do người dùng nhập
+
+    Chấp nhận dd/mm/yyyy hoặc mm/yyyy (cả tháng: ngày đầu tháng nếu là đầu
+    khoảng, ngày cuối tháng nếu là cuối khoảng). Chuỗi rỗng là không giới hạn.
+
+    Raises:
+        ValueError: Nếu không đọc được
+    """
+    text = text.strip()
+    if not text:
+        return None
+    day = parse_date(text)
+    if day is not None:
+        return day
+    try:
+        month = datetime.strptime(text, "%m/%Y")
+    except ValueError:
+        raise ValueError(f"Ngày không hợp lệ: {text} (dùng dd/mm/yyyy hoặc mm/yyyy)")
+    first, last = month_range(month.year, month.month)
+    return last if end else first
+
+
+def in_range(value, start, end):
+    """Kiểm tra một ngày (chuỗi) có nằm trong khoảng [start, end] không (None là không giới hạn)"""
+    day = parse_date(value)
+    if day is None:
+        return False
+    return (start is None or day >= start) and (end is None or day <= end)
+
+
+class DateIndex:
+    """
+    Chỉ mục ngày -> ID được giữ đã sắp xếp, trả lời truy vấn theo khoảng ngày
+    bằng tìm kiếm nhị phân thay vì duyệt toàn bộ danh sách
+
+    Ngày được đọc từ chuỗi một lần khi tạo chỉ mục. Bản ghi không có ngày hợp lệ
+    (hoặc ID không phải số nguyên) không nằm trong chỉ mục. Chỉ mục chỉ được
+    tạo ở lần truy vấn đầu tiên.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self._source = []
+        self._keys = None
+
+    def _key(self, record):
+        record_id = record.get("id")
+        if not isinstance(record_id, int) or not 0 <= record_id < (1 << ID_BITS):
+            return None
+        day = parse_date(record.get(self.field, ""))
+        if day is None:
+            return None
+        return (day.toordinal() << ID_BITS) | record_id
+
+    def rebuild(self, records):
+        self._source = records
+        self._keys = None
+
+    def _build(self):
+        keys = [self._key(record) for record in self._source]
+        self._keys = sorted(key for key in keys if key is not None)
+
+    def add(self, record):
+        if self._keys is None:
+            return
+        key = self._key(record)
+        if key is not None:
+            insort(self._keys, key)
+
+    def remove(self, record):
+        if self._keys is None:
+            return
+        key = self._key(record)
+        if key is None:
+            return
+        pos = bisect_left(self._keys, key)
+        if pos < len(self._keys) and self._keys[pos] == key:
+            del self._keys[pos]
+
+    def ids_between(self, start=None, end=None):
+        """
+        ID các bản ghi có ngày trong khoảng [start, end], sắp xếp theo ngày
+
+        Args:
+            start, end: datetime.date, None là không giới hạn
+        """
+        if self._keys is None:
+            self._build()
+        low = 0 if start is None else bisect_left(self._keys, start.toordinal() << ID_BITS)
+        high = len(self._keys) if end is None else bisect_right(self._keys, ((end.toordinal() + 1) << ID_BITS) - 1)
+        mask = (1 << ID_BITS) - 1
+        return [key & mask for key in self._keys[low:high]]
+
+
+# Các khoảng thời gian chọn nhanh trên giao diện
+PERIODS = ("Tất cả", "Hôm nay", "Tuần này", "Tháng này", "Tháng trước", "Năm nay")
+
+
+def period_range(name, today=None):
+    """Khoảng ngày (từ, đến) của một lựa chọn trong PERIODS; None là không lọc"""
+    today = today or date.today()
+    if name == "Hôm nay":
+        return today, today
+    if name == "Tuần này":
+        return week_range(today)
+    if name == "Tháng này":
+        return month_range(today.year, today.month)
+    if name == "Tháng trước":
+        last_month = today.replace(day=1) - timedelta(days=1)
+        return month_range(last_month.year, last_month.month)
+    if name == "Năm nay":
+        return date(today.year, 1, 1), date(today.year, 12, 31)
+    return None
\ No newline at end of file
@@ -0,0 +1,312 @@
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+from modules.farm_service import ServiceError
+
+# Thời gian (giây) dùng lại trang dữ liệu và số liệu tổng hợp đã lấy trước khi hỏi lại
+# máy chủ, để thấy được thay đổi của các máy khác
+CACHE_SECONDS = 2.0
+
+
+class FarmClient:
+    """
+    Gọi dịch vụ HTTP của máy chủ trang trại (modules.farm_service)
+
+    Mỗi luồng giữ một kết nối riêng và dùng lại giữa các yêu cầu.
+    """
+
+    def __init__(self, base_url, timeout=10):
+        parts = urlsplit(base_url if "://" in base_url else "http://" + base_url)
+        self.base_url = base_url
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.token = None
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def _reset(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+        self._local.conn = None
+
+    def request(self, method, path, body=None, params=None):
+        """
+        Gửi một yêu cầu và trả về nội dung JSON của phản hồi
+
+        Raises:
+            ServiceError: Máy chủ trả về lỗi
+            ConnectionError: Không kết nối được máy chủ
+        """
+        url = f"{self.prefix}/api{path}"
+        if params:
+            url += "?" + urlencode(params)
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        data = None if body is None else json.dumps(body, ensure_ascii=False, default=dict).encode("utf-8")
+
+        # Kết nối cũ có thể đã bị máy chủ đóng: thử lại một lần với kết nối mới,
+        # trừ POST (có thể đã được thực hiện)
+        attempts = 1 if method == "POST" else 2
+        for attempt in range(attempts):
+            try:
+                conn = self._connection()
+                conn.request(method, url, body=data, headers=headers)
+                response = conn.getresponse()
+                payload = response.read()
+                break
+            except (http.client.HTTPException, OSError) as e:
+                self._reset()
+                if attempt == attempts - 1:
+                    raise ConnectionError(f"Không kết nối được máy chủ {self.base_url}: {str(e)}")
+
+        result = json.loads(payload.decode("utf-8")) if payload else None
+        if response.status >= 400:
+            message = result.get("message") if isinstance(result, dict) else None
+            raise ServiceError(response.status, message or f"Lỗi HTTP {response.status}")
+        return result
+
+
+class RemoteAuthManager:
+    """Đăng nhập, đăng ký và đổi mật khẩu qua máy chủ, cùng giao diện với AuthManager"""
+
+    def __init__(self, client):
+        self.client = client
+        self.current_user = None
+        # Dữ liệu người dùng do máy chủ lưu
+        self.dirty = False
+
+    def load_users(self):
+        """Kiểm tra kết nối tới máy chủ"""
+        self.client.request("GET", "/ping")
+
+    def save_users(self):
+        pass
+
+    def _call(self, path, body):
+        try:
+            return self.client.request("POST", path, body)
+        except (ServiceError, ConnectionError) as e:
+            return {"success": False, "message": str(e)}
+
+    def register_user(self, username, password, user_type="user"):
+        return self._call("/register", {"username": username, "password": password, "type": user_type})
+
+    def login(self, username, password):
+        result = self._call("/login", {"username": username, "password": password})
+        if result["success"]:
+            self.client.token = result["token"]
+            self.current_user = result["user"]
+        return result
+
+    def change_password(self, username, current_password, new_password):
+        return self._call("/change-password",
+                          {"current_password": current_password, "new_password": new_password})
+
+
+class RemoteRecordList:
+    """
+    Danh sách chỉ đọc, lấy từng trang kết quả từ máy chủ theo nhu cầu
+
+    Các trang đã lấy được dùng lại trong CACHE_SECONDS hoặc cho đến khi chính
+    máy khách này thay đổi dữ liệu.
+    """
+
+    def __init__(self, storage, params=None, page_size=200):
+        self.storage = storage
+        self.params = dict(params or {})
+        self.page_size = page_size
+        self._pages = {}
+        self._total = None
+        self._stamp = None
+
+    def _check_fresh(self):
+        stamp = (self.storage.version, int(time.monotonic() / CACHE_SECONDS))
+        if stamp != self._stamp:
+            self._pages = {}
+            self._total = None
+            self._stamp = stamp
+
+    def _fetch(self, offset, limit):
+        result = self.storage.client.request(
+            "GET", f"/{self.storage.dataset}", params=dict(self.params, offset=offset, limit=limit)
+        )
+        self._total = result["total"]
+        return result["items"]
+
+    def _page(self, number):
+        self._check_fresh()
+        page = self._pages.get(number)
+        if page is None:
+            page = self._pages[number] = self._fetch(number * self.page_size, self.page_size)
+        return page
+
+    def __len__(self):
+        self._check_fresh()
+        if self._total is None:
+            self._page(0)
+        return self._total
+
+    def __iter__(self):
+        # Duyệt toàn bộ (xuất báo cáo, thống kê) bằng các trang lớn nhất máy chủ cho phép
+        offset = 0
+        while True:
+            items = self._fetch(offset, 1000)
+            yield from items
+            if len(items) < 1000:
+                return
+            offset += len(items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            rows = []
+            for number in range(start // self.page_size, (max(stop, start) - 1) // self.page_size + 1):
+                page = self._page(number)
+                base = number * self.page_size
+                rows.extend(page[max(start - base, 0):max(stop - base, 0)])
+            return rows
+        if index < 0:
+            index += len(self)
+        page = self._page(index // self.page_size)
+        try:
+            return page[index % self.page_size]
+        except IndexError:
+            raise IndexError("Chỉ số vượt quá số bản ghi")
+
+
+class RemoteTotals:
+    """Số liệu tổng hợp đọc từ máy chủ, cùng giao diện đọc với RunningTotals"""
+
+    def __init__(self, storage):
+        self.storage = storage
+        self._state = None
+        self._stamp = None
+
+    def _built(self):
+        stamp = (self.storage.version, int(time.monotonic() / CACHE_SECONDS))
+        if self._state is None or stamp != self._stamp:
+            self._state = self.storage.client.request("GET", f"/{self.storage.dataset}/summary")
+            self._stamp = stamp
+        return self._state
+
+    def count(self):
+        return self._built()["count"]
+
+    def counts(self, field):
+        return dict(self._built()["counts"][field])
+
+    def count_of(self, field, value):
+        return self._built()["counts"][field].get(str(value or ""), 0)
+
+    def total(self, field):
+        return self._built()["sums"][field]
+
+
+class RemoteStorage:
+    """Storage cho các manager ở chế độ máy khách: mọi thao tác được gửi tới máy chủ"""
+
+    def __init__(self, client, dataset):
+        self.client = client
+        self.dataset = dataset
+        # Tăng sau mỗi thay đổi do máy khách này gửi đi, để bỏ các trang đã lưu tạm
+        self.version = 0
+        self.totals = RemoteTotals(self)
+        self._records = RemoteRecordList(self)
+
+    @property
+    def records(self):
+        return self._records
+
+    @records.setter
+    def records(self, value):
+        raise ValueError("Không thể ghi đè toàn bộ dữ liệu trên máy chủ")
+
+    @property
+    def dirty(self):
+        # Máy chủ tự lưu các thay đổi
+        return False
+
+    def _changed(self):
+        self.version += 1
+
+    def load(self):
+        self._changed()
+        self.client.request("GET", f"/{self.dataset}/summary")
+
+    def save(self):
+        pass
+
+    def count(self):
+        return len(self._records)
+
+    def next_id(self):
+        return self.allocate_ids(1).start
+
+    def allocate_ids(self, count):
+        """Máy chủ cấp ID nên các máy khách không bao giờ dùng trùng ID"""
+        result = self.client.request("POST", f"/{self.dataset}/ids", {"count": count})
+        return range(result["start"], result["start"] + result["count"])
+
+    def _write(self, method, path, body=None):
+        try:
+            return self.client.request(method, path, body)
+        except ServiceError as e:
+            if e.status == 409:
+                raise ValueError(e.message)
+            raise
+        finally:
+            self._changed()
+
+    def add(self, record):
+        self._write("POST", f"/{self.dataset}", record)
+
+    def add_many(self, records):
+        self._write("POST", f"/{self.dataset}/batch", {"records": records})
+
+    def update(self, record_id, updated_data):
+        return self._write("PUT", f"/{self.dataset}/{record_id}", updated_data)["success"]
+
+    def delete(self, record_id):
+        return self._write("DELETE", f"/{self.dataset}/{record_id}")["success"]
+
+    def get(self, record_id):
+        try:
+            return self.client.request("GET", f"/{self.dataset}/{record_id}")
+        except ServiceError as e:
+            if e.status == 404:
+                return None
+            raise
+
+    def snapshot(self):
+        return list(RemoteRecordList(self))
+
+    def search(self, query):
+        return RemoteRecordList(self, {"q": query})
+
+    def filter(self, filters):
+        return RemoteRecordList(self, filters)
+
+    def facet_values(self, field):
+        return self.client.request("GET", f"/{self.dataset}/facets/{field}")
+
+    def records_between(self, start=None, end=None):
+        params = {}
+        if start is not None:
+            params["from"] = start.strftime("%d/%m/%Y")
+        if end is not None:
+            params["to"] = end.strftime("%d/%m/%Y")
+        return RemoteRecordList(self, params)
\ No newline at end of file
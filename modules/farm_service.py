@@ -0,0 +1,504 @@
+"""
+Dịch vụ HTTP (JSON) cho nhiều máy dùng chung một kho dữ liệu trang trại
+
+Chạy máy chủ (không cần giao diện):
+    python main.py --serve --port 8765
+
+Các máy khác mở giao diện ở chế độ máy khách:
+    python main.py --server http://<máy chủ>:8765
+"""
+import json
+import secrets
+import threading
+import traceback
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from modules.activity_manager import ActivityManager
+from modules.animal_manager import AnimalManager
+from modules.auth import (LOGIN_FAILED, LOGIN_SUCCESS, USERNAME_TAKEN, WRONG_PASSWORD, AuthManager,
+                          needs_rehash)
+from modules.crop_manager import CropManager
+from modules.date_index import in_range, parse_bound
+from modules.facet_index import matches_filters
+from modules.write_behind import WriteBehind
+
+DEFAULT_PORT = 8765
+# Số bản ghi tối đa trong một trang kết quả
+MAX_PAGE_SIZE = 1000
+
+
+class ServiceError(Exception):
+    """Lỗi trả về cho máy khách kèm mã trạng thái HTTP"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ReadWriteLock:
+    """Khóa cho phép nhiều luồng cùng đọc, chỉ một luồng ghi (luồng ghi được ưu tiên)"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writing or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writing or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+
+class ResponseCache:
+    """
+    Bộ nhớ đệm LRU cho các truy vấn đọc hay dùng
+
+    Mỗi mục gắn với phiên bản dữ liệu lúc tạo; mục của phiên bản cũ bị bỏ qua
+    nên không cần xóa bộ đệm khi dữ liệu thay đổi.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, version, value):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _public_user(user):
+    # Không bao giờ gửi mật khẩu (hoặc chuỗi băm) ra ngoài
+    return {key: value for key, value in user.items() if key != "password"}
+
+
+class FarmService:
+    """
+    Các thao tác trên cây trồng, vật nuôi, hoạt động và tài khoản, an toàn khi
+    nhiều luồng gọi cùng lúc
+
+    Mỗi loại dữ liệu có khóa đọc/ghi riêng: các truy vấn đọc chạy song song, thao
+    tác ghi chỉ chặn đúng loại dữ liệu đó. Thay đổi được lưu trễ trên luồng nền
+    (WriteBehind), nhiều thao tác liên tiếp gộp thành một lần ghi.
+    """
+
+    def __init__(self, storage="json", compact=False, save_delay=0.5):
+        self.auth_manager = AuthManager()
+        self.managers = {
+            "crops": CropManager(storage, compact=compact),
+            "animals": AnimalManager(storage, compact=compact),
+            "activities": ActivityManager(storage, compact=compact),
+        }
+        self.locks = {name: ReadWriteLock() for name in list(self.managers) + ["users"]}
+        # Tăng sau mỗi thay đổi, dùng để nhận biết kết quả trong bộ đệm đã cũ
+        self.versions = {name: 0 for name in self.managers}
+        self.cache = ResponseCache()
+        self.writer = WriteBehind(delay=save_delay)
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+
+    def load(self):
+        self.auth_manager.load_users()
+        for manager in self.managers.values():
+            manager.load_data()
+
+    def close(self):
+        """Ghi mọi thay đổi đang chờ (khi dừng máy chủ)"""
+        self.writer.flush()
+        for manager in self.managers.values():
+            manager.save_data()
+
+    # Tài khoản
+
+    def login(self, username, password):
+        auth = self.auth_manager
+        with self.locks["users"].read():
+            user = auth.get_user(username)
+            stored = user["password"] if user is not None else None
+        # PBKDF2 chạy ngoài khóa để một lần đăng nhập không chặn các yêu cầu khác về
+        # tài khoản; khóa ghi chỉ giữ khi lưu mật khẩu đã băm lại
+        if not auth.verify_password(password, stored):
+            return {"success": False, "message": LOGIN_FAILED}
+        if needs_rehash(stored):
+            new_hash = auth.hash_password(password)
+            with self.locks["users"].write():
+                auth.set_password_hash(user, stored, new_hash)
+        token = secrets.token_urlsafe(24)
+        user = _public_user(user)
+        with self._sessions_lock:
+            self._sessions[token] = user
+        return {"success": True, "message": LOGIN_SUCCESS, "user": user, "token": token}
+
+    def logout(self, token):
+        with self._sessions_lock:
+            self._sessions.pop(token, None)
+        return {"success": True}
+
+    def register(self, username, password, user_type="user", token=None):
+        """
+        Đăng ký tài khoản; ai cũng tạo được tài khoản "user", các loại khác (admin)
+        cần phiên đăng nhập của quản trị viên (token)
+        """
+        if not username or not password:
+            raise ServiceError(400, "Tên đăng nhập và mật khẩu không được để trống")
+        if user_type != "user" and self.user_for(token).get("type") != "admin":
+            raise ServiceError(403, "Chỉ quản trị viên mới được tạo tài khoản loại này")
+        auth = self.auth_manager
+        with self.locks["users"].read():
+            taken = auth.get_user(username) is not None
+        if taken:
+            return {"success": False, "message": USERNAME_TAKEN}
+        # Như login: băm mật khẩu ngoài khóa, khóa ghi chỉ giữ khi thêm người dùng
+        password_hash = auth.hash_password(password)
+        with self.locks["users"].write():
+            return auth.add_user(username, password_hash, user_type)
+
+    def change_password(self, user, current_password, new_password):
+        auth = self.auth_manager
+        with self.locks["users"].read():
+            account = auth.get_user(user["username"])
+            stored = account["password"] if account is not None else None
+        if not auth.verify_password(current_password, stored):
+            return {"success": False, "message": WRONG_PASSWORD}
+        new_hash = auth.hash_password(new_password)
+        with self.locks["users"].write():
+            return auth.replace_password(account, stored, new_hash)
+
+    def user_for(self, token):
+        """Người dùng của phiên đăng nhập (ServiceError 401 nếu chưa đăng nhập)"""
+        with self._sessions_lock:
+            user = self._sessions.get(token)
+        if user is None:
+            raise ServiceError(401, "Chưa đăng nhập hoặc phiên đăng nhập đã hết hạn")
+        return user
+
+    # Dữ liệu
+
+    def manager(self, dataset):
+        manager = self.managers.get(dataset)
+        if manager is None:
+            raise ServiceError(404, f"Không có loại dữ liệu {dataset}")
+        return manager
+
+    def _changed(self, dataset):
+        self.versions[dataset] += 1
+        self.writer.schedule(self.managers[dataset].save_data)
+
+    def _query(self, manager, params):
+        # Chọn chỉ mục thu hẹp nhiều nhất (lọc > tìm kiếm > khoảng ngày), các điều kiện
+        # còn lại được kiểm tra trên kết quả đã thu hẹp
+        keyword = params.get("q", "").strip()
+        filters = {field: params[field] for field in manager.facet_fields if params.get(field)}
+        try:
+            start = parse_bound(params.get("from", ""))
+            end = parse_bound(params.get("to", ""), end=True)
+        except ValueError as e:
+            raise ServiceError(400, str(e))
+        has_range = start is not None or end is not None
+
+        if filters:
+            rows = manager.filter_records(filters)
+            filters = {}
+        elif keyword:
+            rows = manager.search(keyword)
+            keyword = ""
+        elif has_range:
+            rows = manager.records_between(start, end)
+            has_range = False
+        else:
+            return manager.records
+
+        if keyword or has_range:
+            rows = [
+                record for record in rows
+                if (not keyword or manager.matches_search(record, keyword))
+                and (not has_range or in_range(record.get(manager.date_field, ""), start, end))
+                and matches_filters(record, filters)
+            ]
+        return rows
+
+    def list_records(self, dataset, params):
+        """
+        Một trang kết quả truy vấn
+
+        Args:
+            params: offset, limit, q (từ khóa), from/to (khoảng ngày) và các trường lọc
+        """
+        manager = self.manager(dataset)
+        try:
+            offset = max(int(params.get("offset", 0)), 0)
+            limit = min(max(int(params.get("limit", 100)), 0), MAX_PAGE_SIZE)
+        except ValueError:
+            raise ServiceError(400, "offset/limit không hợp lệ")
+        query = {key: value for key, value in params.items() if key not in ("offset", "limit")}
+        query_key = (dataset, "query", tuple(sorted(query.items())))
+        with self.locks[dataset].read():
+            version = self.versions[dataset]
+            rows = self.cache.get(query_key, version)
+            if rows is None:
+                rows = self._query(manager, query)
+                self.cache.put(query_key, version, rows)
+            return {
+                "total": len(rows),
+                "offset": offset,
+                "version": version,
+                "items": list(rows[offset:offset + limit]),
+            }
+
+    def get_record(self, dataset, record_id):
+        manager = self.manager(dataset)
+        with self.locks[dataset].read():
+            record = manager.get_record(record_id)
+        if record is None:
+            raise ServiceError(404, f"Không tìm thấy bản ghi {record_id}")
+        return record
+
+    def allocate_ids(self, dataset, count):
+        manager = self.manager(dataset)
+        if not isinstance(count, int) or count < 1:
+            raise ServiceError(400, "Số ID cần cấp không hợp lệ")
+        with self.locks[dataset].write():
+            ids = manager.allocate_ids(count)
+        return {"start": ids.start, "count": count}
+
+    def add_records(self, dataset, records):
+        manager = self.manager(dataset)
+        if not records or not all(isinstance(record, dict) and "id" in record for record in records):
+            raise ServiceError(400, "Bản ghi phải là đối tượng JSON có id")
+        with self.locks[dataset].write():
+            try:
+                manager.add_records(records)
+            except ValueError as e:
+                raise ServiceError(409, str(e))
+            self._changed(dataset)
+        return {"success": True, "count": len(records)}
+
+    def update_record(self, dataset, record_id, data):
+        manager = self.manager(dataset)
+        if not isinstance(data, dict):
+            raise ServiceError(400, "Bản ghi phải là đối tượng JSON")
+        data = dict(data, id=record_id)
+        with self.locks[dataset].write():
+            success = manager.update_record(record_id, data)
+            if success:
+                self._changed(dataset)
+        return {"success": success}
+
+    def delete_record(self, dataset, record_id):
+        manager = self.manager(dataset)
+        with self.locks[dataset].write():
+            success = manager.delete_record(record_id)
+            if success:
+                self._changed(dataset)
+        return {"success": success}
+
+    def summary(self, dataset):
+        """Số liệu tổng hợp (tổng số, số bản ghi theo giá trị, tổng các trường số)"""
+        manager = self.manager(dataset)
+        with self.locks[dataset].read():
+            version = self.versions[dataset]
+            key = (dataset, "summary")
+            state = self.cache.get(key, version)
+            if state is None:
+                state = json.loads(json.dumps(manager.totals.get_state()))
+                self.cache.put(key, version, state)
+            return state
+
+    def facet_values(self, dataset, field):
+        manager = self.manager(dataset)
+        if field not in manager.facet_fields:
+            raise ServiceError(404, f"Không lọc được theo trường {field}")
+        with self.locks[dataset].read():
+            version = self.versions[dataset]
+            key = (dataset, "facets", field)
+            values = self.cache.get(key, version)
+            if values is None:
+                values = manager.facet_values(field)
+                self.cache.put(key, version, values)
+            return values
+
+
+class FarmRequestHandler(BaseHTTPRequestHandler):
+    """Chuyển các yêu cầu HTTP thành lời gọi FarmService"""
+
+    # Giữ kết nối giữa các yêu cầu để máy khách không phải mở kết nối mới mỗi lần
+    protocol_version = "HTTP/1.1"
+    server_version = "FarmService/1.0"
+    # Tiêu đề và nội dung được ghi riêng: tắt Nagle để phản hồi không bị trễ ~40 ms
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def log_error(self, format, *args):
+        # Lỗi luôn được ghi ra, kể cả khi không bật verbose
+        super().log_message(format, *args)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length).decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            raise ServiceError(400, "Nội dung yêu cầu không phải JSON hợp lệ")
+        if not isinstance(body, dict):
+            raise ServiceError(400, "Nội dung yêu cầu phải là một đối tượng JSON")
+        return body
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False, default=dict).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _token(self):
+        header = self.headers.get("Authorization", "")
+        return header[len("Bearer "):] if header.startswith("Bearer ") else None
+
+    def _handle(self, method):
+        try:
+            url = urlsplit(self.path)
+            parts = [part for part in url.path.split("/") if part]
+            if not parts or parts[0] != "api":
+                raise ServiceError(404, "Không tìm thấy")
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            status, payload = self._route(method, parts[1:], params)
+        except ServiceError as e:
+            status, payload = e.status, {"success": False, "message": e.message}
+        except Exception as e:
+            # Chi tiết lỗi chỉ ghi ở máy chủ, không gửi cho máy khách
+            self.log_error("Lỗi khi xử lý %s %s: %r", method, self.path, e)
+            traceback.print_exc()
+            status, payload = 500, {"success": False, "message": "Lỗi máy chủ"}
+        self._send(status, payload)
+
+    def _route(self, method, parts, params):
+        service = self.server.service
+        if parts == ["ping"]:
+            return 200, {"success": True}
+        if method == "POST" and parts == ["login"]:
+            body = self._read_body()
+            return 200, service.login(body.get("username", ""), body.get("password", ""))
+        if method == "POST" and parts == ["register"]:
+            body = self._read_body()
+            return 200, service.register(body.get("username", ""), body.get("password", ""),
+                                         body.get("type", "user"), self._token())
+
+        user = service.user_for(self._token())
+        if method == "POST" and parts == ["logout"]:
+            return 200, service.logout(self._token())
+        if method == "POST" and parts == ["change-password"]:
+            body = self._read_body()
+            return 200, service.change_password(user, body.get("current_password", ""),
+                                                body.get("new_password", ""))
+
+        if not parts:
+            raise ServiceError(404, "Không tìm thấy")
+        dataset, rest = parts[0], parts[1:]
+        if not rest:
+            if method == "GET":
+                return 200, service.list_records(dataset, params)
+            if method == "POST":
+                return 201, service.add_records(dataset, [self._read_body()])
+        elif rest == ["summary"] and method == "GET":
+            return 200, service.summary(dataset)
+        elif rest == ["ids"] and method == "POST":
+            return 200, service.allocate_ids(dataset, self._read_body().get("count", 1))
+        elif rest == ["batch"] and method == "POST":
+            return 201, service.add_records(dataset, self._read_body().get("records", []))
+        elif len(rest) == 2 and rest[0] == "facets" and method == "GET":
+            return 200, service.facet_values(dataset, rest[1])
+        elif len(rest) == 1:
+            try:
+                record_id = int(rest[0])
+            except ValueError:
+                raise ServiceError(400, "ID không hợp lệ")
+            if method == "GET":
+                return 200, service.get_record(dataset, record_id)
+            if method == "PUT":
+                return 200, service.update_record(dataset, record_id, self._read_body())
+            if method == "DELETE":
+                return 200, service.delete_record(dataset, record_id)
+        raise ServiceError(404, "Không tìm thấy")
+
+
+class FarmServer(ThreadingHTTPServer):
+    """Máy chủ HTTP nhiều luồng, mỗi kết nối được xử lý trên một luồng riêng"""
+
+    daemon_threads = True
+
+    def __init__(self, address, service, verbose=False):
+        super().__init__(address, FarmRequestHandler)
+        self.service = service
+        self.verbose = verbose
+
+
+def run_server(host="127.0.0.1", port=DEFAULT_PORT, storage="json", compact=False, verbose=False):
+    """Tải dữ liệu và phục vụ cho đến khi bị dừng (Ctrl+C), sau đó ghi các thay đổi đang chờ"""
+    service = FarmService(storage, compact=compact)
+    service.load()
+    server = FarmServer((host, port), service, verbose)
+    print(f"Đang phục vụ tại http://{host}:{server.server_port} (Ctrl+C để dừng)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
\ No newline at end of file
@@ -0,0 +1,142 @@
+from array import array
+
+import numpy as np
+
+from modules.aggregates import to_number
+
+UNKNOWN = "(không rõ)"
+
+
+def _encode(records, fields):
+    # Một lượt duyệt dữ liệu: mã hóa giá trị từng trường thành số nguyên 0..k-1.
+    # Chỉ giữ các giá trị khác nhau và mảng mã, nên dữ liệu đọc từ SQLite
+    # không cần nạp hết vào bộ nhớ
+    tables = [{} for _ in fields]
+    columns = [array("q") for _ in fields]
+    pairs = list(zip(fields, tables, columns))
+    for record in records:
+        for field, table, column in pairs:
+            value = record.get(field)
+            code = table.get(value)
+            if code is None:
+                code = table[value] = len(table)
+            column.append(code)
+    return [np.frombuffer(column, dtype=np.int64) for column in columns], [list(table) for table in tables]
+
+
+def _relabel(codes, raw_labels, transform):
+    # Áp dụng hàm chuyển đổi trên các giá trị khác nhau rồi gộp các mã trùng nhãn
+    labels = {}
+    remap = np.fromiter((labels.setdefault(transform(value), len(labels)) for value in raw_labels),
+                        dtype=np.int64, count=len(raw_labels))
+    return remap[codes], list(labels)
+
+
+def _label(value):
+    return UNKNOWN if value is None or value == "" else str(value)
+
+
+def month_of(date_text):
+    """Tháng của một ngày dạng dd/mm/yyyy, trả về "mm/yyyy" (hoặc UNKNOWN)"""
+    parts = str(date_text).strip().split("/")
+    if len(parts) == 3 and parts[1].isdigit() and parts[2].isdigit():
+        return f"{int(parts[1]):02d}/{parts[2]}"
+    return UNKNOWN
+
+
+def group_totals(records, key_fields, value_field=None):
+    """
+    Đếm số bản ghi và cộng một trường số theo nhóm, tính theo cột bằng NumPy
+
+    Args:
+        records: Danh sách hoặc iterator bản ghi (chỉ duyệt một lần)
+        key_fields: Các trường dùng làm khóa nhóm, mỗi phần tử là tên trường hoặc
+            (tên trường, hàm chuyển giá trị thành nhãn nhóm)
+        value_field: Trường số cần cộng (None nếu chỉ đếm)
+
+    Returns:
+        dict (khóa 1, khóa 2, ...) -> (số bản ghi, tổng giá trị)
+    """
+    key_fields = [key_field if isinstance(key_field, tuple) else (key_field, _label) for key_field in key_fields]
+    fields = [field for field, _ in key_fields] + ([value_field] if value_field is not None else [])
+    all_codes, all_raw_labels = _encode(records, fields)
+    if not len(all_codes[0]):
+        return {}
+
+    # Ghép mã của từng khóa thành một mã nhóm duy nhất
+    group_codes = np.zeros(len(all_codes[0]), dtype=np.int64)
+    all_labels = []
+    for (field, transform), codes, raw_labels in zip(key_fields, all_codes, all_raw_labels):
+        codes, labels = _relabel(codes, raw_labels, transform)
+        group_codes = group_codes * len(labels) + codes
+        all_labels.append(labels)
+
+    size = 1
+    for labels in all_labels:
+        size *= len(labels)
+    counts = np.bincount(group_codes, minlength=size)
+    if value_field is not None:
+        numbers = np.fromiter((to_number(value) for value in all_raw_labels[-1]), dtype=np.float64)
+        values = numbers[all_codes[-1]]
+        sums = np.bincount(group_codes, weights=values, minlength=size)
+    else:
+        sums = counts.astype(np.float64)
+
+    result = {}
+    for code in np.flatnonzero(counts):
+        key = []
+        rest = int(code)
+        for labels in reversed(all_labels):
+            rest, index = divmod(rest, len(labels))
+            key.append(labels[index])
+        result[tuple(reversed(key))] = (int(counts[code]), float(sums[code]))
+    return result
+
+
+def crop_area_by_type_status(crops):
+    """Số cây trồng và tổng diện tích (ha) theo (loại, trạng thái)"""
+    return group_totals(crops, ["type", "status"], "area")
+
+
+def animal_headcount_by_type(animals):
+    """Số bản ghi và tổng số lượng vật nuôi theo loại"""
+    return group_totals(animals, ["type"], "quantity")
+
+
+def activities_by_responsible_month(activities):
+    """Số hoạt động theo (người phụ trách, tháng)"""
+    return group_totals(activities, ["responsible", ("date", month_of)])
+
+
+def _month_sort_key(month):
+    if month == UNKNOWN:
+        return ("9999", "99")
+    mm, yyyy = month.split("/")
+    return (yyyy, mm)
+
+
+def statistics_tables(data_type, records):
+    """
+    Các bảng thống kê của một loại dữ liệu, dùng cho trang chủ và báo cáo
+
+    Returns:
+        Danh sách (tiêu đề bảng, tiêu đề cột, các dòng)
+    """
+    if data_type == "crops":
+        totals = crop_area_by_type_status(records)
+        rows = [[crop_type, status, count, round(area, 2)]
+                for (crop_type, status), (count, area) in sorted(totals.items())]
+        return [("Diện tích cây trồng theo loại và trạng thái",
+                 ["Loại cây", "Trạng thái", "Số cây trồng", "Diện tích (ha)"], rows)]
+    if data_type == "animals":
+        totals = animal_headcount_by_type(records)
+        rows = [[animal_type, count, int(quantity)]
+                for (animal_type,), (count, quantity) in sorted(totals.items())]
+        return [("Số lượng vật nuôi theo loại", ["Loại", "Số bản ghi", "Tổng số lượng"], rows)]
+    if data_type == "activities":
+        totals = activities_by_responsible_month(records)
+        keys = sorted(totals, key=lambda key: (key[0], _month_sort_key(key[1])))
+        rows = [[responsible, month, totals[(responsible, month)][0]] for responsible, month in keys]
+        return [("Số hoạt động theo người phụ trách và tháng",
+                 ["Người phụ trách", "Tháng", "Số hoạt động"], rows)]
+    raise ValueError("Loại dữ liệu không hợp lệ")
\ No newline at end of file
@@ -0,0 +1,189 @@
+import csv
+import os
+from datetime import date, datetime
+
+# Các trường của từng loại dữ liệu, theo thứ tự trong form nhập liệu
+IMPORT_FIELDS = {
+    'crops': ["name", "type", "planting_date", "area", "status", "notes"],
+    'animals': ["name", "type", "entry_date", "quantity", "status", "notes"],
+    'activities': ["name", "type", "date", "responsible", "status", "description"],
+}
+
+INTEGER_FIELDS = {
+    'animals': ["quantity"],
+}
+
+# Tên cột tiếng Việt (giống báo cáo Excel) được chấp nhận thay cho tên trường
+HEADER_ALIASES = {
+    "tên cây": "name", "tên vật nuôi": "name", "tên hoạt động": "name", "tên": "name",
+    "loại cây": "type", "loại": "type", "loại vật nuôi": "type", "loại hoạt động": "type",
+    "ngày trồng": "planting_date", "ngày nhập": "entry_date", "ngày": "date", "ngày thực hiện": "date",
+    "diện tích (ha)": "area", "diện tích": "area", "số lượng": "quantity",
+    "người phụ trách": "responsible", "trạng thái": "status",
+    "ghi chú": "notes", "mô tả": "description",
+}
+
+
+def read_rows(filepath):
+    """
+    Đọc lần lượt từng dòng của file CSV hoặc Excel (.xlsx) dưới dạng dict
+
+    Dòng đầu tiên là tiêu đề cột. File Excel được đọc ở chế độ read-only
+    nên không phải nạp toàn bộ workbook vào bộ nhớ.
+    """
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension == ".csv":
+        with open(filepath, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                yield row
+    elif extension == ".xlsx":
+        from openpyxl import load_workbook
+
+        wb = load_workbook(filepath, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            headers = next(rows, None)
+            if headers is None:
+                return
+            headers = ["" if header is None else str(header) for header in headers]
+            for values in rows:
+                if all(value is None for value in values):
+                    continue
+                yield dict(zip(headers, values))
+        finally:
+            wb.close()
+    else:
+        raise ValueError("Chỉ hỗ trợ file .csv hoặc .xlsx")
+
+
+class BulkImporter:
+    """
+    Nhập dữ liệu hàng loạt: kiểm tra theo lô, cấp ID theo khối và lưu một lần mỗi lô
+
+    read_batches() chỉ đọc và kiểm tra dữ liệu nên chạy được trên luồng nền;
+    add_batch() thêm một lô vào manager và phải chạy trên luồng sở hữu manager.
+    """
+
+    def __init__(self, manager, data_type, batch_size=1000):
+        if data_type not in IMPORT_FIELDS:
+            raise ValueError("Loại dữ liệu không hợp lệ")
+        self.manager = manager
+        self.data_type = data_type
+        self.batch_size = batch_size
+        self.fields = IMPORT_FIELDS[data_type]
+        self.integer_fields = INTEGER_FIELDS.get(data_type, [])
+
+    def _normalize_header(self, header):
+        key = str(header).strip().lower()
+        if key in self.fields:
+            return key
+        # Tên cột của loại dữ liệu khác (ví dụ "ngày trồng" khi nhập hoạt động) bị bỏ qua
+        field = HEADER_ALIASES.get(key)
+        return field if field in self.fields else None
+
+    @staticmethod
+    def _to_text(value):
+        if value is None:
+            return ""
+        if isinstance(value, (datetime, date)):
+            return value.strftime("%d/%m/%Y")
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value).strip()
+
+    def validate_batch(self, rows):
+        """
+        Kiểm tra một lô dữ liệu
+
+        Args:
+            rows: Danh sách (số dòng, dict giá trị thô)
+
+        Returns:
+            (danh sách bản ghi hợp lệ chưa có ID, danh sách lỗi)
+        """
+        valid, errors = [], []
+        for line_number, row in rows:
+            record = {"id": None}
+            record.update((field, "") for field in self.fields)
+            for header, value in row.items():
+                if header is None:
+                    continue
+                field = self._normalize_header(header)
+                if field:
+                    record[field] = self._to_text(value)
+
+            if not record["name"] or not record["type"]:
+                errors.append(f"Dòng {line_number}: tên và loại không được để trống")
+                continue
+            try:
+                for field in self.integer_fields:
+                    record[field] = int(float(record[field] or 0))
+            except ValueError:
+                errors.append(f"Dòng {line_number}: {field} phải là số nguyên")
+                continue
+            valid.append(record)
+        return valid, errors
+
+    def read_batches(self, rows):
+        """
+        Đọc và kiểm tra dữ liệu theo lô, không thay đổi manager
+
+        Args:
+            rows: Iterator các dòng dữ liệu (dict tiêu đề -> giá trị)
+
+        Yields:
+            (số dòng đã đọc, danh sách bản ghi hợp lệ chưa có ID, danh sách lỗi)
+        """
+        batch = []
+        line_number = 1
+        # Dòng 1 là tiêu đề
+        for line_number, row in enumerate(rows, 2):
+            batch.append((line_number, row))
+            if len(batch) >= self.batch_size:
+                yield (line_number - 1,) + self.validate_batch(batch)
+                batch = []
+        if batch:
+            yield (line_number - 1,) + self.validate_batch(batch)
+
+    def add_batch(self, records):
+        """Cấp ID theo khối và thêm một lô bản ghi đã kiểm tra (không lưu)"""
+        for record_id, record in zip(self.manager.allocate_ids(len(records)), records):
+            record["id"] = record_id
+        self.manager.add_records(records)
+
+    def import_rows(self, rows, on_batch=None):
+        """
+        Nhập dữ liệu từ một iterator các dict
+
+        Args:
+            rows: Iterator các dòng dữ liệu (dict tiêu đề -> giá trị)
+            on_batch: Hàm gọi lại sau mỗi lô đã lưu, nhận danh sách bản ghi vừa thêm
+
+        Returns:
+            Kết quả dạng {"success", "message", "imported", "errors"}
+        """
+        imported, errors = 0, []
+        for _, records, batch_errors in self.read_batches(rows):
+            errors.extend(batch_errors)
+            if not records:
+                continue
+            self.add_batch(records)
+            self.manager.save_data()
+            if on_batch:
+                on_batch(records)
+            imported += len(records)
+        return self.result(imported, errors)
+
+    @staticmethod
+    def result(imported, errors):
+        """Kết quả dạng {"success", "message", "imported", "errors"}"""
+        return {
+            "success": imported > 0 or not errors,
+            "message": f"Đã nhập {imported} bản ghi, {len(errors)} dòng lỗi",
+            "imported": imported,
+            "errors": errors,
+        }
+
+    def import_file(self, filepath, on_batch=None):
+        """Nhập dữ liệu từ file CSV hoặc Excel"""
+        return self.import_rows(read_rows(filepath), on_batch)
\ No newline at end of file
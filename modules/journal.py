@@ -0,0 +1,227 @@
+import json
+import os
+import secrets
+import shutil
+import socket
+import threading
+
+from modules.timing import timings
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Khóa dùng chung giữa các tiến trình (khóa file của hệ điều hành) và giữa các
+    luồng trong tiến trình; một luồng có thể lấy lại khóa nó đang giữ
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                # Thư mục dữ liệu có thể chưa được tạo (lần chạy đầu tiên)
+                if os.path.dirname(self.path):
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = open(self.path, "a+b")
+                self._lock_file()
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            try:
+                self._unlock_file()
+            finally:
+                self._file.close()
+                self._file = None
+        self._thread_lock.release()
+
+    def _lock_file(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            return
+        self._file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK chỉ thử lại trong khoảng 10 giây, tiếp tục chờ
+                continue
+
+    def _unlock_file(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ChangeJournal:
+    """
+    Nhật ký thay đổi dạng append-only, mỗi dòng là một bản ghi JSON gọn
+
+    Mỗi bản ghi thay đổi mang mã của tiến trình đã ghi nó (trường "w") để khi
+    nhiều tiến trình dùng chung một file, mỗi tiến trình bỏ qua được các thay
+    đổi của chính mình khi đọc phần mới ghi thêm. Việc ghi nối và việc chuyển
+    file khi nén được thực hiện dưới khóa file lock (dùng chung giữa các tiến trình).
+    """
+
+    def __init__(self, path, compact_threshold=1024 * 1024, writer_id=None):
+        self.path = path
+        self.pending_path = path + ".compacting"
+        self.compact_threshold = compact_threshold
+        self.writer_id = writer_id or f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+        self.last_error = None
+        self.lock = FileLock(path + ".lock")
+        self._worker = None
+
+    @staticmethod
+    def make_entry(op, record_id, data=None):
+        """Tạo một bản ghi thay đổi (add/update/delete)"""
+        entry = {"op": op, "id": record_id}
+        if data is not None:
+            entry["data"] = data
+        return entry
+
+    def append_many(self, entries):
+        """Ghi nối các bản ghi thay đổi vào cuối file nhật ký"""
+        if not entries:
+            return
+        for entry in entries:
+            entry["w"] = self.writer_id
+        lines = "".join(
+            json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=dict) + "\n"
+            for entry in entries
+        )
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+    @staticmethod
+    def _parse_lines(lines):
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                # Dòng cuối có thể bị ghi dở nếu ứng dụng dừng đột ngột
+                continue
+
+    def read_pending(self):
+        """Đọc các bản ghi thay đổi trong file đang nén (còn lại nếu lần nén trước bị gián đoạn)"""
+        if not os.path.exists(self.pending_path):
+            return []
+        with open(self.pending_path, "r", encoding="utf-8") as f:
+            return list(self._parse_lines(f))
+
+    def read_from(self, offset):
+        """
+        Đọc các bản ghi thay đổi được ghi thêm vào file nhật ký hiện tại từ vị trí offset
+
+        Dòng cuối chưa ghi xong (chưa có ký tự xuống dòng) được để lại cho lần đọc sau.
+
+        Returns:
+            (danh sách bản ghi thay đổi, vị trí đã đọc tới, định danh của file đã đọc
+            hoặc None nếu chưa có file)
+        """
+        try:
+            with open(self.path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset, None
+        end = data.rfind(b"\n") + 1
+        entries = list(self._parse_lines(data[:end].decode("utf-8").splitlines()))
+        return entries, offset + end, (stat.st_dev, stat.st_ino)
+
+    def identity(self):
+        """Định danh của file nhật ký hiện tại (thay đổi khi file bị đổi tên/tạo lại), None nếu chưa có file"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_dev, stat.st_ino)
+
+    def size(self):
+        """Kích thước file nhật ký hiện tại (byte)"""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def needs_compaction(self):
+        return self.size() >= self.compact_threshold and not self.is_compacting()
+
+    def is_compacting(self):
+        return self._worker is not None and self._worker.is_alive()
+
+    def compact(self, records, write_snapshot, background=True):
+        """
+        Nén nhật ký vào một bản snapshot mới
+
+        Args:
+            records: Bản sao danh sách bản ghi tại thời điểm nén
+            write_snapshot: Hàm ghi snapshot ra file dữ liệu
+            background: Chạy trong luồng nền (mặc định) hoặc chạy đồng bộ
+
+        Returns:
+            True nếu đã bắt đầu nén, False nếu đang có một lần nén khác chạy
+        """
+        with self.lock:
+            if self.is_compacting():
+                return False
+            # Chuyển nhật ký hiện tại sang file chờ để các thay đổi mới ghi vào file mới
+            if os.path.exists(self.path):
+                if os.path.exists(self.pending_path):
+                    # Lần nén trước bị gián đoạn: gộp thêm vào file chờ
+                    with open(self.path, "rb") as src, open(self.pending_path, "ab") as dst:
+                        shutil.copyfileobj(src, dst)
+                    os.remove(self.path)
+                else:
+                    os.replace(self.path, self.pending_path)
+            if background:
+                self._worker = threading.Thread(target=self._run_compaction, args=(records, write_snapshot))
+                self._worker.start()
+            else:
+                self._run_compaction(records, write_snapshot)
+        return True
+
+    def _run_compaction(self, records, write_snapshot):
+        try:
+            write_snapshot(records)
+            if os.path.exists(self.pending_path):
+                os.remove(self.pending_path)
+            self.last_error = None
+        except Exception as e:
+            # File chờ được giữ lại và sẽ được áp dụng lại ở lần tải sau
+            self.last_error = e
+            timings.count("journal.compaction_error")
+
+    def wait(self):
+        """Chờ lần nén đang chạy (nếu có) hoàn tất"""
+        worker = self._worker
+        if worker is not None:
+            worker.join()
\ No newline at end of file
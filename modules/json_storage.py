@@ -0,0 +1,488 @@
+import json
+import os
+import threading
+from bisect import insort
+
+from modules.journal import ChangeJournal
+from modules.timing import timings
+
+
+def _stat_marker(path):
+    # Kích thước và thời điểm sửa đổi của file (None nếu chưa có file)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def write_json_atomic(path, data, **dump_options):
+    """
+    Ghi JSON ra file tạm rồi đổi tên đè lên file đích
+
+    File đích luôn là bản cũ hoặc bản mới đầy đủ, không bao giờ là bản ghi dở
+    dù ứng dụng dừng đột ngột giữa chừng.
+    """
+    tmp_file = path + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, **dump_options)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+class RecordList:
+    """
+    Danh sách bản ghi của JsonStorage nhìn từ bên ngoài: len, duyệt, lấy theo chỉ
+    số và cắt lát như list, theo đúng thứ tự thêm vào
+
+    Bản ghi bị xóa chỉ để lại một chỗ trống (None) trong danh sách bên trong nên
+    không phải dịch chuyển các bản ghi phía sau; chỉ số được đổi sang vị trí thật
+    bằng tìm nhị phân trên danh sách các chỗ trống.
+    """
+
+    def __init__(self, storage):
+        self._storage = storage
+
+    def __len__(self):
+        return len(self._storage._records) - len(self._storage._holes)
+
+    def __iter__(self):
+        for record in self._storage._records:
+            if record is not None:
+                yield record
+
+    def _slot(self, index):
+        # Vị trí thật của bản ghi thứ index: chỗ trống thứ k có (holes[k] - k) bản ghi đứng trước
+        holes = self._storage._holes
+        low, high = 0, len(holes)
+        while low < high:
+            middle = (low + high) // 2
+            if holes[middle] - middle <= index:
+                low = middle + 1
+            else:
+                high = middle
+        return index + low
+
+    def __getitem__(self, index):
+        records = self._storage._records
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            if not self._storage._holes:
+                return records[start:stop]
+            rows = []
+            slot = self._slot(start) if start < stop else len(records)
+            while len(rows) < stop - start and slot < len(records):
+                if records[slot] is not None:
+                    rows.append(records[slot])
+                slot += 1
+            return rows
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Chỉ số vượt quá số bản ghi")
+        return records[self._slot(index)]
+
+
+class JsonStorage:
+    """Lưu trữ bản ghi trong file JSON kèm nhật ký thay đổi, toàn bộ dữ liệu nằm trong bộ nhớ"""
+
+    def __init__(self, data_file, indexes=(), record_factory=None):
+        """
+        Args:
+            data_file: Đường dẫn file JSON
+            indexes: Các chỉ mục phụ (có rebuild/add/remove) được cập nhật theo mỗi thay đổi
+            record_factory: Hàm chuyển dict thành dạng bản ghi lưu trong bộ nhớ
+                (ví dụ RecordCompactor); None là giữ nguyên dict
+        """
+        self.data_file = data_file
+        self.indexes = list(indexes)
+        self.record_factory = record_factory
+        self.journal = ChangeJournal(data_file + ".journal")
+        # ID lớn nhất đã cấp, dùng chung giữa các tiến trình mở cùng file dữ liệu
+        self.id_counter_file = self.journal.path + ".ids"
+        # Trạng thái của các chỉ mục có persist_name, ứng với snapshot hiện tại
+        self.state_file = data_file + ".state"
+        # Các thay đổi chưa được ghi vào nhật ký
+        self._pending = []
+        # Các thay đổi đang được ghi vào nhật ký
+        self._saving = []
+        # Việc ghi có thể chạy trên luồng nền trong khi giao diện tiếp tục sửa dữ liệu
+        self._lock = threading.RLock()
+        # Các lần lưu chạy lần lượt để nhật ký giữ đúng thứ tự thay đổi
+        self._save_lock = threading.Lock()
+        # Thông tin file lúc tải/kiểm tra gần nhất, để nhận biết thay đổi của tiến trình khác
+        self._snapshot_stat = None
+        self._journal_identity = None
+        self._journal_offset = 0
+        self._view = RecordList(self)
+        self.records = []
+
+    @property
+    def dirty(self):
+        """Có thay đổi chưa được ghi hay không"""
+        return bool(self._pending)
+
+    @property
+    def records(self):
+        return self._view
+
+    @records.setter
+    def records(self, value):
+        if self.record_factory is not None:
+            value = [self.record_factory(record) for record in value]
+        self._records = value if isinstance(value, list) else list(value)
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        # Chỉ mục id -> vị trí trong danh sách, bản ghi sau cùng được ưu tiên
+        self._holes = []
+        self._positions = {record["id"]: i for i, record in enumerate(self._records)}
+        self._max_id = max((record["id"] for record in self._records
+                            if isinstance(record["id"], int)), default=0)
+        for index in self.indexes:
+            index.rebuild(self._view)
+
+    def _close_holes(self):
+        # Dồn các chỗ trống do xóa; các chỉ mục giữ bản ghi chứ không giữ vị trí nên không cần tạo lại
+        self._records = [record for record in self._records if record is not None]
+        self._holes = []
+        self._positions = {record["id"]: i for i, record in enumerate(self._records)}
+
+    def next_id(self):
+        """Cấp ID mới (lớn hơn mọi ID đã có)"""
+        return self.allocate_ids(1).start
+
+    def _read_id_counter(self):
+        try:
+            with open(self.id_counter_file, "r", encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def allocate_ids(self, count):
+        """
+        Cấp một khối ID liên tiếp
+
+        Bộ đếm ID được đọc và ghi dưới khóa file của nhật ký, nên các tiến trình
+        dùng chung thư mục dữ liệu không bao giờ cấp trùng ID.
+        """
+        with self.journal.lock:
+            with self._lock:
+                start = max(self._read_id_counter(), self._max_id) + 1
+                self._max_id = start + count - 1
+            with open(self.id_counter_file, "w", encoding="utf-8") as f:
+                f.write(str(self._max_id))
+        return range(start, start + count)
+
+    def _files_marker(self):
+        # Thông tin file snapshot và file đang nén (của tiến trình này hoặc tiến trình khác)
+        return [_stat_marker(self.data_file), _stat_marker(self.journal.pending_path)]
+
+    def _read_files(self):
+        # Đọc snapshot, trạng thái chỉ mục và nhật ký mà không đụng tới dữ liệu trong bộ nhớ,
+        # nên chạy được trên luồng nền trong khi giao diện vẫn đọc dữ liệu cũ
+        # Lấy thông tin file trước khi đọc: nếu file đổi trong lúc đọc, lần kiểm tra sau sẽ tải lại
+        snapshot_stat = self._files_marker()
+        if os.path.exists(self.data_file):
+            with open(self.data_file, "r", encoding="utf-8") as f:
+                # Chuyển từng bản ghi ngay khi đọc để không giữ cả danh sách dict trong bộ nhớ
+                records = json.load(f, object_hook=self.record_factory)
+        else:
+            records = []
+        entries = self.journal.read_pending()
+        journal_entries, offset, identity = self.journal.read_from(0)
+        return {
+            "records": records,
+            "index_state": self._read_index_state(snapshot_stat[0]),
+            "entries": entries + journal_entries,
+            "snapshot_stat": snapshot_stat,
+            "journal_identity": identity,
+            "journal_offset": offset,
+        }
+
+    def _install(self, data):
+        # Thay dữ liệu trong bộ nhớ bằng dữ liệu vừa đọc (gọi khi đang giữ self._lock)
+        self.records = data["records"]
+        for index in self._persisted_indexes():
+            if index.persist_name in data["index_state"]:
+                index.restore(data["index_state"][index.persist_name])
+        self._snapshot_stat = data["snapshot_stat"]
+        self._journal_identity = data["journal_identity"]
+        self._journal_offset = data["journal_offset"]
+        self._replay(data["entries"])
+        self._replay_unsaved()
+
+    def _replay_unsaved(self):
+        # Các thay đổi của tiến trình này chưa có trong dữ liệu vừa đọc (đang ghi hoặc
+        # chưa lưu) được áp dụng lại; áp dụng hai lần cho kết quả như một lần
+        self._replay(self._saving + self._pending)
+
+    def load(self):
+        """Tải dữ liệu từ file JSON và áp dụng các thay đổi trong nhật ký"""
+        try:
+            data = self._read_files()
+            with self._lock:
+                self._install(data)
+        except Exception as e:
+            self.records = []
+            raise e
+
+    def save(self):
+        """Ghi các thay đổi chưa lưu vào nhật ký (chi phí tỉ lệ với số thay đổi)"""
+        with self._save_lock:
+            # Lấy ra các thay đổi đang chờ rồi ghi ngoài khóa dữ liệu, giao diện không phải chờ
+            with self._lock:
+                pending, self._pending = self._pending, []
+                self._saving = pending
+            if not pending:
+                return
+            try:
+                self.journal.append_many(pending)
+            except Exception:
+                # Trả lại các thay đổi để lần lưu sau ghi tiếp
+                with self._lock:
+                    self._pending[:0] = pending
+                raise
+            finally:
+                with self._lock:
+                    self._saving = []
+            if self.journal.needs_compaction():
+                self.compact()
+
+    def compact(self, background=True):
+        """Ghi lại toàn bộ dữ liệu thành snapshot mới và làm rỗng nhật ký"""
+        # Giữ khóa file từ lúc kiểm tra nhật ký tới lúc chuyển file: tiến trình khác
+        # không thể ghi thêm thay đổi vào giữa và bị mất khỏi snapshot
+        with self.journal.lock, self._lock:
+            scan = self._scan_journal(self._snapshot_stat, self._journal_identity, self._journal_offset)
+            if scan is None or any(entry.get("w") != self.journal.writer_id for entry in scan[0]):
+                # Còn thay đổi của tiến trình khác chưa được áp dụng vào bộ nhớ (apply_changes),
+                # snapshot lúc này sẽ làm mất chúng; nén ở lần lưu sau
+                return False
+            started = self.journal.compact(list(self._view), self._write_snapshot, background)
+            if started:
+                # Nhật ký hiện tại là một file mới, đọc lại từ đầu
+                self._journal_identity = None
+                self._journal_offset = 0
+            return started
+
+    def _write_snapshot(self, records):
+        write_json_atomic(self.data_file, records, indent=2, default=dict)
+        # File đang nén được xóa ngay sau khi ghi xong snapshot
+        snapshot_stat = [_stat_marker(self.data_file), None]
+        # Chạy trên luồng nén nhật ký
+        with self._lock:
+            self._snapshot_stat = snapshot_stat
+        self._write_index_state(records)
+
+    def _scan_journal(self, snapshot_stat, identity, offset):
+        # Đọc phần nhật ký được ghi thêm sau vị trí offset. Trả về (các thay đổi, định danh
+        # file, vị trí mới), hoặc None nếu file đã bị thay bằng file khác (cần tải lại toàn bộ)
+        if self._files_marker() != snapshot_stat:
+            return None
+        if self.journal.identity() is None:
+            return ([], None, 0) if identity is None else None
+        entries, new_offset, current = self.journal.read_from(offset)
+        if identity is not None and current != identity:
+            return None
+        if new_offset == offset and self.journal.size() < offset:
+            # File nhật ký bị cắt ngắn
+            return None
+        return entries, current, new_offset
+
+    def check_changes(self):
+        """
+        Đọc các thay đổi do tiến trình hoặc máy khác ghi vào file dữ liệu
+
+        Chạy được trên luồng nền: chỉ đọc file, không sửa dữ liệu trong bộ nhớ.
+        Chỉ đọc phần nhật ký mới được ghi thêm kể từ lần kiểm tra trước; nếu tiến
+        trình khác đã nén nhật ký thành snapshot mới thì đọc lại toàn bộ.
+
+        Returns:
+            None nếu không có gì mới, ngược lại là thay đổi cần truyền cho apply_changes
+        """
+        if self.journal.is_compacting():
+            # Tiến trình này đang nén, kiểm tra lại sau. File đang nén của tiến trình khác
+            # (hoặc còn lại sau một lần nén bị gián đoạn) không cần chờ: nhật ký đã bị
+            # chuyển đi nên dữ liệu được đọc lại toàn bộ, gồm cả file đang nén
+            return None
+        # Ghi các thay đổi của chính mình trước để tiến trình khác thấy được
+        self.save()
+        with self._lock:
+            base = (self._snapshot_stat, self._journal_identity, self._journal_offset)
+        scan = self._scan_journal(*base)
+        if scan is None:
+            return {"base": base, "reload": self._read_files()}
+        entries, identity, offset = scan
+        if (identity, offset) == base[1:]:
+            return None
+        return {
+            "base": base,
+            "entries": [entry for entry in entries if entry.get("w") != self.journal.writer_id],
+            "journal_identity": identity,
+            "journal_offset": offset,
+        }
+
+    def apply_changes(self, changes):
+        """
+        Áp dụng kết quả của check_changes vào danh sách và các chỉ mục
+
+        Phải chạy trên luồng đang dùng dữ liệu (luồng giao diện). Các thay đổi
+        chưa lưu của tiến trình này được giữ nguyên.
+
+        Returns:
+            Danh sách ID các bản ghi đã thay đổi, hoặc None nếu đã tải lại toàn bộ
+        """
+        with self._lock:
+            if changes["base"] != (self._snapshot_stat, self._journal_identity, self._journal_offset):
+                # Tiến trình này đã nén hoặc đã đọc file kể từ lúc kiểm tra, lần kiểm tra sau đọc lại
+                return []
+            if "reload" in changes:
+                self._install(changes["reload"])
+                return None
+            self._journal_identity = changes["journal_identity"]
+            self._journal_offset = changes["journal_offset"]
+            entries = changes["entries"]
+            if not entries:
+                return []
+            for entry in entries:
+                if entry.get("op") == "add" and entry.get("id") in self._positions:
+                    # Bị bỏ qua khi áp dụng (xem _replay)
+                    timings.count("journal.ignored_add")
+            self._replay(entries)
+            self._replay_unsaved()
+            return list(dict.fromkeys(entry.get("id") for entry in entries))
+
+    def refresh(self):
+        """check_changes rồi apply_changes trên cùng một luồng"""
+        changes = self.check_changes()
+        return [] if changes is None else self.apply_changes(changes)
+
+    def _persisted_indexes(self):
+        return [index for index in self.indexes if getattr(index, "persist_name", None)]
+
+    def _snapshot_marker(self):
+        return _stat_marker(self.data_file)
+
+    def _write_index_state(self, records):
+        # Lưu trạng thái chỉ mục tính trên đúng danh sách vừa ghi vào snapshot
+        indexes = self._persisted_indexes()
+        if not indexes:
+            return
+        state = {
+            "snapshot": self._snapshot_marker(),
+            "indexes": {index.persist_name: index.state_of(records) for index in indexes},
+        }
+        write_json_atomic(self.state_file, state)
+
+    def _read_index_state(self, snapshot_stat):
+        # Chỉ dùng trạng thái đã lưu nếu nó được ghi cho đúng file snapshot đang đọc
+        if not self._persisted_indexes() or snapshot_stat is None or not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if state.get("snapshot") != snapshot_stat:
+            return {}
+        return state.get("indexes", {})
+
+    def _replay(self, entries):
+        for entry in entries:
+            record_id = entry.get("id")
+            op = entry.get("op")
+            if op == "add" and record_id in self._positions:
+                # Thêm trùng ID (bản ghi đã có, hoặc tiến trình khác cấp trùng ID ở phiên
+                # bản cũ): giữ bản ghi đã thêm trước để mọi tiến trình thấy cùng một bản ghi
+                continue
+            if op == "add":
+                self._insert(entry["data"])
+            elif op == "update":
+                # Bản ghi đã bị xóa (có thể bởi tiến trình khác) thì không thêm lại
+                if record_id in self._positions:
+                    self._replace(record_id, entry["data"])
+            elif op == "delete":
+                self._remove(record_id)
+
+    def _insert(self, record):
+        if self.record_factory is not None:
+            record = self.record_factory(record)
+        self._positions[record["id"]] = len(self._records)
+        self._records.append(record)
+        if isinstance(record["id"], int) and record["id"] > self._max_id:
+            self._max_id = record["id"]
+        for index in self.indexes:
+            index.add(record)
+
+    def _replace(self, record_id, record):
+        if self.record_factory is not None:
+            record = self.record_factory(record)
+        pos = self._positions[record_id]
+        for index in self.indexes:
+            index.remove(self._records[pos])
+            index.add(record)
+        self._records[pos] = record
+
+    def _remove(self, record_id):
+        pos = self._positions.pop(record_id, None)
+        if pos is None:
+            return None
+        # Để lại chỗ trống thay vì dịch chuyển cả danh sách, thứ tự các bản ghi được giữ nguyên
+        removed = self._records[pos]
+        self._records[pos] = None
+        insort(self._holes, pos)
+        for index in self.indexes:
+            index.remove(removed)
+        if len(self._holes) > 64 + len(self._records) // 4:
+            # Dồn lại khi chỗ trống nhiều lên: chi phí O(n) chia đều cho ít nhất n/4 lần xóa
+            self._close_holes()
+        return removed
+
+    def add(self, record):
+        with self._lock:
+            if record["id"] in self._positions:
+                raise ValueError(f"ID {record['id']} đã tồn tại")
+            self._insert(record)
+            self._pending.append(ChangeJournal.make_entry("add", record["id"], record))
+
+    def add_many(self, records):
+        """Thêm nhiều bản ghi, kiểm tra trùng ID trước khi thêm bản ghi nào"""
+        with self._lock:
+            seen = set()
+            for record in records:
+                if record["id"] in self._positions or record["id"] in seen:
+                    raise ValueError(f"ID {record['id']} đã tồn tại")
+                seen.add(record["id"])
+            for record in records:
+                self._insert(record)
+                self._pending.append(ChangeJournal.make_entry("add", record["id"], record))
+
+    def update(self, record_id, updated_data):
+        with self._lock:
+            if record_id not in self._positions:
+                return False
+            self._replace(record_id, updated_data)
+            self._pending.append(ChangeJournal.make_entry("update", record_id, updated_data))
+            return True
+
+    def delete(self, record_id):
+        with self._lock:
+            if self._remove(record_id) is None:
+                return False
+            self._pending.append(ChangeJournal.make_entry("delete", record_id))
+            return True
+
+    def snapshot(self):
+        """Bản sao danh sách bản ghi tại thời điểm gọi (bản ghi không bị sửa tại chỗ nên chỉ cần sao chép nông)"""
+        with self._lock:
+            return list(self._view)
+
+    def get(self, record_id):
+        pos = self._positions.get(record_id)
+        if pos is None:
+            return None
+        return self._records[pos]
\ No newline at end of file
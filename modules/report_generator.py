@@ -1,101 +1,373 @@
-from openpyxl import Workbook
-import openpyxl
-from openpyxl.styles import Font, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
-from datetime import datetime
-import os
-
-class ReportGenerator:
-    @staticmethod
-    def generate_excel_report(data, report_type, filename=None):
-        """
-        Tạo báo cáo Excel từ dữ liệu
-        
-        Args:
-            data: Dữ liệu cần xuất (list of dict)
-            report_type: Loại báo cáo ('crops', 'animals', 'activities')
-            filename: Tên file output (nếu None sẽ tự động tạo)
-        
-        Returns:
-            Đường dẫn file đã tạo
-        """
-        if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"bao_cao_{report_type}_{timestamp}.xlsx"
-        
-        # Tạo workbook mới
-        wb = Workbook()
-        ws = wb.active
-        
-        # Đặt tiêu đề worksheet
-        report_titles = {
-            'crops': 'BÁO CÁO CÂY TRỒNG',
-            'animals': 'BÁO CÁO VẬT NUÔI',
-            'activities': 'BÁO CÁO HOẠT ĐỘNG'
-        }
-        ws.title = report_titles.get(report_type, "BÁO CÁO")
-        
-        # Định dạng cơ bản
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = openpyxl.styles.PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-        alignment = Alignment(horizontal="center", vertical="center")
-        thin_border = Border(left=Side(style='thin'), 
-                             right=Side(style='thin'), 
-                             top=Side(style='thin'), 
-                             bottom=Side(style='thin'))
-        
-        # Xác định headers và columns dựa trên loại báo cáo
-        if report_type == 'crops':
-            headers = ["ID", "Tên Cây", "Loại Cây", "Ngày Trồng", "Diện Tích (ha)", "Trạng Thái", "Ghi Chú"]
-            columns = ["id", "name", "type", "planting_date", "area", "status", "notes"]
-            col_widths = [8, 25, 20, 15, 15, 15, 40]
-        elif report_type == 'animals':
-            headers = ["ID", "Tên Vật Nuôi", "Loại", "Ngày Nhập", "Số Lượng", "Trạng Thái", "Ghi Chú"]
-            columns = ["id", "name", "type", "entry_date", "quantity", "status", "notes"]
-            col_widths = [8, 25, 20, 15, 15, 15, 40]
-        elif report_type == 'activities':
-            headers = ["ID", "Tên Hoạt Động", "Loại", "Ngày", "Người Phụ Trách", "Trạng Thái", "Mô Tả"]
-            columns = ["id", "name", "type", "date", "responsible", "status", "description"]
-            col_widths = [8, 25, 20, 15, 20, 15, 40]
-        else:
-            raise ValueError("Loại báo cáo không hợp lệ")
-        
-        # Thêm tiêu đề báo cáo
-        ws.merge_cells('A1:G1')
-        title_cell = ws['A1']
-        title_cell.value = report_titles.get(report_type, "BÁO CÁO")
-        title_cell.font = Font(size=16, bold=True)
-        title_cell.alignment = Alignment(horizontal="center")
-        
-        # Thêm ngày xuất báo cáo
-        ws.merge_cells('A2:G2')
-        date_cell = ws['A2']
-        date_cell.value = f"Ngày xuất báo cáo: {datetime.now().strftime('%d/%m/%Y %H:%M')}"
-        date_cell.alignment = Alignment(horizontal="right")
-        date_cell.font = Font(italic=True)
-        
-        # Thêm header
-        for col_num, (header, width) in enumerate(zip(headers, col_widths), 1):
-            cell = ws.cell(row=3, column=col_num, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = alignment
-            cell.border = thin_border
-            ws.column_dimensions[get_column_letter(col_num)].width = width
-        
-        # Thêm dữ liệu
-        for row_num, item in enumerate(data, 4):
-            for col_num, column in enumerate(columns, 1):
-                cell = ws.cell(row=row_num, column=col_num, value=item.get(column, ""))
-                cell.border = thin_border
-                if col_num in [4, 5]:  # Căn giữa cho cột số và ngày
-                    cell.alignment = Alignment(horizontal="center")
-        
-        # Lưu file
-        if not os.path.exists('reports'):
-            os.makedirs('reports')
-        
-        filepath = os.path.join('reports', filename)
-        wb.save(filepath)
-        
-        return filepath
\ No newline at end of file
+from openpyxl import Workbook
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
+from datetime import datetime
+import csv
+import gzip
+import json
+import os
+
+from modules.timing import timed
+
+REPORT_TITLES = {
+    'crops': 'BÁO CÁO CÂY TRỒNG',
+    'animals': 'BÁO CÁO VẬT NUÔI',
+    'activities': 'BÁO CÁO HOẠT ĐỘNG'
+}
+
+# Tiêu đề cột, trường dữ liệu và độ rộng cột của từng loại báo cáo
+REPORT_COLUMNS = {
+    'crops': (
+        ["ID", "Tên Cây", "Loại Cây", "Ngày Trồng", "Diện Tích (ha)", "Trạng Thái", "Ghi Chú"],
+        ["id", "name", "type", "planting_date", "area", "status", "notes"],
+        [8, 25, 20, 15, 15, 15, 40],
+    ),
+    'animals': (
+        ["ID", "Tên Vật Nuôi", "Loại", "Ngày Nhập", "Số Lượng", "Trạng Thái", "Ghi Chú"],
+        ["id", "name", "type", "entry_date", "quantity", "status", "notes"],
+        [8, 25, 20, 15, 15, 15, 40],
+    ),
+    'activities': (
+        ["ID", "Tên Hoạt Động", "Loại", "Ngày", "Người Phụ Trách", "Trạng Thái", "Mô Tả"],
+        ["id", "name", "type", "date", "responsible", "status", "description"],
+        [8, 25, 20, 15, 20, 15, 40],
+    ),
+}
+
+
+def report_columns(report_type):
+    """Trả về (headers, columns, col_widths) của loại báo cáo"""
+    if report_type not in REPORT_COLUMNS:
+        raise ValueError("Loại báo cáo không hợp lệ")
+    return REPORT_COLUMNS[report_type]
+
+
+def _report_styles():
+    # Các style có tên được đăng ký một lần trong workbook và dùng chung cho mọi ô
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    return [
+        NamedStyle(name="report_title", font=Font(size=16, bold=True),
+                   alignment=Alignment(horizontal="center")),
+        NamedStyle(name="report_section", font=Font(size=12, bold=True)),
+        NamedStyle(name="report_date", font=Font(italic=True),
+                   alignment=Alignment(horizontal="right")),
+        NamedStyle(name="report_header", font=Font(bold=True, color="FFFFFF"),
+                   fill=openpyxl.styles.PatternFill(start_color="4F81BD", end_color="4F81BD",
+                                                    fill_type="solid"),
+                   alignment=Alignment(horizontal="center", vertical="center"),
+                   border=border),
+        NamedStyle(name="report_cell", border=border),
+        NamedStyle(name="report_cell_center", border=border,
+                   alignment=Alignment(horizontal="center")),
+    ]
+
+
+class ReportCancelled(Exception):
+    """Việc tạo báo cáo bị người dùng hủy"""
+
+
+class ReportGenerator:
+    # Số dòng giữa hai lần báo tiến độ / kiểm tra yêu cầu hủy
+    PROGRESS_INTERVAL = 1000
+
+    @staticmethod
+    @timed("report.excel")
+    def generate_excel_report(data, report_type, filename=None, progress_callback=None, cancel_event=None,
+                              streaming=False, statistics=None):
+        """
+        Tạo báo cáo Excel từ dữ liệu
+        
+        Args:
+            data: Dữ liệu cần xuất (list of dict)
+            report_type: Loại báo cáo ('crops', 'animals', 'activities')
+            filename: Tên file output (nếu None sẽ tự động tạo)
+            progress_callback: Hàm nhận (số dòng đã ghi, tổng số dòng) để báo tiến độ
+            cancel_event: threading.Event, khi được set sẽ dừng và ném ReportCancelled
+            streaming: Ghi theo luồng bằng workbook write-only; data có thể là
+                iterator bất kỳ, bộ nhớ không tăng theo số dòng
+            statistics: Các bảng thống kê (tiêu đề, tiêu đề cột, các dòng) ghi vào
+                sheet "Thống kê", xem farm_stats.statistics_tables; có thể là một hàm
+                không tham số, khi đó thống kê chỉ được tính sau khi đã ghi xong các dòng
+        
+        Returns:
+            Đường dẫn file đã tạo
+        """
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"bao_cao_{report_type}_{timestamp}.xlsx"
+        
+        if streaming:
+            return ReportGenerator._generate_streaming_excel(
+                data, report_type, filename, progress_callback, cancel_event, statistics)
+
+        # Tạo workbook mới
+        wb = Workbook()
+        ws = wb.active
+        
+        # Đặt tiêu đề worksheet
+        ws.title = REPORT_TITLES.get(report_type, "BÁO CÁO")
+        
+        # Định dạng cơ bản
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = openpyxl.styles.PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
+        alignment = Alignment(horizontal="center", vertical="center")
+        center = Alignment(horizontal="center")
+        thin_border = Border(left=Side(style='thin'), 
+                             right=Side(style='thin'), 
+                             top=Side(style='thin'), 
+                             bottom=Side(style='thin'))
+        
+        # Xác định headers và columns dựa trên loại báo cáo
+        headers, columns, col_widths = report_columns(report_type)
+        
+        # Thêm tiêu đề báo cáo
+        ws.merge_cells('A1:G1')
+        title_cell = ws['A1']
+        title_cell.value = REPORT_TITLES.get(report_type, "BÁO CÁO")
+        title_cell.font = Font(size=16, bold=True)
+        title_cell.alignment = Alignment(horizontal="center")
+        
+        # Thêm ngày xuất báo cáo
+        ws.merge_cells('A2:G2')
+        date_cell = ws['A2']
+        date_cell.value = f"Ngày xuất báo cáo: {datetime.now().strftime('%d/%m/%Y %H:%M')}"
+        date_cell.alignment = Alignment(horizontal="right")
+        date_cell.font = Font(italic=True)
+        
+        # Thêm header
+        for col_num, (header, width) in enumerate(zip(headers, col_widths), 1):
+            cell = ws.cell(row=3, column=col_num, value=header)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = alignment
+            cell.border = thin_border
+            ws.column_dimensions[get_column_letter(col_num)].width = width
+        
+        # Thêm dữ liệu
+        total = len(data)
+        for row_num, item in enumerate(data, 4):
+            for col_num, column in enumerate(columns, 1):
+                cell = ws.cell(row=row_num, column=col_num, value=item.get(column, ""))
+                cell.border = thin_border
+                if col_num in [4, 5]:  # Căn giữa cho cột số và ngày
+                    cell.alignment = center
+            done = row_num - 3
+            if done % ReportGenerator.PROGRESS_INTERVAL == 0:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ReportCancelled()
+                if progress_callback:
+                    progress_callback(done, total)
+        
+        if cancel_event is not None and cancel_event.is_set():
+            raise ReportCancelled()
+        if progress_callback:
+            progress_callback(total, total)
+        
+        statistics = ReportGenerator._resolve_statistics(statistics, cancel_event)
+        if statistics:
+            for style in _report_styles():
+                wb.add_named_style(style)
+            ReportGenerator._write_statistics_sheet(wb, statistics)
+        
+        # Lưu file
+        if not os.path.exists('reports'):
+            os.makedirs('reports')
+        
+        filepath = os.path.join('reports', filename)
+        wb.save(filepath)
+        
+        return filepath
+
+    @staticmethod
+    def _generate_streaming_excel(data, report_type, filename, progress_callback, cancel_event, statistics):
+        headers, columns, col_widths = report_columns(report_type)
+        total = len(data) if hasattr(data, "__len__") else None
+
+        wb = Workbook(write_only=True)
+        for style in _report_styles():
+            wb.add_named_style(style)
+        ws = wb.create_sheet(REPORT_TITLES.get(report_type, "BÁO CÁO"))
+        # Độ rộng cột phải được đặt trước khi ghi dòng đầu tiên
+        for col_num, width in enumerate(col_widths, 1):
+            ws.column_dimensions[get_column_letter(col_num)].width = width
+
+        def styled(value, style):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            return cell
+
+        last_column = get_column_letter(len(headers))
+        ws.merged_cells.add(f"A1:{last_column}1")
+        ws.merged_cells.add(f"A2:{last_column}2")
+        ws.append([styled(REPORT_TITLES.get(report_type, "BÁO CÁO"), "report_title")])
+        ws.append([styled(f"Ngày xuất báo cáo: {datetime.now().strftime('%d/%m/%Y %H:%M')}", "report_date")])
+        ws.append([styled(header, "report_header") for header in headers])
+
+        # Cột ngày và cột số (4, 5) được căn giữa
+        cell_styles = ["report_cell_center" if col_num in (4, 5) else "report_cell"
+                       for col_num in range(1, len(columns) + 1)]
+        done = 0
+        for item in data:
+            ws.append([styled(item.get(column, ""), style) for column, style in zip(columns, cell_styles)])
+            done += 1
+            if done % ReportGenerator.PROGRESS_INTERVAL == 0:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ReportCancelled()
+                if progress_callback:
+                    progress_callback(done, total)
+
+        if cancel_event is not None and cancel_event.is_set():
+            raise ReportCancelled()
+        if progress_callback:
+            progress_callback(done, done if total is None else total)
+
+        statistics = ReportGenerator._resolve_statistics(statistics, cancel_event)
+        if statistics:
+            ReportGenerator._write_statistics_sheet(wb, statistics)
+
+        if not os.path.exists('reports'):
+            os.makedirs('reports')
+        filepath = os.path.join('reports', filename)
+        wb.save(filepath)
+        return filepath
+
+    @staticmethod
+    def _resolve_statistics(statistics, cancel_event):
+        if callable(statistics):
+            statistics = statistics()
+            # Việc tính thống kê có thể mất thời gian, người dùng có thể đã hủy trong lúc đó
+            if cancel_event is not None and cancel_event.is_set():
+                raise ReportCancelled()
+        return statistics
+
+    @staticmethod
+    def _write_statistics_sheet(wb, statistics):
+        # Dùng WriteOnlyCell nên chạy được với cả workbook thường và workbook write-only
+        # (các style có tên phải được đăng ký trước)
+        ws = wb.create_sheet("Thống kê")
+        for col_num, width in enumerate([30, 20, 18, 18], 1):
+            ws.column_dimensions[get_column_letter(col_num)].width = width
+
+        def styled(value, style):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            return cell
+
+        for title, headers, rows in statistics:
+            ws.append([styled(title, "report_section")])
+            ws.append([styled(header, "report_header") for header in headers])
+            for row in rows:
+                ws.append([styled(value, "report_cell") for value in row])
+            ws.append([])
+
+    @staticmethod
+    def _iter_chunks(data, chunk_size, progress_callback, cancel_event):
+        # Chia dữ liệu thành các khối có kích thước giới hạn, báo tiến độ và kiểm tra hủy sau mỗi khối
+        total = len(data) if hasattr(data, "__len__") else None
+        done = 0
+        chunk = []
+        for item in data:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                done += len(chunk)
+                chunk = []
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ReportCancelled()
+                if progress_callback:
+                    progress_callback(done, total)
+        if chunk:
+            yield chunk
+            done += len(chunk)
+        if cancel_event is not None and cancel_event.is_set():
+            raise ReportCancelled()
+        if progress_callback:
+            progress_callback(done, done if total is None else total)
+
+    @staticmethod
+    def _write_stream(data, report_type, filename, extension, compress, open_writer,
+                      chunk_size, progress_callback, cancel_event):
+        # Ghi báo cáo dạng văn bản theo từng khối; xóa file dở dang nếu bị hủy hoặc lỗi
+        report_columns(report_type)
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"bao_cao_{report_type}_{timestamp}.{extension}"
+        if compress and not filename.endswith(".gz"):
+            filename += ".gz"
+
+        if not os.path.exists('reports'):
+            os.makedirs('reports')
+        filepath = os.path.join('reports', filename)
+
+        if compress:
+            f = gzip.open(filepath, "wt", encoding="utf-8", newline="")
+        else:
+            f = open(filepath, "w", encoding="utf-8", newline="")
+        try:
+            with f:
+                # open_writer ghi phần đầu file và trả về hàm ghi một khối dòng
+                write_chunk = open_writer(f)
+                for chunk in ReportGenerator._iter_chunks(data, chunk_size, progress_callback, cancel_event):
+                    write_chunk(chunk)
+        except BaseException:
+            os.remove(filepath)
+            raise
+        return filepath
+
+    @staticmethod
+    @timed("report.csv")
+    def generate_csv_report(data, report_type, filename=None, compress=False, chunk_size=5000,
+                            progress_callback=None, cancel_event=None):
+        """
+        Xuất báo cáo CSV theo luồng, dùng cùng các cột với báo cáo Excel
+        
+        Args:
+            data: Dữ liệu cần xuất (list hoặc iterator các dict)
+            report_type: Loại báo cáo ('crops', 'animals', 'activities')
+            filename: Tên file output (nếu None sẽ tự động tạo)
+            compress: Nén gzip (thêm đuôi .gz)
+            chunk_size: Số dòng tối đa giữ trong bộ đệm trước mỗi lần ghi
+            progress_callback: Hàm nhận (số dòng đã ghi, tổng số dòng) để báo tiến độ
+            cancel_event: threading.Event, khi được set sẽ dừng và ném ReportCancelled
+        
+        Returns:
+            Đường dẫn file đã tạo
+        """
+        headers, columns, _ = report_columns(report_type)
+
+        def open_writer(f):
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            return lambda chunk: writer.writerows([item.get(column, "") for column in columns] for item in chunk)
+
+        return ReportGenerator._write_stream(data, report_type, filename, "csv", compress,
+                                             open_writer, chunk_size,
+                                             progress_callback, cancel_event)
+
+    @staticmethod
+    @timed("report.jsonl")
+    def generate_jsonl_report(data, report_type, filename=None, compress=False, chunk_size=5000,
+                              progress_callback=None, cancel_event=None):
+        """
+        Xuất báo cáo JSON Lines (mỗi dòng một bản ghi) theo luồng
+        
+        Mỗi dòng chỉ gồm các trường của báo cáo cùng loại, theo thứ tự cột
+        của báo cáo Excel. Các tham số giống generate_csv_report.
+        
+        Returns:
+            Đường dẫn file đã tạo
+        """
+        _, columns, _ = report_columns(report_type)
+
+        def open_writer(f):
+            return lambda chunk: f.write("".join(
+                json.dumps({column: item.get(column, "") for column in columns}, ensure_ascii=False) + "\n"
+                for item in chunk
+            ))
+
+        return ReportGenerator._write_stream(data, report_type, filename, "jsonl", compress,
+                                             open_writer, chunk_size,
+                                             progress_callback, cancel_event)
\ No newline at end of file
@@ -0,0 +1,123 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+
+_TOKEN_RE = re.compile(r"\w+")
+_COMBINING_RE = re.compile("[\u0300-\u036f]")
+
+
+def fold_text(text):
+    """Chuyển về chữ thường và bỏ dấu tiếng Việt ("Lúa Đông" -> "lua dong")"""
+    text = str(text).lower()
+    if text.isascii():
+        return text
+    text = unicodedata.normalize("NFD", text.replace("đ", "d"))
+    return _COMBINING_RE.sub("", text)
+
+
+def tokenize(text):
+    """Tách chuỗi đã bỏ dấu thành các từ"""
+    return _TOKEN_RE.findall(fold_text(text))
+
+
+@lru_cache(maxsize=65536)
+def _value_tokens(value):
+    # Các giá trị như loại, trạng thái, người phụ trách lặp lại rất nhiều lần
+    return tuple(tokenize(value))
+
+
+def record_tokens(record, fields):
+    """Tập các từ (đã bỏ dấu) trong các trường cần tìm kiếm của bản ghi"""
+    tokens = set()
+    for field in fields:
+        tokens.update(_value_tokens(str(record.get(field, ""))))
+    return tokens
+
+
+def matches_query(record, fields, query):
+    """Kiểm tra một bản ghi có khớp truy vấn không (không cần tra chỉ mục)"""
+    tokens = record_tokens(record, fields)
+    return all(
+        any(token.startswith(prefix) for token in tokens)
+        for prefix in tokenize(query)
+    )
+
+
+class SearchIndex:
+    """
+    Chỉ mục đảo từ -> tập ID cho tìm kiếm không phân biệt dấu
+
+    Mỗi từ trong truy vấn được so khớp như tiền tố của một từ trong bản ghi
+    ("lu" tìm thấy "Lúa"), các từ trong truy vấn kết hợp theo kiểu AND.
+    Danh sách từ được giữ đã sắp xếp để tìm theo tiền tố bằng tìm kiếm nhị phân.
+    Chỉ mục chỉ được tạo ở lần tìm kiếm đầu tiên để không làm chậm việc tải dữ liệu.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self._source = []
+        self._postings = None
+        self._tokens = []
+
+    def rebuild(self, records):
+        # records là danh sách dữ liệu đang dùng, được đọc lại khi cần tạo chỉ mục
+        self._source = records
+        self._postings = None
+        self._tokens = []
+
+    def _build(self):
+        postings = {}
+        for record in self._source:
+            for token in record_tokens(record, self.fields):
+                postings.setdefault(token, set()).add(record["id"])
+        self._tokens = sorted(postings)
+        self._postings = postings
+
+    def add(self, record):
+        if self._postings is None:
+            return
+        for token in record_tokens(record, self.fields):
+            ids = self._postings.get(token)
+            if ids is None:
+                ids = self._postings[token] = set()
+                self._tokens.insert(bisect_left(self._tokens, token), token)
+            ids.add(record["id"])
+
+    def remove(self, record):
+        if self._postings is None:
+            return
+        for token in record_tokens(record, self.fields):
+            ids = self._postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(record["id"])
+            if not ids:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    def _prefix_ids(self, prefix):
+        ids = self._postings.get(prefix)
+        result = set(ids) if ids else set()
+        i = bisect_left(self._tokens, prefix)
+        while i < len(self._tokens) and self._tokens[i].startswith(prefix):
+            if self._tokens[i] != prefix:
+                result |= self._postings[self._tokens[i]]
+            i += 1
+        return result
+
+    def search(self, query):
+        """Trả về tập ID khớp với truy vấn (None nếu truy vấn rỗng)"""
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        if self._postings is None:
+            self._build()
+        result = None
+        # Từ dài thường ít kết quả hơn, xét trước để tập giao nhỏ nhanh
+        for token in sorted(set(tokens), key=len, reverse=True):
+            ids = self._prefix_ids(token)
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result
\ No newline at end of file
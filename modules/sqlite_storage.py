@@ -0,0 +1,531 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+from modules.date_index import parse_date
+from modules.search_index import tokenize
+
+DEFAULT_DB_PATH = "data/farm.db"
+
+# Các cột được tách riêng khỏi dữ liệu JSON để đánh chỉ mục và truy vấn
+# date_key là ngày dạng yyyy-mm-dd (so sánh chuỗi đúng thứ tự ngày) cho truy vấn theo khoảng
+COLUMNS = ("id", "type", "status", "date", "date_key", "search_text", "data")
+
+class SQLiteRecordList:
+    """Danh sách chỉ đọc, truy vấn bản ghi từ SQLite theo nhu cầu thay vì nạp hết vào bộ nhớ"""
+
+    def __init__(self, storage, where="", params=(), chunk_size=1000):
+        """
+        Args:
+            storage: SQLiteStorage nguồn
+            where: Điều kiện lọc SQL (không gồm từ khóa WHERE), rỗng là toàn bộ bảng
+            params: Tham số cho điều kiện lọc
+        """
+        self.storage = storage
+        self.where = where
+        self.params = tuple(params)
+        self.chunk_size = chunk_size
+        self._count = None
+        self._count_version = None
+
+    def __len__(self):
+        if not self.where:
+            return self.storage.count()
+        # Đếm lại chỉ khi dữ liệu đã thay đổi kể từ lần đếm trước
+        if self._count_version != self.storage.version:
+            self._count = self.storage.count_where(self.where, self.params)
+            self._count_version = self.storage.version
+        return self._count
+
+    def __iter__(self):
+        last_id = None
+        while True:
+            rows = self.storage.fetch_after(last_id, self.chunk_size, self.where, self.params)
+            for record in rows:
+                yield record
+            if len(rows) < self.chunk_size:
+                return
+            last_id = rows[-1]["id"]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            return self.storage.fetch_range(start, max(stop - start, 0), self.where, self.params)
+        if index < 0:
+            index += len(self)
+        rows = self.storage.fetch_range(index, 1, self.where, self.params)
+        if not rows:
+            raise IndexError("Chỉ số vượt quá số bản ghi")
+        return rows[0]
+
+
+class SQLiteSnapshot:
+    """
+    Ảnh chụp nhất quán của một bảng, đọc tuần tự qua một kết nối riêng
+
+    Có thể duyệt từ luồng khác (ví dụ luồng xuất báo cáo); một câu SELECT
+    trong chế độ WAL luôn thấy dữ liệu tại thời điểm bắt đầu đọc.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.total = storage.count()
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        conn = sqlite3.connect(self.storage.db_path)
+        try:
+            cursor = conn.execute(f"SELECT data FROM {self.storage.table} ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                for row in rows:
+                    yield json.loads(row[0])
+        finally:
+            conn.close()
+
+
+class SQLiteStorage:
+    """Lưu trữ bản ghi trong bảng SQLite có chỉ mục theo id, type, status và ngày"""
+
+    def __init__(self, db_path, table, date_field, search_fields=(), indexes=(), facet_fields=()):
+        """
+        Args:
+            facet_fields: Các trường dùng để lọc (facet_values/filter); trường không có
+                cột riêng được đánh chỉ mục trên giá trị đọc từ JSON
+            indexes: Các chỉ mục trong bộ nhớ (có rebuild/add/remove) được cập nhật theo
+                mỗi thay đổi; chỉ mục có persist_name được lưu trong bảng _meta
+        """
+        self.db_path = db_path
+        self.table = table
+        self.date_field = date_field
+        self.search_fields = search_fields
+        self.indexes = list(indexes)
+        self.facet_fields = tuple(facet_fields)
+        # Tăng sau mỗi thay đổi để các danh sách đã lọc biết cần đếm lại
+        self.version = 0
+        # Có thay đổi chưa commit hay không
+        self._dirty = False
+        # PRAGMA data_version lúc tải, thay đổi khi kết nối khác commit
+        self._data_version = None
+        self._lock = threading.RLock()
+        self._conn = None
+        self._count = None
+        self._max_id = 0
+        self._records = SQLiteRecordList(self)
+
+    @property
+    def records(self):
+        return self._records
+
+    @records.setter
+    def records(self, value):
+        self.import_records(value)
+
+    def _connect(self):
+        if self._conn is None:
+            if os.path.dirname(self.db_path):
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "id INTEGER PRIMARY KEY, type TEXT, status TEXT, date TEXT, date_key TEXT, search_text TEXT, "
+                "data TEXT NOT NULL)"
+            )
+            self._migrate_schema()
+            self._conn.execute("CREATE TABLE IF NOT EXISTS _meta (key TEXT PRIMARY KEY, value TEXT)")
+            for column in ("type", "status", "date", "date_key"):
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{self.table}_{column} ON {self.table}({column})"
+                )
+            for field in self.facet_fields:
+                expression = self._field_sql(field)
+                if expression != field:
+                    self._conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{self.table}_{field} ON {self.table}({expression})"
+                    )
+            self._conn.commit()
+        return self._conn
+
+    def _migrate_schema(self):
+        # Bổ sung các cột mới cho cơ sở dữ liệu tạo bởi phiên bản cũ
+        existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({self.table})")}
+        for column in COLUMNS:
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE {self.table} ADD COLUMN {column} TEXT")
+        if "search_text" not in existing:
+            rows = self._conn.execute(f"SELECT id, data FROM {self.table}").fetchall()
+            self._conn.executemany(
+                f"UPDATE {self.table} SET search_text = ? WHERE id = ?",
+                [(self._search_text(json.loads(data)), record_id) for record_id, data in rows],
+            )
+        if "date_key" not in existing:
+            rows = self._conn.execute(f"SELECT id, date FROM {self.table}").fetchall()
+            self._conn.executemany(
+                f"UPDATE {self.table} SET date_key = ? WHERE id = ?",
+                [(self._date_key(value), record_id) for record_id, value in rows],
+            )
+
+    def _search_text(self, record):
+        # Dạng " tu1 tu2 ..." để so khớp tiền tố bằng LIKE '% tiền_tố%'
+        tokens = tokenize(" ".join(str(record.get(field, "")) for field in self.search_fields))
+        return " " + " ".join(tokens)
+
+    def _date_key(self, value):
+        day = parse_date(value) if value else None
+        return day.isoformat() if day is not None else None
+
+    def _field_sql(self, field):
+        # type, status và ngày có cột riêng, các trường khác đọc từ dữ liệu JSON
+        if field in ("type", "status"):
+            return field
+        if field == self.date_field:
+            return "date"
+        return f"json_extract(data, '$.{field}')"
+
+    def _row_values(self, record):
+        return (
+            record["id"],
+            record.get("type"),
+            record.get("status"),
+            record.get(self.date_field),
+            self._date_key(record.get(self.date_field)),
+            self._search_text(record),
+            json.dumps(record, ensure_ascii=False, default=dict),
+        )
+
+    def _insert_sql(self, verb="INSERT"):
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        return f"{verb} INTO {self.table} ({', '.join(COLUMNS)}) VALUES ({placeholders})"
+
+    def _changed(self):
+        self.version += 1
+
+    @property
+    def dirty(self):
+        """Có thay đổi chưa được commit hay không"""
+        return self._dirty
+
+    def load(self):
+        """Mở cơ sở dữ liệu; chỉ đọc số lượng và ID lớn nhất, không nạp bản ghi"""
+        with self._lock:
+            conn = self._connect()
+            self._data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            self._count, max_id = conn.execute(f"SELECT COUNT(*), MAX(id) FROM {self.table}").fetchone()
+            self._max_id = max_id or 0
+            self._changed()
+            for index in self.indexes:
+                index.rebuild(self._records)
+            self._restore_index_state()
+
+    def check_changes(self):
+        """
+        Nhận biết thay đổi do tiến trình khác commit (PRAGMA data_version), chạy được trên luồng nền
+
+        Returns:
+            None nếu không có thay đổi, ngược lại là thay đổi cần truyền cho apply_changes
+        """
+        with self._lock:
+            if self._conn is None:
+                return None
+            if self._dirty:
+                self.save()
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return None
+            return {"data_version": version}
+
+    def apply_changes(self, changes):
+        """
+        Bản ghi luôn được đọc trực tiếp từ cơ sở dữ liệu nên chỉ cần đọc lại số
+        lượng, ID lớn nhất và tạo lại các chỉ mục trong bộ nhớ (trên luồng giao
+        diện). Trạng thái chỉ mục đã lưu trong _meta không được dùng vì tiến
+        trình kia không biết các thay đổi của tiến trình này.
+
+        Returns:
+            None (dữ liệu được xem như đã tải lại)
+        """
+        with self._lock:
+            self._data_version = changes["data_version"]
+            self._count, max_id = self._conn.execute(f"SELECT COUNT(*), MAX(id) FROM {self.table}").fetchone()
+            self._max_id = max(self._max_id, max_id or 0)
+            self._changed()
+            for index in self.indexes:
+                index.rebuild(self._records)
+            return None
+
+    def _meta_key(self, index):
+        return f"{self.table}.{index.persist_name}"
+
+    def _persisted_indexes(self):
+        return [index for index in self.indexes if getattr(index, "persist_name", None)]
+
+    def _restore_index_state(self):
+        for index in self._persisted_indexes():
+            row = self._conn.execute("SELECT value FROM _meta WHERE key = ?", (self._meta_key(index),)).fetchone()
+            if row:
+                index.restore(json.loads(row[0]))
+
+    def _write_index_state(self):
+        # Ghi trong cùng giao dịch với dữ liệu nên trạng thái luôn khớp với dữ liệu đã commit
+        for index in self._persisted_indexes():
+            if index.is_built():
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO _meta (key, value) VALUES (?, ?)",
+                    (self._meta_key(index), json.dumps(index.get_state(), ensure_ascii=False)),
+                )
+            else:
+                self._conn.execute("DELETE FROM _meta WHERE key = ?", (self._meta_key(index),))
+
+    def _clear_index_state(self):
+        for index in self._persisted_indexes():
+            self._conn.execute("DELETE FROM _meta WHERE key = ?", (self._meta_key(index),))
+
+    def save(self):
+        """Xác nhận (commit) các thay đổi đang chờ"""
+        with self._lock:
+            conn = self._connect()
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            # Đang trong giao dịch ghi nên không kết nối nào khác commit được xen vào:
+            # data_version khác lúc tải nghĩa là có dữ liệu các chỉ mục trong bộ nhớ chưa biết
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                self._write_index_state()
+            else:
+                # Không lưu số liệu sai; lần tải sau tính lại từ dữ liệu
+                self._clear_index_state()
+            conn.commit()
+            self._dirty = False
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+
+    def count(self):
+        with self._lock:
+            if self._count is None:
+                self.load()
+            return self._count
+
+    def count_where(self, where, params=()):
+        with self._lock:
+            return self._connect().execute(
+                f"SELECT COUNT(*) FROM {self.table} WHERE {where}", params
+            ).fetchone()[0]
+
+    def next_id(self):
+        """Cấp ID mới (lớn hơn mọi ID đã có)"""
+        return self.allocate_ids(1).start
+
+    def allocate_ids(self, count):
+        """
+        Cấp một khối ID liên tiếp
+
+        Bộ đếm ID nằm trong bảng _meta và được đọc, ghi trong một giao dịch ghi
+        (BEGIN IMMEDIATE), nên các tiến trình dùng chung cơ sở dữ liệu không bao
+        giờ cấp trùng ID.
+        """
+        with self._lock:
+            if self._count is None:
+                self.load()
+            conn = self._connect()
+            # Nếu đang có thay đổi chưa commit thì kết nối này đã giữ quyền ghi
+            started = not conn.in_transaction
+            if started:
+                conn.execute("BEGIN IMMEDIATE")
+            key = f"{self.table}.next_id"
+            row = conn.execute("SELECT value FROM _meta WHERE key = ?", (key,)).fetchone()
+            max_id = conn.execute(f"SELECT MAX(id) FROM {self.table}").fetchone()[0] or 0
+            start = max(int(row[0]) if row else 0, max_id, self._max_id) + 1
+            self._max_id = start + count - 1
+            conn.execute("INSERT OR REPLACE INTO _meta (key, value) VALUES (?, ?)", (key, str(self._max_id)))
+            if started:
+                conn.commit()
+            else:
+                self._dirty = True
+            return range(start, start + count)
+
+    def fetch_after(self, last_id, limit, where="", params=()):
+        conditions = [f"({where})"] if where else []
+        values = list(params)
+        if last_id is not None:
+            conditions.append("id > ?")
+            values.append(last_id)
+        clause = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT data FROM {self.table} {clause}ORDER BY id LIMIT ?", values + [limit]
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def fetch_range(self, offset, limit, where="", params=()):
+        clause = f"WHERE {where} " if where else ""
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT data FROM {self.table} {clause}ORDER BY id LIMIT ? OFFSET ?",
+                tuple(params) + (limit, offset),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def add(self, record):
+        with self._lock:
+            try:
+                self._connect().execute(self._insert_sql(), self._row_values(record))
+            except sqlite3.IntegrityError:
+                raise ValueError(f"ID {record['id']} đã tồn tại")
+            if self._count is not None:
+                self._count += 1
+            if isinstance(record["id"], int) and record["id"] > self._max_id:
+                self._max_id = record["id"]
+            self._dirty = True
+            self._changed()
+            for index in self.indexes:
+                index.add(record)
+
+    def add_many(self, records):
+        """Thêm nhiều bản ghi bằng một lệnh executemany"""
+        with self._lock:
+            try:
+                self._connect().executemany(self._insert_sql(), [self._row_values(record) for record in records])
+            except sqlite3.IntegrityError as e:
+                self._connect().rollback()
+                raise ValueError(f"ID đã tồn tại: {str(e)}")
+            if self._count is not None:
+                self._count += len(records)
+            int_ids = [record["id"] for record in records if isinstance(record["id"], int)]
+            self._max_id = max([self._max_id] + int_ids)
+            self._dirty = True
+            self._changed()
+            for index in self.indexes:
+                for record in records:
+                    index.add(record)
+
+    def update(self, record_id, updated_data):
+        with self._lock:
+            old = self.get(record_id) if self.indexes else None
+            assignments = ", ".join(f"{column} = ?" for column in COLUMNS[1:])
+            cursor = self._connect().execute(
+                f"UPDATE {self.table} SET {assignments} WHERE id = ?",
+                self._row_values(updated_data)[1:] + (record_id,),
+            )
+            self._dirty = True
+            self._changed()
+            if cursor.rowcount > 0 and old is not None:
+                for index in self.indexes:
+                    index.remove(old)
+                    index.add(updated_data)
+            return cursor.rowcount > 0
+
+    def delete(self, record_id):
+        with self._lock:
+            old = self.get(record_id) if self.indexes else None
+            cursor = self._connect().execute(f"DELETE FROM {self.table} WHERE id = ?", (record_id,))
+            if cursor.rowcount > 0 and self._count is not None:
+                self._count -= 1
+            self._dirty = True
+            self._changed()
+            if cursor.rowcount > 0 and old is not None:
+                for index in self.indexes:
+                    index.remove(old)
+            return cursor.rowcount > 0
+
+    def get(self, record_id):
+        with self._lock:
+            row = self._connect().execute(
+                f"SELECT data FROM {self.table} WHERE id = ?", (record_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def snapshot(self):
+        """Ảnh chụp dữ liệu đã commit để đọc từ luồng khác"""
+        self.save()
+        return SQLiteSnapshot(self)
+
+    def search(self, query):
+        """Tìm theo tiền tố từ, không phân biệt dấu; trả về danh sách truy vấn theo nhu cầu"""
+        tokens = tokenize(query)
+        if not tokens:
+            return self.records
+        where = " AND ".join("search_text LIKE ? ESCAPE '\\'" for _ in tokens)
+        patterns = ["% " + token.replace("_", "\\_") + "%" for token in tokens]
+        return SQLiteRecordList(self, where, patterns)
+
+    def records_between(self, start=None, end=None):
+        """
+        Các bản ghi có ngày trong khoảng [start, end] (datetime.date, None là không giới hạn),
+        sắp xếp theo ID; trả về danh sách truy vấn theo nhu cầu trên chỉ mục date_key
+        """
+        conditions, params = ["date_key IS NOT NULL"], []
+        if start is not None:
+            conditions.append("date_key >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            conditions.append("date_key <= ?")
+            params.append(end.isoformat())
+        return SQLiteRecordList(self, " AND ".join(conditions), params)
+
+    def facet_values(self, field):
+        """Các giá trị khác rỗng đang có của một trường, sắp xếp theo chữ cái"""
+        expression = self._field_sql(field)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT DISTINCT {expression} FROM {self.table} "
+                f"WHERE {expression} IS NOT NULL AND {expression} != '' ORDER BY 1"
+            ).fetchall()
+        return [str(row[0]) for row in rows]
+
+    def filter(self, filters):
+        """Lọc theo giá trị các trường (dict trường -> giá trị); trả về danh sách truy vấn theo nhu cầu"""
+        if not filters:
+            return self.records
+        where = " AND ".join(f"{self._field_sql(field)} = ?" for field in filters)
+        return SQLiteRecordList(self, where, [str(value) for value in filters.values()])
+
+    def import_records(self, records):
+        """Ghi đè toàn bộ bảng bằng danh sách bản ghi trong một giao dịch"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(f"DELETE FROM {self.table}")
+                conn.execute("DELETE FROM _meta WHERE key LIKE ?", (f"{self.table}.%",))
+                conn.executemany(
+                    self._insert_sql("INSERT OR REPLACE"),
+                    (self._row_values(record) for record in records),
+                )
+            self.load()
+
+
+def migrate_json_to_sqlite(db_path=DEFAULT_DB_PATH):
+    """Chuyển một lần dữ liệu cây trồng, vật nuôi và hoạt động từ các file JSON sang SQLite"""
+    from modules.crop_manager import CropManager
+    from modules.animal_manager import AnimalManager
+    from modules.activity_manager import ActivityManager
+
+    counts = {}
+    for manager_class in (CropManager, AnimalManager, ActivityManager):
+        source = manager_class()
+        source.load_data()
+        target = SQLiteStorage(db_path, manager_class.table_name, manager_class.date_field,
+                               manager_class.search_fields)
+        target.import_records(source.records)
+        target.close()
+        counts[manager_class.table_name] = len(source.records)
+    return counts
+
+
+if __name__ == "__main__":
+    result = migrate_json_to_sqlite(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DB_PATH)
+    for table, count in result.items():
+        print(f"{table}: {count} bản ghi")
\ No newline at end of file
@@ -0,0 +1,139 @@
+import functools
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Độ rộng mỗi ô của histogram theo tỉ lệ: ô sau lớn hơn ô trước 5%, nên p50/p95
+# sai lệch không quá 5% mà không phải giữ từng lần đo
+_GROWTH = 1.05
+_LOG_GROWTH = math.log(_GROWTH)
+# Ô đầu tiên chứa mọi lần đo dưới 1 micro giây
+_MIN_SECONDS = 1e-6
+
+
+class LatencyHistogram:
+    """Phân bố thời gian của một thao tác: số lần, tổng, lớn nhất và các ô theo thang log"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        bucket = int(math.log(seconds / _MIN_SECONDS) / _LOG_GROWTH) + 1 if seconds > _MIN_SECONDS else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, fraction):
+        """Thời gian (giây) mà tỉ lệ fraction số lần đo không vượt quá"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                # Cận trên của ô, không vượt quá lần đo lớn nhất
+                return min(_MIN_SECONDS * _GROWTH ** bucket, self.max)
+        return self.max
+
+
+class Timings:
+    """
+    Thống kê thời gian chạy theo từng thao tác (manager, báo cáo, vẽ lại giao diện)
+
+    Mặc định tắt: khi tắt, mỗi hàm được đánh dấu bằng @timed chỉ tốn thêm một
+    lần kiểm tra cờ enabled.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def record(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.add(seconds)
+
+    @contextmanager
+    def measure(self, name):
+        """Đo một đoạn mã (with timings.measure("tên"): ...)"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def count(self, name):
+        """
+        Ghi nhận một sự kiện không đo thời gian (lỗi nền, thay đổi bị bỏ qua...) để
+        xem số lần trong cửa sổ chẩn đoán; luôn được ghi kể cả khi đang tắt đo
+        """
+        self.record(name, 0.0)
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    def summary(self):
+        """Danh sách dict (name, count, p50, p95, max, total) theo tổng thời gian giảm dần, đơn vị giây"""
+        with self._lock:
+            rows = [{
+                "name": name,
+                "count": histogram.count,
+                "p50": histogram.percentile(0.5),
+                "p95": histogram.percentile(0.95),
+                "max": histogram.max,
+                "total": histogram.total,
+            } for name, histogram in self._histograms.items()]
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    def dump(self, path):
+        """Ghi thống kê ra file JSON"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "operations": self.summary(),
+            }, f, ensure_ascii=False, indent=2)
+
+
+# Bộ thống kê dùng chung cho cả ứng dụng
+timings = Timings()
+
+
+def timed(name=None):
+    """
+    Decorator đo thời gian của một hàm vào timings
+
+    Args:
+        name: Tên thao tác; None là dùng tên hàm. Với phương thức của manager,
+            tên được thêm tiền tố table_name (ví dụ "crops.save_data").
+    """
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not timings.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                table = getattr(args[0], "table_name", None) if args else None
+                timings.record(f"{table}.{label}" if isinstance(table, str) else label,
+                               time.perf_counter() - started)
+        return wrapper
+    return decorate
\ No newline at end of file
@@ -0,0 +1,76 @@
+import threading
+
+class WriteBehind:
+    """
+    Lưu trễ: gộp các lần lưu liên tiếp thành một lần ghi chạy trên luồng nền
+
+    schedule() chỉ ghi nhận hàm lưu cần gọi; việc ghi thực sự chạy trên luồng
+    nền sau khoảng trễ delay tính từ lần ghi nhận đầu tiên, nên một loạt thao
+    tác thêm/sửa/xóa liên tiếp chỉ tốn một lần ghi và giao diện không phải chờ.
+    flush() ghi ngay mọi thứ đang chờ (khi đăng xuất hoặc thoát).
+    """
+
+    def __init__(self, delay=0.5):
+        """
+        Args:
+            delay: Thời gian chờ trước khi ghi (giây)
+        """
+        self.delay = delay
+        self.last_error = None
+        self._lock = threading.Lock()
+        # Các lần ghi chạy lần lượt, flush() chờ lần ghi nền đang chạy xong
+        self._flush_lock = threading.Lock()
+        self._pending = []
+        self._timer = None
+
+    def schedule(self, save):
+        """
+        Ghi nhận một hàm lưu cần gọi ở lần ghi tới
+
+        Args:
+            save: Hàm lưu không tham số (ví dụ manager.save_data), mỗi hàm chỉ
+                được gọi một lần cho dù được ghi nhận nhiều lần
+        """
+        with self._lock:
+            if save not in self._pending:
+                self._pending.append(save)
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self._run)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _run(self):
+        try:
+            self.flush()
+        except Exception as e:
+            # Hàm lưu bị lỗi vẫn nằm trong danh sách chờ, lần flush sau sẽ thử lại
+            print(f"Error saving data: {str(e)}")
+
+    def flush(self):
+        """
+        Ghi ngay mọi thứ đang chờ
+
+        Raises:
+            Exception: Lỗi đầu tiên gặp phải, sau khi đã thử ghi tất cả
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                saves, self._pending = self._pending, []
+
+            failed = []
+            errors = []
+            for save in saves:
+                try:
+                    save()
+                except Exception as e:
+                    failed.append(save)
+                    errors.append(e)
+
+            with self._lock:
+                self._pending[:0] = [save for save in failed if save not in self._pending]
+            self.last_error = errors[0] if errors else None
+            if errors:
+                raise errors[0]
\ No newline at end of file
@@ -0,0 +1,92 @@
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk, messagebox
+from tkinter.filedialog import asksaveasfilename
+
+from modules.timing import timings
+
+# Chu kỳ cập nhật bảng số liệu khi cửa sổ đang mở (ms)
+UPDATE_INTERVAL = 1000
+
+class DiagnosticsWindow:
+    """
+    Cửa sổ chẩn đoán: thời gian chạy của các thao tác (lưu, tải, vẽ lại danh sách,
+    xuất báo cáo...) theo số lần, p50, p95 và lớn nhất
+    """
+
+    COLUMNS = (
+        ("name", "Thao tác", 260),
+        ("count", "Số lần", 70),
+        ("p50", "p50 (ms)", 80),
+        ("p95", "p95 (ms)", 80),
+        ("max", "Lớn nhất (ms)", 100),
+        ("total", "Tổng (s)", 80),
+    )
+
+    def __init__(self, root):
+        self.window = tk.Toplevel(root)
+        self.window.title("Chẩn đoán hiệu năng")
+        self.window.geometry("760x420")
+
+        toolbar = ttk.Frame(self.window, padding="5")
+        toolbar.pack(fill=tk.X)
+        self.enabled = tk.BooleanVar(value=timings.enabled)
+        ttk.Checkbutton(toolbar, text="Bật đo thời gian", variable=self.enabled,
+                        command=self.toggle).pack(side=tk.LEFT)
+        ttk.Button(toolbar, text="Lưu ra file...", command=self.dump).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(toolbar, text="Xóa số liệu", command=self.reset).pack(side=tk.RIGHT, padx=5)
+
+        frame = ttk.Frame(self.window, padding="5")
+        frame.pack(expand=True, fill=tk.BOTH)
+        self.tree = ttk.Treeview(frame, columns=[column for column, _, _ in self.COLUMNS], show="headings")
+        for column, heading, width in self.COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor=tk.W if column == "name" else tk.E)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.status = ttk.Label(self.window, padding="5")
+        self.status.pack(fill=tk.X)
+        self.update()
+
+    def toggle(self):
+        timings.enabled = self.enabled.get()
+        self.update_status()
+
+    def reset(self):
+        timings.reset()
+        self.update()
+
+    def dump(self):
+        filename = asksaveasfilename(
+            parent=self.window, defaultextension=".json", filetypes=[("JSON", "*.json")],
+            initialfile=f"chan_doan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        if not filename:
+            return
+        try:
+            timings.dump(filename)
+            messagebox.showinfo("Thành công", f"Đã lưu số liệu vào:\n{filename}", parent=self.window)
+        except OSError as e:
+            messagebox.showerror("Lỗi", f"Không thể lưu file: {str(e)}", parent=self.window)
+
+    def update_status(self):
+        if timings.enabled:
+            self.status.config(text="Đang đo thời gian các thao tác")
+        else:
+            self.status.config(text="Đang tắt đo thời gian (không ảnh hưởng hiệu năng)")
+
+    def update(self):
+        """Vẽ lại bảng số liệu, lặp lại định kỳ cho đến khi cửa sổ đóng"""
+        if not self.window.winfo_exists():
+            return
+        self.tree.delete(*self.tree.get_children())
+        for row in timings.summary():
+            self.tree.insert("", tk.END, values=(
+                row["name"], row["count"],
+                f"{row['p50'] * 1000:.1f}", f"{row['p95'] * 1000:.1f}", f"{row['max'] * 1000:.1f}",
+                f"{row['total']:.2f}",
+            ))
+        self.update_status()
+        self.window.after(UPDATE_INTERVAL, self.update)
\ No newline at end of file
@@ -0,0 +1,39 @@
+import tkinter as tk
+from tkinter import ttk
+
+ALL = "Tất cả"
+
+class FacetFilter:
+    """
+    Các ô chọn lọc theo trường phân loại (loại, trạng thái, người phụ trách...)
+
+    Các lựa chọn kết hợp theo kiểu AND. Danh sách giá trị của mỗi ô được lấy
+    từ chỉ mục lọc của manager mỗi khi mở ô chọn nên luôn có các giá trị mới thêm.
+    """
+
+    def __init__(self, parent, manager, labels, on_change):
+        """
+        Args:
+            parent: Frame chứa các ô chọn
+            manager: Manager cung cấp danh sách giá trị (facet_values)
+            labels: Danh sách (trường, nhãn hiển thị)
+            on_change: Hàm gọi khi lựa chọn thay đổi
+        """
+        self.manager = manager
+        self.on_change = on_change
+        self.boxes = {}
+        for field, label in labels:
+            ttk.Label(parent, text=f"{label}:").pack(side=tk.LEFT)
+            box = ttk.Combobox(parent, values=[ALL], state="readonly", width=16,
+                               postcommand=lambda field=field: self.refresh_values(field))
+            box.set(ALL)
+            box.pack(side=tk.LEFT, padx=5)
+            box.bind("<<ComboboxSelected>>", lambda e: self.on_change())
+            self.boxes[field] = box
+
+    def refresh_values(self, field):
+        self.boxes[field]["values"] = [ALL] + self.manager.facet_values(field)
+
+    def selected(self):
+        """Các điều kiện lọc đang chọn (dict trường -> giá trị), rỗng là không lọc"""
+        return {field: box.get() for field, box in self.boxes.items() if box.get() != ALL}
\ No newline at end of file
@@ -1,1064 +1,1710 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-from modules.auth import AuthManager
-from modules.crop_manager import CropManager
-from modules.animal_manager import AnimalManager
-from modules.activity_manager import ActivityManager
-import json
-import os
-import pandas as pd
-from tkinter.filedialog import asksaveasfilename
-from modules.report_generator import ReportGenerator
-
-class FarmManagementApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Hệ Thống Quản Lý Trang Trại")
-        self.root.geometry("1000x600")
-        
-        # Khởi tạo các module
-        self.auth_manager = AuthManager()
-        self.crop_manager = CropManager()
-        self.animal_manager = AnimalManager()
-        self.activity_manager = ActivityManager()
-        
-        # Tạo thư mục data nếu chưa tồn tại
-        if not os.path.exists('data'):
-            os.makedirs('data')
-        
-        # Tải dữ liệu
-        self.load_data()
-        
-        # Giao diện đăng nhập
-        self.show_login_screen()
-    
-    def load_data(self):
-        """Tải tất cả dữ liệu từ file JSON"""
-        try:
-            self.crop_manager.load_data()
-            self.animal_manager.load_data()
-            self.activity_manager.load_data()
-            self.auth_manager.load_users()
-        except Exception as e:
-            messagebox.showerror("Lỗi", f"Không thể tải dữ liệu: {str(e)}")
-    
-    def save_data(self):
-        """Lưu tất cả dữ liệu vào file JSON"""
-        try:
-            self.crop_manager.save_data()
-            self.animal_manager.save_data()
-            self.activity_manager.save_data()
-            self.auth_manager.save_users()
-        except Exception as e:
-            messagebox.showerror("Lỗi", f"Không thể lưu dữ liệu: {str(e)}")
-    
-    def show_login_screen(self):
-        """Hiển thị màn hình đăng nhập"""
-        self.clear_window()
-        
-        login_frame = ttk.Frame(self.root, padding="30 15 30 15")
-        login_frame.pack(expand=True)
-        
-        ttk.Label(login_frame, text="ĐĂNG NHẬP HỆ THỐNG", font=('Arial', 16)).grid(row=0, column=0, columnspan=2, pady=10)
-        
-        ttk.Label(login_frame, text="Tên đăng nhập:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        self.username_entry = ttk.Entry(login_frame)
-        self.username_entry.grid(row=1, column=1, pady=5, padx=5)
-        
-        ttk.Label(login_frame, text="Mật khẩu:").grid(row=2, column=0, sticky=tk.W, pady=5)
-        self.password_entry = ttk.Entry(login_frame, show="*")
-        self.password_entry.grid(row=2, column=1, pady=5, padx=5)
-        
-        ttk.Button(login_frame, text="Đăng nhập", command=self.handle_login).grid(row=3, column=0, columnspan=2, pady=15)
-        
-        # Thêm nút đăng ký cho người dùng mới
-        ttk.Button(login_frame, text="Đăng ký tài khoản mới", command=self.show_register_screen).grid(row=4, column=0, columnspan=2, pady=5)
-    
-    def show_register_screen(self):
-        """Hiển thị màn hình đăng ký"""
-        self.clear_window()
-        
-        register_frame = ttk.Frame(self.root, padding="30 15 30 15")
-        register_frame.pack(expand=True)
-        
-        ttk.Label(register_frame, text="ĐĂNG KÝ TÀI KHOẢN MỚI", font=('Arial', 16)).grid(row=0, column=0, columnspan=2, pady=10)
-        
-        ttk.Label(register_frame, text="Tên đăng nhập:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        self.reg_username = ttk.Entry(register_frame)
-        self.reg_username.grid(row=1, column=1, pady=5, padx=5)
-        
-        ttk.Label(register_frame, text="Mật khẩu:").grid(row=2, column=0, sticky=tk.W, pady=5)
-        self.reg_password = ttk.Entry(register_frame, show="*")
-        self.reg_password.grid(row=2, column=1, pady=5, padx=5)
-        
-        ttk.Label(register_frame, text="Xác nhận mật khẩu:").grid(row=3, column=0, sticky=tk.W, pady=5)
-        self.reg_confirm = ttk.Entry(register_frame, show="*")
-        self.reg_confirm.grid(row=3, column=1, pady=5, padx=5)
-        
-        ttk.Label(register_frame, text="Loại tài khoản:").grid(row=4, column=0, sticky=tk.W, pady=5)
-        self.user_type = tk.StringVar(value="user")
-        ttk.Radiobutton(register_frame, text="Người dùng thường", variable=self.user_type, value="user").grid(row=4, column=1, sticky=tk.W)
-        ttk.Radiobutton(register_frame, text="Quản trị viên", variable=self.user_type, value="admin").grid(row=5, column=1, sticky=tk.W)
-        
-        ttk.Button(register_frame, text="Đăng ký", command=self.handle_register).grid(row=6, column=0, columnspan=2, pady=15)
-        ttk.Button(register_frame, text="Quay lại đăng nhập", command=self.show_login_screen).grid(row=7, column=0, columnspan=2, pady=5)
-    
-    def handle_register(self):
-        """Xử lý đăng ký tài khoản mới"""
-        username = self.reg_username.get()
-        password = self.reg_password.get()
-        confirm = self.reg_confirm.get()
-        user_type = self.user_type.get()
-        
-        if not username or not password:
-            messagebox.showerror("Lỗi", "Tên đăng nhập và mật khẩu không được để trống")
-            return
-        
-        if password != confirm:
-            messagebox.showerror("Lỗi", "Mật khẩu xác nhận không khớp")
-            return
-        
-        result = self.auth_manager.register_user(username, password, user_type)
-        if result["success"]:
-            messagebox.showinfo("Thành công", result["message"])
-            self.show_login_screen()
-        else:
-            messagebox.showerror("Lỗi", result["message"])
-    
-    def handle_login(self):
-        """Xử lý đăng nhập"""
-        username = self.username_entry.get()
-        password = self.password_entry.get()
-        
-        if not username or not password:
-            messagebox.showerror("Lỗi", "Vui lòng nhập tên đăng nhập và mật khẩu")
-            return
-        
-        result = self.auth_manager.login(username, password)
-        if result["success"]:
-            self.current_user = result["user"]
-            self.show_main_menu()
-        else:
-            messagebox.showerror("Lỗi", result["message"])
-    
-    def show_main_menu(self):
-        """Hiển thị menu chính sau khi đăng nhập thành công"""
-        self.clear_window()
-        
-        # Tạo thanh menu
-        menubar = tk.Menu(self.root)
-        
-        # Menu hệ thống
-        system_menu = tk.Menu(menubar, tearoff=0)
-        system_menu.add_command(label="Đổi mật khẩu", command=self.show_change_password)
-        system_menu.add_separator()
-        system_menu.add_command(label="Đăng xuất", command=self.logout)
-        system_menu.add_command(label="Thoát", command=self.exit_app)
-        menubar.add_cascade(label="Hệ thống", menu=system_menu)
-        
-        # Menu quản lý
-        management_menu = tk.Menu(menubar, tearoff=0)
-        management_menu.add_command(label="Quản lý cây trồng", command=self.show_crop_management)
-        management_menu.add_command(label="Quản lý vật nuôi", command=self.show_animal_management)
-        management_menu.add_command(label="Quản lý hoạt động", command=self.show_activity_management)
-        menubar.add_cascade(label="Quản lý", menu=management_menu)
-        
-        # Menu báo cáo (chỉ admin)
-        if self.current_user["type"] == "admin":
-            report_menu = tk.Menu(menubar, tearoff=0)
-            report_menu.add_command(label="Xuất báo cáo Excel", command=self.export_excel)
-            menubar.add_cascade(label="Báo cáo", menu=report_menu)
-        
-        self.root.config(menu=menubar)
-        
-        # Hiển thị trang chủ
-        home_frame = ttk.Frame(self.root, padding="20")
-        home_frame.pack(expand=True, fill=tk.BOTH)
-        
-        ttk.Label(home_frame, text=f"CHÀO MỪNG ĐẾN VỚI HỆ THỐNG QUẢN LÝ TRANG TRẠI", 
-                 font=('Arial', 16)).pack(pady=20)
-        
-        ttk.Label(home_frame, text=f"Xin chào, {self.current_user['username']} ({'Quản trị viên' if self.current_user['type'] == 'admin' else 'Người dùng'})", 
-                 font=('Arial', 12)).pack(pady=10)
-        
-        # Hiển thị thống kê nhanh
-        stats_frame = ttk.LabelFrame(home_frame, text="Thống kê nhanh", padding="10")
-        stats_frame.pack(fill=tk.X, pady=10)
-        
-        ttk.Label(stats_frame, text=f"Số loại cây trồng: {len(self.crop_manager.crops)}").grid(row=0, column=0, padx=10, pady=5, sticky=tk.W)
-        ttk.Label(stats_frame, text=f"Số loại vật nuôi: {len(self.animal_manager.animals)}").grid(row=0, column=1, padx=10, pady=5, sticky=tk.W)
-        ttk.Label(stats_frame, text=f"Số hoạt động gần đây: {len(self.activity_manager.activities)}").grid(row=0, column=2, padx=10, pady=5, sticky=tk.W)
-    
-    def show_change_password(self):
-        """Hiển thị form đổi mật khẩu"""
-        change_pass_window = tk.Toplevel(self.root)
-        change_pass_window.title("Đổi mật khẩu")
-        change_pass_window.geometry("400x250")
-        
-        ttk.Label(change_pass_window, text="ĐỔI MẬT KHẨU", font=('Arial', 14)).pack(pady=10)
-        
-        form_frame = ttk.Frame(change_pass_window, padding="10")
-        form_frame.pack(expand=True)
-        
-        ttk.Label(form_frame, text="Mật khẩu hiện tại:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        current_pass = ttk.Entry(form_frame, show="*")
-        current_pass.grid(row=0, column=1, pady=5, padx=5)
-        
-        ttk.Label(form_frame, text="Mật khẩu mới:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        new_pass = ttk.Entry(form_frame, show="*")
-        new_pass.grid(row=1, column=1, pady=5, padx=5)
-        
-        ttk.Label(form_frame, text="Xác nhận mật khẩu mới:").grid(row=2, column=0, sticky=tk.W, pady=5)
-        confirm_pass = ttk.Entry(form_frame, show="*")
-        confirm_pass.grid(row=2, column=1, pady=5, padx=5)
-        
-        def handle_change():
-            current = current_pass.get()
-            new = new_pass.get()
-            confirm = confirm_pass.get()
-            
-            if not current or not new or not confirm:
-                messagebox.showerror("Lỗi", "Vui lòng điền đầy đủ thông tin")
-                return
-            
-            if new != confirm:
-                messagebox.showerror("Lỗi", "Mật khẩu mới và xác nhận không khớp")
-                return
-            
-            result = self.auth_manager.change_password(
-                self.current_user["username"],
-                current,
-                new
-            )
-            
-            if result["success"]:
-                messagebox.showinfo("Thành công", result["message"])
-                change_pass_window.destroy()
-            else:
-                messagebox.showerror("Lỗi", result["message"])
-        
-        ttk.Button(form_frame, text="Đổi mật khẩu", command=handle_change).grid(row=3, column=0, columnspan=2, pady=15)
-    
-    def show_crop_management(self):
-        """Hiển thị màn hình quản lý cây trồng"""
-        self.clear_window()
-        
-        # Tạo frame chứa các control
-        control_frame = ttk.Frame(self.root, padding="10")
-        control_frame.pack(fill=tk.X)
-        
-        # Nút thêm mới
-        ttk.Button(control_frame, text="Thêm cây trồng", command=self.show_add_crop_form).pack(side=tk.LEFT, padx=5)
-        
-        # Ô tìm kiếm
-        search_frame = ttk.Frame(control_frame)
-        search_frame.pack(side=tk.RIGHT)
-        
-        ttk.Label(search_frame, text="Tìm kiếm:").pack(side=tk.LEFT)
-        self.crop_search_entry = ttk.Entry(search_frame, width=30)
-        self.crop_search_entry.pack(side=tk.LEFT, padx=5)
-        ttk.Button(search_frame, text="Tìm", command=self.search_crops).pack(side=tk.LEFT)
-        
-        # Tạo Treeview để hiển thị dữ liệu
-        self.crop_tree = ttk.Treeview(self.root, columns=("ID", "Tên", "Loại", "Ngày trồng", "Diện tích", "Trạng thái"), show="headings")
-        
-        # Đặt tên cho các cột
-        self.crop_tree.heading("ID", text="ID")
-        self.crop_tree.heading("Tên", text="Tên")
-        self.crop_tree.heading("Loại", text="Loại")
-        self.crop_tree.heading("Ngày trồng", text="Ngày trồng")
-        self.crop_tree.heading("Diện tích", text="Diện tích (ha)")
-        self.crop_tree.heading("Trạng thái", text="Trạng thái")
-        
-        # Đặt độ rộng các cột
-        self.crop_tree.column("ID", width=50, anchor=tk.CENTER)
-        self.crop_tree.column("Tên", width=150)
-        self.crop_tree.column("Loại", width=100)
-        self.crop_tree.column("Ngày trồng", width=100, anchor=tk.CENTER)
-        self.crop_tree.column("Diện tích", width=100, anchor=tk.CENTER)
-        self.crop_tree.column("Trạng thái", width=100)
-        
-        self.crop_tree.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
-        
-        # Thêm thanh cuộn
-        scrollbar = ttk.Scrollbar(self.crop_tree, orient=tk.VERTICAL, command=self.crop_tree.yview)
-        self.crop_tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Nút sửa và xóa
-        action_frame = ttk.Frame(self.root, padding="10")
-        action_frame.pack(fill=tk.X)
-        
-        ttk.Button(action_frame, text="Sửa", command=self.edit_crop).pack(side=tk.LEFT, padx=5)
-        ttk.Button(action_frame, text="Xóa", command=self.delete_crop).pack(side=tk.LEFT, padx=5)
-        ttk.Button(action_frame, text="Quay lại", command=self.show_main_menu).pack(side=tk.RIGHT)
-        
-        # Hiển thị dữ liệu
-        self.display_crops()
-    
-    def display_crops(self, crops=None):
-        """Hiển thị danh sách cây trồng trên Treeview"""
-        # Xóa dữ liệu cũ
-        for item in self.crop_tree.get_children():
-            self.crop_tree.delete(item)
-        
-        # Hiển thị dữ liệu mới
-        crops_to_display = crops if crops else self.crop_manager.crops
-        for crop in crops_to_display:
-            self.crop_tree.insert("", tk.END, values=(
-                crop["id"],
-                crop["name"],
-                crop["type"],
-                crop["planting_date"],
-                crop["area"],
-                crop["status"]
-            ))
-    
-    def search_crops(self):
-        """Tìm kiếm cây trồng"""
-        keyword = self.crop_search_entry.get().lower()
-        if not keyword:
-            self.display_crops()
-            return
-        
-        filtered_crops = [
-            crop for crop in self.crop_manager.crops
-            if (keyword in crop["name"].lower() or 
-                keyword in crop["type"].lower() or 
-                keyword in crop["status"].lower())
-        ]
-        self.display_crops(filtered_crops)
-    
-    def show_add_crop_form(self):
-        """Hiển thị form thêm cây trồng mới"""
-        add_window = tk.Toplevel(self.root)
-        add_window.title("Thêm cây trồng mới")
-        add_window.geometry("500x400")
-        
-        ttk.Label(add_window, text="THÊM CÂY TRỒNG MỚI", font=('Arial', 14)).pack(pady=10)
-        
-        form_frame = ttk.Frame(add_window, padding="10")
-        form_frame.pack(expand=True, fill=tk.BOTH)
-        
-        # Các trường thông tin
-        ttk.Label(form_frame, text="Tên cây:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        name_entry = ttk.Entry(form_frame)
-        name_entry.grid(row=0, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Loại cây:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        type_entry = ttk.Entry(form_frame)
-        type_entry.grid(row=1, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Ngày trồng:").grid(row=2, column=0, sticky=tk.W, pady=5)
-        date_entry = ttk.Entry(form_frame)
-        date_entry.grid(row=2, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Diện tích (ha):").grid(row=3, column=0, sticky=tk.W, pady=5)
-        area_entry = ttk.Entry(form_frame)
-        area_entry.grid(row=3, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Trạng thái:").grid(row=4, column=0, sticky=tk.W, pady=5)
-        status_entry = ttk.Entry(form_frame)
-        status_entry.grid(row=4, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Ghi chú:").grid(row=5, column=0, sticky=tk.W, pady=5)
-        notes_entry = tk.Text(form_frame, height=5, width=30)
-        notes_entry.grid(row=5, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        def save_crop():
-            new_crop = {
-                "id": len(self.crop_manager.crops) + 1,
-                "name": name_entry.get(),
-                "type": type_entry.get(),
-                "planting_date": date_entry.get(),
-                "area": area_entry.get(),
-                "status": status_entry.get(),
-                "notes": notes_entry.get("1.0", tk.END).strip()
-            }
-            
-            if not new_crop["name"] or not new_crop["type"]:
-                messagebox.showerror("Lỗi", "Tên và loại cây không được để trống")
-                return
-            
-            self.crop_manager.add_crop(new_crop)
-            self.crop_manager.save_data()
-            self.display_crops()
-            add_window.destroy()
-            messagebox.showinfo("Thành công", "Đã thêm cây trồng mới")
-        
-        ttk.Button(form_frame, text="Lưu", command=save_crop).grid(row=6, column=0, columnspan=2, pady=15)
-    
-    def edit_crop(self):
-        """Sửa thông tin cây trồng"""
-        selected_item = self.crop_tree.selection()
-        if not selected_item:
-            messagebox.showwarning("Cảnh báo", "Vui lòng chọn cây trồng cần sửa")
-            return
-        
-        item_data = self.crop_tree.item(selected_item[0], "values")
-        crop_id = int(item_data[0])
-        
-        # Tìm cây trồng cần sửa
-        crop_to_edit = None
-        for crop in self.crop_manager.crops:
-            if crop["id"] == crop_id:
-                crop_to_edit = crop
-                break
-        
-        if not crop_to_edit:
-            messagebox.showerror("Lỗi", "Không tìm thấy cây trồng cần sửa")
-            return
-        
-        # Hiển thị form sửa
-        edit_window = tk.Toplevel(self.root)
-        edit_window.title("Sửa thông tin cây trồng")
-        edit_window.geometry("500x400")
-        
-        ttk.Label(edit_window, text="SỬA THÔNG TIN CÂY TRỒNG", font=('Arial', 14)).pack(pady=10)
-        
-        form_frame = ttk.Frame(edit_window, padding="10")
-        form_frame.pack(expand=True, fill=tk.BOTH)
-        
-        # Các trường thông tin
-        ttk.Label(form_frame, text="Tên cây:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        name_entry = ttk.Entry(form_frame)
-        name_entry.insert(0, crop_to_edit["name"])
-        name_entry.grid(row=0, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Loại cây:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        type_entry = ttk.Entry(form_frame)
-        type_entry.insert(0, crop_to_edit["type"])
-        type_entry.grid(row=1, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Ngày trồng:").grid(row=2, column=0, sticky=tk.W, pady=5)
-        date_entry = ttk.Entry(form_frame)
-        date_entry.insert(0, crop_to_edit["planting_date"])
-        date_entry.grid(row=2, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Diện tích (ha):").grid(row=3, column=0, sticky=tk.W, pady=5)
-        area_entry = ttk.Entry(form_frame)
-        area_entry.insert(0, crop_to_edit["area"])
-        area_entry.grid(row=3, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Trạng thái:").grid(row=4, column=0, sticky=tk.W, pady=5)
-        status_entry = ttk.Entry(form_frame)
-        status_entry.insert(0, crop_to_edit["status"])
-        status_entry.grid(row=4, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Ghi chú:").grid(row=5, column=0, sticky=tk.W, pady=5)
-        notes_entry = tk.Text(form_frame, height=5, width=30)
-        notes_entry.insert("1.0", crop_to_edit.get("notes", ""))
-        notes_entry.grid(row=5, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        def update_crop():
-            updated_crop = {
-                "id": crop_id,
-                "name": name_entry.get(),
-                "type": type_entry.get(),
-                "planting_date": date_entry.get(),
-                "area": area_entry.get(),
-                "status": status_entry.get(),
-                "notes": notes_entry.get("1.0", tk.END).strip()
-            }
-            
-            if not updated_crop["name"] or not updated_crop["type"]:
-                messagebox.showerror("Lỗi", "Tên và loại cây không được để trống")
-                return
-            
-            self.crop_manager.update_crop(crop_id, updated_crop)
-            self.crop_manager.save_data()
-            self.display_crops()
-            edit_window.destroy()
-            messagebox.showinfo("Thành công", "Đã cập nhật thông tin cây trồng")
-        
-        ttk.Button(form_frame, text="Cập nhật", command=update_crop).grid(row=6, column=0, columnspan=2, pady=15)
-    
-    def delete_crop(self):
-        """Xóa cây trồng"""
-        selected_item = self.crop_tree.selection()
-        if not selected_item:
-            messagebox.showwarning("Cảnh báo", "Vui lòng chọn cây trồng cần xóa")
-            return
-        
-        item_data = self.crop_tree.item(selected_item[0], "values")
-        crop_id = int(item_data[0])
-        
-        confirm = messagebox.askyesno("Xác nhận", "Bạn có chắc chắn muốn xóa cây trồng này?")
-        if confirm:
-            self.crop_manager.delete_crop(crop_id)
-            self.crop_manager.save_data()
-            self.display_crops()
-            messagebox.showinfo("Thành công", "Đã xóa cây trồng")
-    
-    def show_animal_management(self):
-        """Hiển thị màn hình quản lý vật nuôi"""
-        self.clear_window()
-        
-        # Tạo frame chứa các control
-        control_frame = ttk.Frame(self.root, padding="10")
-        control_frame.pack(fill=tk.X)
-        
-        # Nút thêm mới
-        ttk.Button(control_frame, text="Thêm vật nuôi", command=self.show_add_animal_form).pack(side=tk.LEFT, padx=5)
-        
-        # Ô tìm kiếm
-        search_frame = ttk.Frame(control_frame)
-        search_frame.pack(side=tk.RIGHT)
-        
-        ttk.Label(search_frame, text="Tìm kiếm:").pack(side=tk.LEFT)
-        self.animal_search_entry = ttk.Entry(search_frame, width=30)
-        self.animal_search_entry.pack(side=tk.LEFT, padx=5)
-        ttk.Button(search_frame, text="Tìm", command=self.search_animals).pack(side=tk.LEFT)
-        
-        # Tạo Treeview để hiển thị dữ liệu
-        self.animal_tree = ttk.Treeview(self.root, columns=("ID", "Tên", "Loại", "Ngày nhập", "Số lượng", "Trạng thái"), show="headings")
-        
-        # Đặt tên cho các cột
-        self.animal_tree.heading("ID", text="ID")
-        self.animal_tree.heading("Tên", text="Tên")
-        self.animal_tree.heading("Loại", text="Loại")
-        self.animal_tree.heading("Ngày nhập", text="Ngày nhập")
-        self.animal_tree.heading("Số lượng", text="Số lượng")
-        self.animal_tree.heading("Trạng thái", text="Trạng thái")
-        
-        # Đặt độ rộng các cột
-        self.animal_tree.column("ID", width=50, anchor=tk.CENTER)
-        self.animal_tree.column("Tên", width=150)
-        self.animal_tree.column("Loại", width=100)
-        self.animal_tree.column("Ngày nhập", width=100, anchor=tk.CENTER)
-        self.animal_tree.column("Số lượng", width=80, anchor=tk.CENTER)
-        self.animal_tree.column("Trạng thái", width=100)
-        
-        self.animal_tree.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
-        
-        # Thêm thanh cuộn
-        scrollbar = ttk.Scrollbar(self.animal_tree, orient=tk.VERTICAL, command=self.animal_tree.yview)
-        self.animal_tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Nút sửa và xóa
-        action_frame = ttk.Frame(self.root, padding="10")
-        action_frame.pack(fill=tk.X)
-        
-        ttk.Button(action_frame, text="Sửa", command=self.edit_animal).pack(side=tk.LEFT, padx=5)
-        ttk.Button(action_frame, text="Xóa", command=self.delete_animal).pack(side=tk.LEFT, padx=5)
-        ttk.Button(action_frame, text="Quay lại", command=self.show_main_menu).pack(side=tk.RIGHT)
-        
-        # Hiển thị dữ liệu
-        self.display_animals()
-    
-    def display_animals(self, animals=None):
-        """Hiển thị danh sách vật nuôi trên Treeview"""
-        # Xóa dữ liệu cũ
-        for item in self.animal_tree.get_children():
-            self.animal_tree.delete(item)
-        
-        # Hiển thị dữ liệu mới
-        animals_to_display = animals if animals else self.animal_manager.animals
-        for animal in animals_to_display:
-            self.animal_tree.insert("", tk.END, values=(
-                animal["id"],
-                animal["name"],
-                animal["type"],
-                animal["entry_date"],
-                animal["quantity"],
-                animal["status"]
-            ))
-    
-    def search_animals(self):
-        """Tìm kiếm vật nuôi"""
-        keyword = self.animal_search_entry.get().lower()
-        if not keyword:
-            self.display_animals()
-            return
-        
-        filtered_animals = [
-            animal for animal in self.animal_manager.animals
-            if (keyword in animal["name"].lower() or 
-                keyword in animal["type"].lower() or 
-                keyword in animal["status"].lower())
-        ]
-        self.display_animals(filtered_animals)
-    
-    def show_add_animal_form(self):
-        """Hiển thị form thêm vật nuôi mới"""
-        add_window = tk.Toplevel(self.root)
-        add_window.title("Thêm vật nuôi mới")
-        add_window.geometry("500x400")
-        
-        ttk.Label(add_window, text="THÊM VẬT NUÔI MỚI", font=('Arial', 14)).pack(pady=10)
-        
-        form_frame = ttk.Frame(add_window, padding="10")
-        form_frame.pack(expand=True, fill=tk.BOTH)
-        
-        # Các trường thông tin
-        ttk.Label(form_frame, text="Tên vật nuôi:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        name_entry = ttk.Entry(form_frame)
-        name_entry.grid(row=0, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Loại vật nuôi:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        type_entry = ttk.Entry(form_frame)
-        type_entry.grid(row=1, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Ngày nhập:").grid(row=2, column=0, sticky=tk.W, pady=5)
-        date_entry = ttk.Entry(form_frame)
-        date_entry.grid(row=2, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Số lượng:").grid(row=3, column=0, sticky=tk.W, pady=5)
-        quantity_entry = ttk.Entry(form_frame)
-        quantity_entry.grid(row=3, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Trạng thái:").grid(row=4, column=0, sticky=tk.W, pady=5)
-        status_entry = ttk.Entry(form_frame)
-        status_entry.grid(row=4, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Ghi chú:").grid(row=5, column=0, sticky=tk.W, pady=5)
-        notes_entry = tk.Text(form_frame, height=5, width=30)
-        notes_entry.grid(row=5, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        def save_animal():
-            try:
-                new_animal = {
-                    "id": len(self.animal_manager.animals) + 1,
-                    "name": name_entry.get(),
-                    "type": type_entry.get(),
-                    "entry_date": date_entry.get(),
-                    "quantity": int(quantity_entry.get()),
-                    "status": status_entry.get(),
-                    "notes": notes_entry.get("1.0", tk.END).strip()
-                }
-            except ValueError:
-                messagebox.showerror("Lỗi", "Số lượng phải là số nguyên")
-                return
-            
-            if not new_animal["name"] or not new_animal["type"]:
-                messagebox.showerror("Lỗi", "Tên và loại vật nuôi không được để trống")
-                return
-            
-            self.animal_manager.add_animal(new_animal)
-            self.animal_manager.save_data()
-            self.display_animals()
-            add_window.destroy()
-            messagebox.showinfo("Thành công", "Đã thêm vật nuôi mới")
-        
-        ttk.Button(form_frame, text="Lưu", command=save_animal).grid(row=6, column=0, columnspan=2, pady=15)
-    
-    def edit_animal(self):
-        """Sửa thông tin vật nuôi"""
-        selected_item = self.animal_tree.selection()
-        if not selected_item:
-            messagebox.showwarning("Cảnh báo", "Vui lòng chọn vật nuôi cần sửa")
-            return
-        
-        item_data = self.animal_tree.item(selected_item[0], "values")
-        animal_id = int(item_data[0])
-        
-        # Tìm vật nuôi cần sửa
-        animal_to_edit = None
-        for animal in self.animal_manager.animals:
-            if animal["id"] == animal_id:
-                animal_to_edit = animal
-                break
-        
-        if not animal_to_edit:
-            messagebox.showerror("Lỗi", "Không tìm thấy vật nuôi cần sửa")
-            return
-        
-        # Hiển thị form sửa
-        edit_window = tk.Toplevel(self.root)
-        edit_window.title("Sửa thông tin vật nuôi")
-        edit_window.geometry("500x400")
-        
-        ttk.Label(edit_window, text="SỬA THÔNG TIN VẬT NUÔI", font=('Arial', 14)).pack(pady=10)
-        
-        form_frame = ttk.Frame(edit_window, padding="10")
-        form_frame.pack(expand=True, fill=tk.BOTH)
-        
-        # Các trường thông tin
-        ttk.Label(form_frame, text="Tên vật nuôi:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        name_entry = ttk.Entry(form_frame)
-        name_entry.insert(0, animal_to_edit["name"])
-        name_entry.grid(row=0, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Loại vật nuôi:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        type_entry = ttk.Entry(form_frame)
-        type_entry.insert(0, animal_to_edit["type"])
-        type_entry.grid(row=1, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Ngày nhập:").grid(row=2, column=0, sticky=tk.W, pady=5)
-        date_entry = ttk.Entry(form_frame)
-        date_entry.insert(0, animal_to_edit["entry_date"])
-        date_entry.grid(row=2, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Số lượng:").grid(row=3, column=0, sticky=tk.W, pady=5)
-        quantity_entry = ttk.Entry(form_frame)
-        quantity_entry.insert(0, str(animal_to_edit["quantity"]))
-        quantity_entry.grid(row=3, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Trạng thái:").grid(row=4, column=0, sticky=tk.W, pady=5)
-        status_entry = ttk.Entry(form_frame)
-        status_entry.insert(0, animal_to_edit["status"])
-        status_entry.grid(row=4, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Ghi chú:").grid(row=5, column=0, sticky=tk.W, pady=5)
-        notes_entry = tk.Text(form_frame, height=5, width=30)
-        notes_entry.insert("1.0", animal_to_edit.get("notes", ""))
-        notes_entry.grid(row=5, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        def update_animal():
-            try:
-                updated_animal = {
-                    "id": animal_id,
-                    "name": name_entry.get(),
-                    "type": type_entry.get(),
-                    "entry_date": date_entry.get(),
-                    "quantity": int(quantity_entry.get()),
-                    "status": status_entry.get(),
-                    "notes": notes_entry.get("1.0", tk.END).strip()
-                }
-            except ValueError:
-                messagebox.showerror("Lỗi", "Số lượng phải là số nguyên")
-                return
-            
-            if not updated_animal["name"] or not updated_animal["type"]:
-                messagebox.showerror("Lỗi", "Tên và loại vật nuôi không được để trống")
-                return
-            
-            self.animal_manager.update_animal(animal_id, updated_animal)
-            self.animal_manager.save_data()
-            self.display_animals()
-            edit_window.destroy()
-            messagebox.showinfo("Thành công", "Đã cập nhật thông tin vật nuôi")
-        
-        ttk.Button(form_frame, text="Cập nhật", command=update_animal).grid(row=6, column=0, columnspan=2, pady=15)
-    
-    def delete_animal(self):
-        """Xóa vật nuôi"""
-        selected_item = self.animal_tree.selection()
-        if not selected_item:
-            messagebox.showwarning("Cảnh báo", "Vui lòng chọn vật nuôi cần xóa")
-            return
-        
-        item_data = self.animal_tree.item(selected_item[0], "values")
-        animal_id = int(item_data[0])
-        
-        confirm = messagebox.askyesno("Xác nhận", "Bạn có chắc chắn muốn xóa vật nuôi này?")
-        if confirm:
-            self.animal_manager.delete_animal(animal_id)
-            self.animal_manager.save_data()
-            self.display_animals()
-            messagebox.showinfo("Thành công", "Đã xóa vật nuôi")
-    
-    def show_activity_management(self):
-        """Hiển thị màn hình quản lý hoạt động"""
-        self.clear_window()
-        
-        # Tạo frame chứa các control
-        control_frame = ttk.Frame(self.root, padding="10")
-        control_frame.pack(fill=tk.X)
-        
-        # Nút thêm mới
-        ttk.Button(control_frame, text="Thêm hoạt động", command=self.show_add_activity_form).pack(side=tk.LEFT, padx=5)
-        
-        # Ô tìm kiếm
-        search_frame = ttk.Frame(control_frame)
-        search_frame.pack(side=tk.RIGHT)
-        
-        ttk.Label(search_frame, text="Tìm kiếm:").pack(side=tk.LEFT)
-        self.activity_search_entry = ttk.Entry(search_frame, width=30)
-        self.activity_search_entry.pack(side=tk.LEFT, padx=5)
-        ttk.Button(search_frame, text="Tìm", command=self.search_activities).pack(side=tk.LEFT)
-        
-        # Tạo Treeview để hiển thị dữ liệu
-        self.activity_tree = ttk.Treeview(self.root, columns=("ID", "Tên", "Loại", "Ngày", "Người phụ trách", "Trạng thái"), show="headings")
-        
-        # Đặt tên cho các cột
-        self.activity_tree.heading("ID", text="ID")
-        self.activity_tree.heading("Tên", text="Tên hoạt động")
-        self.activity_tree.heading("Loại", text="Loại hoạt động")
-        self.activity_tree.heading("Ngày", text="Ngày thực hiện")
-        self.activity_tree.heading("Người phụ trách", text="Người phụ trách")
-        self.activity_tree.heading("Trạng thái", text="Trạng thái")
-        
-        # Đặt độ rộng các cột
-        self.activity_tree.column("ID", width=50, anchor=tk.CENTER)
-        self.activity_tree.column("Tên", width=200)
-        self.activity_tree.column("Loại", width=120)
-        self.activity_tree.column("Ngày", width=100, anchor=tk.CENTER)
-        self.activity_tree.column("Người phụ trách", width=150)
-        self.activity_tree.column("Trạng thái", width=100)
-        
-        self.activity_tree.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
-        
-        # Thêm thanh cuộn
-        scrollbar = ttk.Scrollbar(self.activity_tree, orient=tk.VERTICAL, command=self.activity_tree.yview)
-        self.activity_tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Nút sửa và xóa
-        action_frame = ttk.Frame(self.root, padding="10")
-        action_frame.pack(fill=tk.X)
-        
-        ttk.Button(action_frame, text="Sửa", command=self.edit_activity).pack(side=tk.LEFT, padx=5)
-        ttk.Button(action_frame, text="Xóa", command=self.delete_activity).pack(side=tk.LEFT, padx=5)
-        ttk.Button(action_frame, text="Quay lại", command=self.show_main_menu).pack(side=tk.RIGHT)
-        
-        # Hiển thị dữ liệu
-        self.display_activities()
-    
-    def display_activities(self, activities=None):
-        """Hiển thị danh sách hoạt động trên Treeview"""
-        # Xóa dữ liệu cũ
-        for item in self.activity_tree.get_children():
-            self.activity_tree.delete(item)
-        
-        # Hiển thị dữ liệu mới
-        activities_to_display = activities if activities else self.activity_manager.activities
-        for activity in activities_to_display:
-            self.activity_tree.insert("", tk.END, values=(
-                activity["id"],
-                activity["name"],
-                activity["type"],
-                activity["date"],
-                activity["responsible"],
-                activity["status"]
-            ))
-    
-    def search_activities(self):
-        """Tìm kiếm hoạt động"""
-        keyword = self.activity_search_entry.get().lower()
-        if not keyword:
-            self.display_activities()
-            return
-        
-        filtered_activities = [
-            activity for activity in self.activity_manager.activities
-            if (keyword in activity["name"].lower() or 
-                keyword in activity["type"].lower() or 
-                keyword in activity["responsible"].lower() or
-                keyword in activity["status"].lower())
-        ]
-        self.display_activities(filtered_activities)
-    
-    def show_add_activity_form(self):
-        """Hiển thị form thêm hoạt động mới"""
-        add_window = tk.Toplevel(self.root)
-        add_window.title("Thêm hoạt động mới")
-        add_window.geometry("500x400")
-        
-        ttk.Label(add_window, text="THÊM HOẠT ĐỘNG MỚI", font=('Arial', 14)).pack(pady=10)
-        
-        form_frame = ttk.Frame(add_window, padding="10")
-        form_frame.pack(expand=True, fill=tk.BOTH)
-        
-        # Các trường thông tin
-        ttk.Label(form_frame, text="Tên hoạt động:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        name_entry = ttk.Entry(form_frame)
-        name_entry.grid(row=0, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Loại hoạt động:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        type_entry = ttk.Entry(form_frame)
-        type_entry.grid(row=1, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Ngày thực hiện:").grid(row=2, column=0, sticky=tk.W, pady=5)
-        date_entry = ttk.Entry(form_frame)
-        date_entry.grid(row=2, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Người phụ trách:").grid(row=3, column=0, sticky=tk.W, pady=5)
-        responsible_entry = ttk.Entry(form_frame)
-        responsible_entry.grid(row=3, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Trạng thái:").grid(row=4, column=0, sticky=tk.W, pady=5)
-        status_entry = ttk.Entry(form_frame)
-        status_entry.grid(row=4, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Mô tả:").grid(row=5, column=0, sticky=tk.W, pady=5)
-        description_entry = tk.Text(form_frame, height=5, width=30)
-        description_entry.grid(row=5, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        def save_activity():
-            new_activity = {
-                "id": len(self.activity_manager.activities) + 1,
-                "name": name_entry.get(),
-                "type": type_entry.get(),
-                "date": date_entry.get(),
-                "responsible": responsible_entry.get(),
-                "status": status_entry.get(),
-                "description": description_entry.get("1.0", tk.END).strip()
-            }
-            
-            if not new_activity["name"] or not new_activity["type"]:
-                messagebox.showerror("Lỗi", "Tên và loại hoạt động không được để trống")
-                return
-            
-            self.activity_manager.add_activity(new_activity)
-            self.activity_manager.save_data()
-            self.display_activities()
-            add_window.destroy()
-            messagebox.showinfo("Thành công", "Đã thêm hoạt động mới")
-        
-        ttk.Button(form_frame, text="Lưu", command=save_activity).grid(row=6, column=0, columnspan=2, pady=15)
-    
-    def edit_activity(self):
-        """Sửa thông tin hoạt động"""
-        selected_item = self.activity_tree.selection()
-        if not selected_item:
-            messagebox.showwarning("Cảnh báo", "Vui lòng chọn hoạt động cần sửa")
-            return
-        
-        item_data = self.activity_tree.item(selected_item[0], "values")
-        activity_id = int(item_data[0])
-        
-        # Tìm hoạt động cần sửa
-        activity_to_edit = None
-        for activity in self.activity_manager.activities:
-            if activity["id"] == activity_id:
-                activity_to_edit = activity
-                break
-        
-        if not activity_to_edit:
-            messagebox.showerror("Lỗi", "Không tìm thấy hoạt động cần sửa")
-            return
-        
-        # Hiển thị form sửa
-        edit_window = tk.Toplevel(self.root)
-        edit_window.title("Sửa thông tin hoạt động")
-        edit_window.geometry("500x400")
-        
-        ttk.Label(edit_window, text="SỬA THÔNG TIN HOẠT ĐỘNG", font=('Arial', 14)).pack(pady=10)
-        
-        form_frame = ttk.Frame(edit_window, padding="10")
-        form_frame.pack(expand=True, fill=tk.BOTH)
-        
-        # Các trường thông tin
-        ttk.Label(form_frame, text="Tên hoạt động:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        name_entry = ttk.Entry(form_frame)
-        name_entry.insert(0, activity_to_edit["name"])
-        name_entry.grid(row=0, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Loại hoạt động:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        type_entry = ttk.Entry(form_frame)
-        type_entry.insert(0, activity_to_edit["type"])
-        type_entry.grid(row=1, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Ngày thực hiện:").grid(row=2, column=0, sticky=tk.W, pady=5)
-        date_entry = ttk.Entry(form_frame)
-        date_entry.insert(0, activity_to_edit["date"])
-        date_entry.grid(row=2, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Người phụ trách:").grid(row=3, column=0, sticky=tk.W, pady=5)
-        responsible_entry = ttk.Entry(form_frame)
-        responsible_entry.insert(0, activity_to_edit["responsible"])
-        responsible_entry.grid(row=3, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Trạng thái:").grid(row=4, column=0, sticky=tk.W, pady=5)
-        status_entry = ttk.Entry(form_frame)
-        status_entry.insert(0, activity_to_edit["status"])
-        status_entry.grid(row=4, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        ttk.Label(form_frame, text="Mô tả:").grid(row=5, column=0, sticky=tk.W, pady=5)
-        description_entry = tk.Text(form_frame, height=5, width=30)
-        description_entry.insert("1.0", activity_to_edit.get("description", ""))
-        description_entry.grid(row=5, column=1, pady=5, padx=5, sticky=tk.EW)
-        
-        def update_activity():
-            updated_activity = {
-                "id": activity_id,
-                "name": name_entry.get(),
-                "type": type_entry.get(),
-                "date": date_entry.get(),
-                "responsible": responsible_entry.get(),
-                "status": status_entry.get(),
-                "description": description_entry.get("1.0", tk.END).strip()
-            }
-            
-            if not updated_activity["name"] or not updated_activity["type"]:
-                messagebox.showerror("Lỗi", "Tên và loại hoạt động không được để trống")
-                return
-            
-            self.activity_manager.update_activity(activity_id, updated_activity)
-            self.activity_manager.save_data()
-            self.display_activities()
-            edit_window.destroy()
-            messagebox.showinfo("Thành công", "Đã cập nhật thông tin hoạt động")
-        
-        ttk.Button(form_frame, text="Cập nhật", command=update_activity).grid(row=6, column=0, columnspan=2, pady=15)
-    
-    def delete_activity(self):
-        """Xóa hoạt động"""
-        selected_item = self.activity_tree.selection()
-        if not selected_item:
-            messagebox.showwarning("Cảnh báo", "Vui lòng chọn hoạt động cần xóa")
-            return
-        
-        item_data = self.activity_tree.item(selected_item[0], "values")
-        activity_id = int(item_data[0])
-        
-        confirm = messagebox.askyesno("Xác nhận", "Bạn có chắc chắn muốn xóa hoạt động này?")
-        if confirm:
-            self.activity_manager.delete_activity(activity_id)
-            self.activity_manager.save_data()
-            self.display_activities()
-            messagebox.showinfo("Thành công", "Đã xóa hoạt động")
-    
-    def export_excel(self):
-        """Xuất báo cáo Excel"""
-        if self.current_user["type"] != "admin":
-            messagebox.showerror("Lỗi", "Chỉ quản trị viên mới có quyền xuất báo cáo")
-            return
-
-        # Hiển thị hộp thoại chọn loại báo cáo
-        report_type = tk.StringVar(value="crops")
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Chọn loại báo cáo")
-        dialog.geometry("300x200")
-
-        ttk.Label(dialog, text="Chọn loại báo cáo:", font=("Arial", 12)).pack(pady=10)
-        ttk.Radiobutton(dialog, text="Cây trồng", variable=report_type, value="crops").pack(anchor=tk.W, padx=20)
-        ttk.Radiobutton(dialog, text="Vật nuôi", variable=report_type, value="animals").pack(anchor=tk.W, padx=20)
-        ttk.Radiobutton(dialog, text="Hoạt động", variable=report_type, value="activities").pack(anchor=tk.W, padx=20)
-
-        def generate_report():
-            selected_type = report_type.get()
-            if selected_type == "crops":
-                data = self.crop_manager.crops
-            elif selected_type == "animals":
-                data = self.animal_manager.animals
-            elif selected_type == "activities":
-                data = self.activity_manager.activities
-            else:
-                messagebox.showerror("Lỗi", "Loại báo cáo không hợp lệ")
-                return
-
-            try:
-                filepath = ReportGenerator.generate_excel_report(data, selected_type)
-                messagebox.showinfo("Thành công", f"Báo cáo đã được lưu tại: {filepath}")
-                dialog.destroy()
-            except Exception as e:
-                messagebox.showerror("Lỗi", f"Không thể tạo báo cáo: {str(e)}")
-
-        ttk.Button(dialog, text="Xuất báo cáo", command=generate_report).pack(pady=20)
-        ttk.Button(dialog, text="Hủy", command=dialog.destroy).pack()
-
-        
-    def logout(self):
-        """Đăng xuất"""
-        self.save_data()
-        self.current_user = None
-        self.show_login_screen()
-    
-    def exit_app(self):
-        """Thoát ứng dụng"""
-        self.save_data()
-        self.root.quit()
-    
-    def clear_window(self):
-        """Xóa tất cả widget trên cửa sổ chính"""
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
-        # Xóa thanh menu nếu có
-        try:
-            self.root.config(menu=tk.Menu(self.root))
-        except:
-            pass
+import tkinter as tk
+from tkinter import ttk, messagebox
+from modules.auth import AuthManager
+from modules.crop_manager import CropManager
+from modules.animal_manager import AnimalManager
+from modules.activity_manager import ActivityManager
+import os
+import queue
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from tkinter.filedialog import askopenfilename
+from modules.importer import BulkImporter, read_rows
+from modules.date_index import PERIODS, in_range, parse_bound, period_range
+from modules.facet_index import matches_filters
+from modules.write_behind import WriteBehind
+from modules.timing import timed
+from views.virtual_tree import VirtualTreeview
+from views.live_search import LiveSearch
+from views.facet_filter import FacetFilter
+from views.diagnostics import DiagnosticsWindow
+
+# Chu kỳ kiểm tra dữ liệu bị tiến trình hoặc máy khác thay đổi (ms)
+REFRESH_INTERVAL = 2000
+
+# Thuộc tính giữ danh sách và ô tìm kiếm của màn hình quản lý từng bộ dữ liệu
+# (chỉ có sau khi màn hình được mở lần đầu)
+VIEW_ATTRIBUTES = {
+    "crops": ("crop_view", "crop_live_search"),
+    "animals": ("animal_view", "animal_live_search"),
+    "activities": ("activity_view", "activity_live_search"),
+}
+
+class FarmManagementApp:
+    def __init__(self, root, storage="json", startup_profile=None, compact_records=False, server=None):
+        self.root = root
+        self.startup_profile = startup_profile
+        self.root.title("Hệ Thống Quản Lý Trang Trại")
+        self.root.geometry("1000x600")
+        
+        # Khởi tạo các module
+        if server:
+            # Chế độ máy khách: dữ liệu nằm trên máy chủ chung (python main.py --serve)
+            from modules.farm_client import FarmClient, RemoteAuthManager, RemoteStorage
+            client = FarmClient(server)
+            self.auth_manager = RemoteAuthManager(client)
+            storages = {name: RemoteStorage(client, name) for name in ("crops", "animals", "activities")}
+        else:
+            self.auth_manager = AuthManager()
+            storages = dict.fromkeys(("crops", "animals", "activities"), storage)
+        self.crop_manager = CropManager(storages["crops"], compact=compact_records)
+        self.animal_manager = AnimalManager(storages["animals"], compact=compact_records)
+        self.activity_manager = ActivityManager(storages["activities"], compact=compact_records)
+        self.datasets = {
+            "crops": self.crop_manager,
+            "animals": self.animal_manager,
+            "activities": self.activity_manager,
+        }
+        self.data_loads = {}
+        self._waiting_for = None
+        # Luồng nền cho các việc tính toán dài (thống kê...)
+        self.background = ThreadPoolExecutor(max_workers=2, thread_name_prefix="background")
+        # Các thay đổi được ghi trễ trên luồng nền, nhiều thao tác liên tiếp gộp thành một lần ghi
+        self.writer = WriteBehind(delay=0.5)
+        # Báo cho các việc nền kéo dài (nhập dữ liệu) dừng lại khi thoát ứng dụng
+        self.closing = threading.Event()
+        # Bảng thống kê chi tiết đã tính theo bộ dữ liệu: tên -> (change_stamp lúc tính, bảng)
+        self._statistics_cache = {}
+        # Lỗi lưu nền đã báo cho người dùng, để không hỏi lại cùng một lỗi
+        self._reported_save_error = None
+        # Đóng cửa sổ cũng ghi các thay đổi đang chờ như nút Thoát
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
+        
+        # Tạo thư mục data nếu chưa tồn tại
+        if not os.path.exists('data'):
+            os.makedirs('data')
+        
+        # Tải dữ liệu
+        with self.profile_phase("load_data"):
+            self.load_data()
+        
+        # Giao diện đăng nhập
+        with self.profile_phase("tạo màn hình đăng nhập"):
+            self.show_login_screen()
+        
+        # Theo dõi thay đổi do máy khác ghi vào thư mục dữ liệu dùng chung
+        self.root.after(REFRESH_INTERVAL, self.poll_data_changes)
+
+    def profile_phase(self, name):
+        """Đo thời gian một giai đoạn khởi động (chỉ khi chạy với --startup-profile)"""
+        if self.startup_profile is None:
+            return nullcontext()
+        return self.startup_profile.phase(name)
+    
+    def load_data(self):
+        """
+        Tải dữ liệu người dùng ngay (cần cho màn hình đăng nhập); cây trồng,
+        vật nuôi và hoạt động được tải song song trên các luồng nền
+        """
+        try:
+            self.auth_manager.load_users()
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Không thể tải dữ liệu: {str(e)}")
+
+        executor = ThreadPoolExecutor(max_workers=len(self.datasets), thread_name_prefix="load_data")
+        self.data_loads = {
+            name: executor.submit(manager.load_data) for name, manager in self.datasets.items()
+        }
+        executor.shutdown(wait=False)
+
+    def data_ready(self, name, retry):
+        """
+        Kiểm tra bộ dữ liệu đã tải xong chưa
+
+        Nếu chưa, hiển thị màn hình chờ và gọi lại retry khi tải xong.
+        Nếu tải lỗi, báo lỗi và quay về menu chính.
+
+        Returns:
+            True nếu có thể dùng dữ liệu ngay
+        """
+        future = self.data_loads[name]
+        if not future.done():
+            if self._waiting_for != name:
+                self._waiting_for = name
+                self.clear_window()
+                loading_frame = ttk.Frame(self.root, padding="20")
+                loading_frame.pack(expand=True)
+                ttk.Label(loading_frame, text="Đang tải dữ liệu...", font=('Arial', 12)).pack(pady=10)
+                progress_bar = ttk.Progressbar(loading_frame, length=250, mode="indeterminate")
+                progress_bar.pack()
+                progress_bar.start(15)
+            self.root.after(100, retry)
+            return False
+
+        self._waiting_for = None
+        if future.exception() is not None:
+            messagebox.showerror("Lỗi", f"Không thể tải dữ liệu: {str(future.exception())}")
+            self.show_main_menu()
+            return False
+        return True
+
+    def run_in_background(self, work, on_done):
+        """Chạy work() trên luồng nền rồi gọi on_done(future) trên luồng giao diện"""
+        future = self.background.submit(work)
+
+        def poll():
+            if future.done():
+                on_done(future)
+            else:
+                self.root.after(100, poll)
+
+        self.root.after(100, poll)
+
+    def poll_data_changes(self):
+        """
+        Định kỳ nạp các thay đổi do tiến trình hoặc máy khác ghi vào nơi lưu trữ
+
+        File được đọc trên luồng nền; thay đổi được áp dụng trên luồng giao diện,
+        nơi duy nhất đọc danh sách và các chỉ mục.
+        """
+        ready = [name for name, future in self.data_loads.items()
+                 if future.done() and future.exception() is None]
+        
+        def work():
+            return {name: self.datasets[name].check_changes() for name in ready}
+        
+        def on_done(future):
+            if future.exception() is not None:
+                print(f"Error refreshing data: {str(future.exception())}")
+            else:
+                for name, changes in future.result().items():
+                    if changes is None:
+                        continue
+                    changed = self.datasets[name].apply_changes(changes)
+                    if changed is None or changed:
+                        self.show_external_changes(name, changed)
+            self.report_save_error()
+            self.root.after(REFRESH_INTERVAL, self.poll_data_changes)
+        
+        self.run_in_background(work, on_done)
+    
+    def open_view(self, name):
+        """Danh sách (VirtualTreeview) của màn hình quản lý một bộ dữ liệu nếu đang mở, ngược lại None"""
+        view = getattr(self, VIEW_ATTRIBUTES[name][0], None)
+        if view is None or not view.tree.winfo_exists():
+            return None
+        return view
+    
+    @timed("gui.show_external_changes")
+    def show_external_changes(self, name, changed):
+        """
+        Cập nhật màn hình quản lý đang mở theo các thay đổi vừa nạp
+
+        Args:
+            changed: ID các bản ghi đã thay đổi, None nếu dữ liệu được tải lại toàn bộ
+        """
+        view = self.open_view(name)
+        if view is None:
+            return
+        if changed is None:
+            # Danh sách đã được thay mới: chạy lại tìm kiếm và bộ lọc đang áp dụng
+            getattr(self, VIEW_ATTRIBUTES[name][1]).search_now()
+            return
+        manager = self.datasets[name]
+        for record_id in changed:
+            record = manager.get_record(record_id)
+            if record is None:
+                view.remove_row(record_id)
+            else:
+                view.update_row(record)
+        view.render()
+    
+    def dataset_summary(self, name):
+        """Dòng tóm tắt và phân bố theo trạng thái của một bộ dữ liệu, đọc từ số liệu tổng hợp (O(1))"""
+        manager = self.datasets[name]
+        totals = manager.totals
+        if totals is None:
+            return str(len(manager.records)), ""
+        summary = str(totals.count())
+        if name == "crops":
+            summary += f" (tổng diện tích {totals.total('area'):.2f} ha)"
+        elif name == "animals":
+            summary += f" (tổng số lượng {int(totals.total('quantity'))})"
+        elif name == "activities":
+            today = datetime.now().strftime("%d/%m/%Y")
+            summary += f" (hôm nay: {totals.count_of('date', today)})"
+        by_status = ", ".join(f"{status or 'không rõ'}: {count}"
+                              for status, count in sorted(totals.counts("status").items()))
+        return summary, by_status
+
+    def show_count_when_ready(self, label, detail_label, name, title):
+        """Hiển thị số liệu tổng hợp của một bộ dữ liệu khi nó tải xong"""
+        if not label.winfo_exists():
+            return
+        future = self.data_loads[name]
+        if not future.done():
+            label.config(text=f"{title}: đang tải...")
+            self.root.after(200, self.show_count_when_ready, label, detail_label, name, title)
+        elif future.exception() is not None:
+            label.config(text=f"{title}: lỗi tải dữ liệu")
+        else:
+            summary, by_status = self.dataset_summary(name)
+            label.config(text=f"{title}: {summary}")
+            detail_label.config(text=by_status)
+    
+    def schedule_save(self, manager):
+        """Hẹn lưu dữ liệu của manager trên luồng nền (gộp với các thay đổi khác trong khoảng trễ)"""
+        self.writer.schedule(manager.save_data)
+    
+    def report_save_error(self):
+        """Báo lỗi của lần lưu nền gần nhất (luồng lưu nền chỉ ghi nhận lỗi) và cho phép lưu lại"""
+        error = self.writer.last_error
+        if error is None or error is self._reported_save_error:
+            return
+        self._reported_save_error = error
+        if messagebox.askretrycancel("Lỗi", f"Không thể lưu dữ liệu: {str(error)}\n\nThử lưu lại?"):
+            try:
+                self.writer.flush()
+            except Exception:
+                # Lỗi mới được báo ở lần kiểm tra sau
+                pass
+    
+    @timed("gui.save_data")
+    def save_data(self):
+        """
+        Ghi ngay các thay đổi chưa lưu, bỏ qua dữ liệu không thay đổi
+
+        Returns:
+            True nếu đã ghi xong, False nếu gặp lỗi và người dùng không lưu lại
+        """
+        while True:
+            try:
+                self.writer.flush()
+                for manager in self.datasets.values():
+                    if manager.dirty:
+                        manager.save_data()
+                if self.auth_manager.dirty:
+                    self.auth_manager.save_users()
+                return True
+            except Exception as e:
+                if not messagebox.askretrycancel("Lỗi", f"Không thể lưu dữ liệu: {str(e)}\n\nThử lưu lại?"):
+                    return False
+    
+    def show_login_screen(self):
+        """Hiển thị màn hình đăng nhập"""
+        self.clear_window()
+        
+        login_frame = ttk.Frame(self.root, padding="30 15 30 15")
+        login_frame.pack(expand=True)
+        
+        ttk.Label(login_frame, text="ĐĂNG NHẬP HỆ THỐNG", font=('Arial', 16)).grid(row=0, column=0, columnspan=2, pady=10)
+        
+        ttk.Label(login_frame, text="Tên đăng nhập:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        self.username_entry = ttk.Entry(login_frame)
+        self.username_entry.grid(row=1, column=1, pady=5, padx=5)
+        
+        ttk.Label(login_frame, text="Mật khẩu:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        self.password_entry = ttk.Entry(login_frame, show="*")
+        self.password_entry.grid(row=2, column=1, pady=5, padx=5)
+        
+        ttk.Button(login_frame, text="Đăng nhập", command=self.handle_login).grid(row=3, column=0, columnspan=2, pady=15)
+        
+        # Thêm nút đăng ký cho người dùng mới
+        ttk.Button(login_frame, text="Đăng ký tài khoản mới", command=self.show_register_screen).grid(row=4, column=0, columnspan=2, pady=5)
+    
+    def show_register_screen(self):
+        """Hiển thị màn hình đăng ký"""
+        self.clear_window()
+        
+        register_frame = ttk.Frame(self.root, padding="30 15 30 15")
+        register_frame.pack(expand=True)
+        
+        ttk.Label(register_frame, text="ĐĂNG KÝ TÀI KHOẢN MỚI", font=('Arial', 16)).grid(row=0, column=0, columnspan=2, pady=10)
+        
+        ttk.Label(register_frame, text="Tên đăng nhập:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        self.reg_username = ttk.Entry(register_frame)
+        self.reg_username.grid(row=1, column=1, pady=5, padx=5)
+        
+        ttk.Label(register_frame, text="Mật khẩu:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        self.reg_password = ttk.Entry(register_frame, show="*")
+        self.reg_password.grid(row=2, column=1, pady=5, padx=5)
+        
+        ttk.Label(register_frame, text="Xác nhận mật khẩu:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        self.reg_confirm = ttk.Entry(register_frame, show="*")
+        self.reg_confirm.grid(row=3, column=1, pady=5, padx=5)
+        
+        ttk.Label(register_frame, text="Loại tài khoản:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        self.user_type = tk.StringVar(value="user")
+        ttk.Radiobutton(register_frame, text="Người dùng thường", variable=self.user_type, value="user").grid(row=4, column=1, sticky=tk.W)
+        ttk.Radiobutton(register_frame, text="Quản trị viên", variable=self.user_type, value="admin").grid(row=5, column=1, sticky=tk.W)
+        
+        ttk.Button(register_frame, text="Đăng ký", command=self.handle_register).grid(row=6, column=0, columnspan=2, pady=15)
+        ttk.Button(register_frame, text="Quay lại đăng nhập", command=self.show_login_screen).grid(row=7, column=0, columnspan=2, pady=5)
+    
+    def handle_register(self):
+        """Xử lý đăng ký tài khoản mới"""
+        username = self.reg_username.get()
+        password = self.reg_password.get()
+        confirm = self.reg_confirm.get()
+        user_type = self.user_type.get()
+        
+        if not username or not password:
+            messagebox.showerror("Lỗi", "Tên đăng nhập và mật khẩu không được để trống")
+            return
+        
+        if password != confirm:
+            messagebox.showerror("Lỗi", "Mật khẩu xác nhận không khớp")
+            return
+        
+        result = self.auth_manager.register_user(username, password, user_type)
+        if result["success"]:
+            messagebox.showinfo("Thành công", result["message"])
+            self.show_login_screen()
+        else:
+            messagebox.showerror("Lỗi", result["message"])
+    
+    def handle_login(self):
+        """Xử lý đăng nhập"""
+        username = self.username_entry.get()
+        password = self.password_entry.get()
+        
+        if not username or not password:
+            messagebox.showerror("Lỗi", "Vui lòng nhập tên đăng nhập và mật khẩu")
+            return
+        
+        result = self.auth_manager.login(username, password)
+        if result["success"]:
+            self.current_user = result["user"]
+            self.show_main_menu()
+        else:
+            messagebox.showerror("Lỗi", result["message"])
+    
+    @timed("gui.show_main_menu")
+    def show_main_menu(self):
+        """Hiển thị menu chính sau khi đăng nhập thành công"""
+        self.clear_window()
+        
+        # Tạo thanh menu
+        menubar = tk.Menu(self.root)
+        
+        # Menu hệ thống
+        system_menu = tk.Menu(menubar, tearoff=0)
+        system_menu.add_command(label="Đổi mật khẩu", command=self.show_change_password)
+        system_menu.add_command(label="Chẩn đoán hiệu năng", command=self.show_diagnostics)
+        system_menu.add_separator()
+        system_menu.add_command(label="Đăng xuất", command=self.logout)
+        system_menu.add_command(label="Thoát", command=self.exit_app)
+        menubar.add_cascade(label="Hệ thống", menu=system_menu)
+        
+        # Menu quản lý
+        management_menu = tk.Menu(menubar, tearoff=0)
+        management_menu.add_command(label="Quản lý cây trồng", command=self.show_crop_management)
+        management_menu.add_command(label="Quản lý vật nuôi", command=self.show_animal_management)
+        management_menu.add_command(label="Quản lý hoạt động", command=self.show_activity_management)
+        menubar.add_cascade(label="Quản lý", menu=management_menu)
+        
+        # Menu báo cáo (chỉ admin)
+        if self.current_user["type"] == "admin":
+            report_menu = tk.Menu(menubar, tearoff=0)
+            report_menu.add_command(label="Xuất báo cáo Excel", command=self.export_excel)
+            menubar.add_cascade(label="Báo cáo", menu=report_menu)
+        
+        self.root.config(menu=menubar)
+        
+        # Hiển thị trang chủ
+        home_frame = ttk.Frame(self.root, padding="20")
+        home_frame.pack(expand=True, fill=tk.BOTH)
+        
+        ttk.Label(home_frame, text=f"CHÀO MỪNG ĐẾN VỚI HỆ THỐNG QUẢN LÝ TRANG TRẠI", 
+                 font=('Arial', 16)).pack(pady=20)
+        
+        ttk.Label(home_frame, text=f"Xin chào, {self.current_user['username']} ({'Quản trị viên' if self.current_user['type'] == 'admin' else 'Người dùng'})", 
+                 font=('Arial', 12)).pack(pady=10)
+        
+        # Hiển thị thống kê nhanh
+        stats_frame = ttk.LabelFrame(home_frame, text="Thống kê nhanh", padding="10")
+        stats_frame.pack(fill=tk.X, pady=10)
+        
+        stats = [("crops", "Số loại cây trồng"), ("animals", "Số loại vật nuôi"), ("activities", "Số hoạt động gần đây")]
+        for column, (name, title) in enumerate(stats):
+            label = ttk.Label(stats_frame)
+            label.grid(row=0, column=column, padx=10, pady=5, sticky=tk.W)
+            detail_label = ttk.Label(stats_frame, wraplength=300, foreground="gray")
+            detail_label.grid(row=1, column=column, padx=10, sticky=tk.NW)
+            self.show_count_when_ready(label, detail_label, name, title)
+
+        detail_frame = ttk.LabelFrame(home_frame, text="Thống kê chi tiết", padding="10")
+        detail_frame.pack(expand=True, fill=tk.BOTH, pady=10)
+        ttk.Label(detail_frame, text="Đang tính thống kê...").pack()
+        self.show_statistics_when_ready(detail_frame)
+
+    def show_statistics_when_ready(self, frame):
+        """Tính các bảng thống kê trên luồng nền khi dữ liệu đã tải xong rồi hiển thị trong frame"""
+        if not frame.winfo_exists():
+            return
+        if not all(future.done() for future in self.data_loads.values()):
+            self.root.after(200, self.show_statistics_when_ready, frame)
+            return
+
+        # Chỉ tính lại các bộ dữ liệu đã thay đổi kể từ lần tính trước
+        names = [name for name in self.datasets if self.data_loads[name].exception() is None]
+        stamps = {name: self.datasets[name].change_stamp() for name in names}
+        stale = [name for name in names
+                 if stamps[name] is None or self._statistics_cache.get(name, (None,))[0] != stamps[name]]
+        # Chụp dữ liệu trên luồng giao diện, luồng nền chỉ đọc bản chụp
+        snapshots = {name: self.datasets[name].snapshot() for name in stale}
+
+        def compute():
+            # numpy chỉ được nạp khi cần thống kê
+            from modules.farm_stats import statistics_tables
+            return {name: statistics_tables(name, records) for name, records in snapshots.items()}
+
+        def show_tables(computed):
+            for widget in frame.winfo_children():
+                widget.destroy()
+            for name, tables in computed.items():
+                if stamps[name] is not None:
+                    self._statistics_cache[name] = (stamps[name], tables)
+            notebook = ttk.Notebook(frame)
+            notebook.pack(expand=True, fill=tk.BOTH)
+            tables = [table for name in names
+                      for table in (computed[name] if name in computed else self._statistics_cache[name][1])]
+            for title, headers, rows in tables:
+                tab = ttk.Frame(notebook)
+                notebook.add(tab, text=title)
+                tree = ttk.Treeview(tab, columns=headers, show="headings", height=6)
+                for header in headers:
+                    tree.heading(header, text=header)
+                    tree.column(header, width=150)
+                for row in rows:
+                    tree.insert("", tk.END, values=row)
+                scrollbar = ttk.Scrollbar(tab, orient=tk.VERTICAL, command=tree.yview)
+                tree.configure(yscrollcommand=scrollbar.set)
+                tree.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
+                scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        def show(future):
+            if not frame.winfo_exists():
+                return
+            if future.exception() is not None:
+                for widget in frame.winfo_children():
+                    widget.destroy()
+                ttk.Label(frame, text=f"Không thể tính thống kê: {str(future.exception())}").pack()
+                return
+            show_tables(future.result())
+
+        if snapshots:
+            self.run_in_background(compute, show)
+        else:
+            show_tables({})
+    
+    def show_diagnostics(self):
+        """Hiển thị cửa sổ chẩn đoán thời gian chạy của các thao tác"""
+        window = getattr(self, "diagnostics_window", None)
+        if window is not None and window.window.winfo_exists():
+            window.window.lift()
+            return
+        self.diagnostics_window = DiagnosticsWindow(self.root)
+    
+    def show_change_password(self):
+        """Hiển thị form đổi mật khẩu"""
+        change_pass_window = tk.Toplevel(self.root)
+        change_pass_window.title("Đổi mật khẩu")
+        change_pass_window.geometry("400x250")
+        
+        ttk.Label(change_pass_window, text="ĐỔI MẬT KHẨU", font=('Arial', 14)).pack(pady=10)
+        
+        form_frame = ttk.Frame(change_pass_window, padding="10")
+        form_frame.pack(expand=True)
+        
+        ttk.Label(form_frame, text="Mật khẩu hiện tại:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        current_pass = ttk.Entry(form_frame, show="*")
+        current_pass.grid(row=0, column=1, pady=5, padx=5)
+        
+        ttk.Label(form_frame, text="Mật khẩu mới:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        new_pass = ttk.Entry(form_frame, show="*")
+        new_pass.grid(row=1, column=1, pady=5, padx=5)
+        
+        ttk.Label(form_frame, text="Xác nhận mật khẩu mới:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        confirm_pass = ttk.Entry(form_frame, show="*")
+        confirm_pass.grid(row=2, column=1, pady=5, padx=5)
+        
+        def handle_change():
+            current = current_pass.get()
+            new = new_pass.get()
+            confirm = confirm_pass.get()
+            
+            if not current or not new or not confirm:
+                messagebox.showerror("Lỗi", "Vui lòng điền đầy đủ thông tin")
+                return
+            
+            if new != confirm:
+                messagebox.showerror("Lỗi", "Mật khẩu mới và xác nhận không khớp")
+                return
+            
+            result = self.auth_manager.change_password(
+                self.current_user["username"],
+                current,
+                new
+            )
+            
+            if result["success"]:
+                messagebox.showinfo("Thành công", result["message"])
+                change_pass_window.destroy()
+            else:
+                messagebox.showerror("Lỗi", result["message"])
+        
+        ttk.Button(form_frame, text="Đổi mật khẩu", command=handle_change).grid(row=3, column=0, columnspan=2, pady=15)
+    
+    @timed("gui.show_crop_management")
+    def show_crop_management(self):
+        """Hiển thị màn hình quản lý cây trồng"""
+        if not self.data_ready("crops", self.show_crop_management):
+            return
+        self.clear_window()
+        
+        # Tạo frame chứa các control
+        control_frame = ttk.Frame(self.root, padding="10")
+        control_frame.pack(fill=tk.X)
+        
+        # Nút thêm mới
+        ttk.Button(control_frame, text="Thêm cây trồng", command=self.show_add_crop_form).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="Nhập từ file", command=lambda: self.import_from_file("crops")).pack(side=tk.LEFT, padx=5)
+        
+        # Ô tìm kiếm
+        search_frame = ttk.Frame(control_frame)
+        search_frame.pack(side=tk.RIGHT)
+        
+        ttk.Label(search_frame, text="Tìm kiếm:").pack(side=tk.LEFT)
+        self.crop_search_entry = ttk.Entry(search_frame, width=30)
+        self.crop_search_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Tìm", command=self.search_crops).pack(side=tk.LEFT)
+        self.crop_live_search = LiveSearch(
+            self.crop_search_entry, self.crop_manager.iter_search,
+            self.crop_manager.matches_search, self.show_crop_results,
+            stamp=self.crop_manager.change_stamp
+        )
+        
+        # Lọc theo loại và trạng thái
+        filter_frame = ttk.Frame(self.root, padding=(10, 0))
+        filter_frame.pack(fill=tk.X)
+        self.crop_filter = FacetFilter(filter_frame, self.crop_manager,
+                                      [("type", "Loại"), ("status", "Trạng thái")], self.filter_crops)
+        
+        # Tạo Treeview để hiển thị dữ liệu
+        self.crop_tree = ttk.Treeview(self.root, columns=("ID", "Tên", "Loại", "Ngày trồng", "Diện tích", "Trạng thái"), show="headings")
+        
+        # Đặt tên cho các cột
+        self.crop_tree.heading("ID", text="ID")
+        self.crop_tree.heading("Tên", text="Tên")
+        self.crop_tree.heading("Loại", text="Loại")
+        self.crop_tree.heading("Ngày trồng", text="Ngày trồng")
+        self.crop_tree.heading("Diện tích", text="Diện tích (ha)")
+        self.crop_tree.heading("Trạng thái", text="Trạng thái")
+        
+        # Đặt độ rộng các cột
+        self.crop_tree.column("ID", width=50, anchor=tk.CENTER)
+        self.crop_tree.column("Tên", width=150)
+        self.crop_tree.column("Loại", width=100)
+        self.crop_tree.column("Ngày trồng", width=100, anchor=tk.CENTER)
+        self.crop_tree.column("Diện tích", width=100, anchor=tk.CENTER)
+        self.crop_tree.column("Trạng thái", width=100)
+        
+        self.crop_tree.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
+        
+        # Thêm thanh cuộn, chỉ các dòng đang nhìn thấy được tạo trên Treeview
+        scrollbar = ttk.Scrollbar(self.crop_tree, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.crop_view = VirtualTreeview(self.crop_tree, scrollbar, self.crop_row_values)
+        
+        # Nút sửa và xóa
+        action_frame = ttk.Frame(self.root, padding="10")
+        action_frame.pack(fill=tk.X)
+        
+        ttk.Button(action_frame, text="Sửa", command=self.edit_crop).pack(side=tk.LEFT, padx=5)
+        ttk.Button(action_frame, text="Xóa", command=self.delete_crop).pack(side=tk.LEFT, padx=5)
+        ttk.Button(action_frame, text="Quay lại", command=self.show_main_menu).pack(side=tk.RIGHT)
+        
+        # Hiển thị dữ liệu
+        self.display_crops()
+    
+    @timed("gui.display_crops")
+    def display_crops(self, crops=None, matches=None):
+        """Hiển thị danh sách cây trồng trên Treeview"""
+        crops_to_display = crops if crops is not None else self.crop_manager.crops
+        self.crop_view.set_rows(crops_to_display, matches)
+    
+    def crop_row_values(self, crop):
+        """Giá trị các cột của một cây trồng trên Treeview"""
+        return (
+            crop["id"],
+            crop["name"],
+            crop["type"],
+            crop["planting_date"],
+            crop["area"],
+            crop["status"]
+        )
+    
+    def search_crops(self):
+        """Tìm kiếm cây trồng"""
+        self.crop_live_search.search_now()
+    
+    @timed("gui.show_crop_results")
+    def show_crop_results(self, keyword, crops):
+        """Hiển thị kết quả tìm kiếm cây trồng (None là hiển thị tất cả), kết hợp bộ lọc"""
+        filters = self.crop_filter.selected()
+        if crops is None and not filters:
+            self.display_crops()
+            return
+        if crops is None:
+            # Giao danh sách ID trên chỉ mục lọc thay vì duyệt toàn bộ danh sách
+            crops = self.crop_manager.filter_records(filters)
+        elif filters:
+            crops = [crop for crop in crops if matches_filters(crop, filters)]
+        
+        def matches(crop):
+            if keyword and not self.crop_manager.matches_search(crop, keyword):
+                return False
+            return matches_filters(crop, filters)
+        
+        self.display_crops(crops, matches)
+    
+    def filter_crops(self):
+        """Lọc cây trồng theo loại và trạng thái đã chọn"""
+        self.crop_live_search.reapply()
+    
+    def show_add_crop_form(self):
+        """Hiển thị form thêm cây trồng mới"""
+        add_window = tk.Toplevel(self.root)
+        add_window.title("Thêm cây trồng mới")
+        add_window.geometry("500x400")
+        
+        ttk.Label(add_window, text="THÊM CÂY TRỒNG MỚI", font=('Arial', 14)).pack(pady=10)
+        
+        form_frame = ttk.Frame(add_window, padding="10")
+        form_frame.pack(expand=True, fill=tk.BOTH)
+        
+        # Các trường thông tin
+        ttk.Label(form_frame, text="Tên cây:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        name_entry = ttk.Entry(form_frame)
+        name_entry.grid(row=0, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Loại cây:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        type_entry = ttk.Entry(form_frame)
+        type_entry.grid(row=1, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Ngày trồng:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        date_entry = ttk.Entry(form_frame)
+        date_entry.grid(row=2, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Diện tích (ha):").grid(row=3, column=0, sticky=tk.W, pady=5)
+        area_entry = ttk.Entry(form_frame)
+        area_entry.grid(row=3, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Trạng thái:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        status_entry = ttk.Entry(form_frame)
+        status_entry.grid(row=4, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Ghi chú:").grid(row=5, column=0, sticky=tk.W, pady=5)
+        notes_entry = tk.Text(form_frame, height=5, width=30)
+        notes_entry.grid(row=5, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        def save_crop():
+            new_crop = {
+                "name": name_entry.get(),
+                "type": type_entry.get(),
+                "planting_date": date_entry.get(),
+                "area": area_entry.get(),
+                "status": status_entry.get(),
+                "notes": notes_entry.get("1.0", tk.END).strip()
+            }
+            
+            if not new_crop["name"] or not new_crop["type"]:
+                messagebox.showerror("Lỗi", "Tên và loại cây không được để trống")
+                return
+            
+            # Chỉ cấp mã sau khi dữ liệu hợp lệ (SQLite cấp mã bằng một giao dịch)
+            new_crop = {"id": self.crop_manager.next_id(), **new_crop}
+            self.crop_manager.add_crop(new_crop)
+            self.schedule_save(self.crop_manager)
+            self.crop_view.insert_row(new_crop)
+            add_window.destroy()
+            messagebox.showinfo("Thành công", "Đã thêm cây trồng mới")
+        
+        ttk.Button(form_frame, text="Lưu", command=save_crop).grid(row=6, column=0, columnspan=2, pady=15)
+    
+    def edit_crop(self):
+        """Sửa thông tin cây trồng"""
+        selected_item = self.crop_tree.selection()
+        if not selected_item:
+            messagebox.showwarning("Cảnh báo", "Vui lòng chọn cây trồng cần sửa")
+            return
+        
+        item_data = self.crop_tree.item(selected_item[0], "values")
+        crop_id = int(item_data[0])
+        
+        # Tìm cây trồng cần sửa
+        crop_to_edit = self.crop_manager.get_crop_by_id(crop_id)
+        
+        if not crop_to_edit:
+            messagebox.showerror("Lỗi", "Không tìm thấy cây trồng cần sửa")
+            return
+        
+        # Hiển thị form sửa
+        edit_window = tk.Toplevel(self.root)
+        edit_window.title("Sửa thông tin cây trồng")
+        edit_window.geometry("500x400")
+        
+        ttk.Label(edit_window, text="SỬA THÔNG TIN CÂY TRỒNG", font=('Arial', 14)).pack(pady=10)
+        
+        form_frame = ttk.Frame(edit_window, padding="10")
+        form_frame.pack(expand=True, fill=tk.BOTH)
+        
+        # Các trường thông tin
+        ttk.Label(form_frame, text="Tên cây:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        name_entry = ttk.Entry(form_frame)
+        name_entry.insert(0, crop_to_edit["name"])
+        name_entry.grid(row=0, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Loại cây:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        type_entry = ttk.Entry(form_frame)
+        type_entry.insert(0, crop_to_edit["type"])
+        type_entry.grid(row=1, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Ngày trồng:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        date_entry = ttk.Entry(form_frame)
+        date_entry.insert(0, crop_to_edit["planting_date"])
+        date_entry.grid(row=2, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Diện tích (ha):").grid(row=3, column=0, sticky=tk.W, pady=5)
+        area_entry = ttk.Entry(form_frame)
+        area_entry.insert(0, crop_to_edit["area"])
+        area_entry.grid(row=3, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Trạng thái:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        status_entry = ttk.Entry(form_frame)
+        status_entry.insert(0, crop_to_edit["status"])
+        status_entry.grid(row=4, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Ghi chú:").grid(row=5, column=0, sticky=tk.W, pady=5)
+        notes_entry = tk.Text(form_frame, height=5, width=30)
+        notes_entry.insert("1.0", crop_to_edit.get("notes", ""))
+        notes_entry.grid(row=5, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        def update_crop():
+            updated_crop = {
+                "id": crop_id,
+                "name": name_entry.get(),
+                "type": type_entry.get(),
+                "planting_date": date_entry.get(),
+                "area": area_entry.get(),
+                "status": status_entry.get(),
+                "notes": notes_entry.get("1.0", tk.END).strip()
+            }
+            
+            if not updated_crop["name"] or not updated_crop["type"]:
+                messagebox.showerror("Lỗi", "Tên và loại cây không được để trống")
+                return
+            
+            self.crop_manager.update_crop(crop_id, updated_crop)
+            self.schedule_save(self.crop_manager)
+            self.crop_view.update_row(updated_crop)
+            edit_window.destroy()
+            messagebox.showinfo("Thành công", "Đã cập nhật thông tin cây trồng")
+        
+        ttk.Button(form_frame, text="Cập nhật", command=update_crop).grid(row=6, column=0, columnspan=2, pady=15)
+    
+    def delete_crop(self):
+        """Xóa cây trồng"""
+        selected_item = self.crop_tree.selection()
+        if not selected_item:
+            messagebox.showwarning("Cảnh báo", "Vui lòng chọn cây trồng cần xóa")
+            return
+        
+        item_data = self.crop_tree.item(selected_item[0], "values")
+        crop_id = int(item_data[0])
+        
+        confirm = messagebox.askyesno("Xác nhận", "Bạn có chắc chắn muốn xóa cây trồng này?")
+        if confirm:
+            self.crop_manager.delete_crop(crop_id)
+            self.schedule_save(self.crop_manager)
+            self.crop_view.remove_row(crop_id)
+            messagebox.showinfo("Thành công", "Đã xóa cây trồng")
+    
+    @timed("gui.show_animal_management")
+    def show_animal_management(self):
+        """Hiển thị màn hình quản lý vật nuôi"""
+        if not self.data_ready("animals", self.show_animal_management):
+            return
+        self.clear_window()
+        
+        # Tạo frame chứa các control
+        control_frame = ttk.Frame(self.root, padding="10")
+        control_frame.pack(fill=tk.X)
+        
+        # Nút thêm mới
+        ttk.Button(control_frame, text="Thêm vật nuôi", command=self.show_add_animal_form).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="Nhập từ file", command=lambda: self.import_from_file("animals")).pack(side=tk.LEFT, padx=5)
+        
+        # Ô tìm kiếm
+        search_frame = ttk.Frame(control_frame)
+        search_frame.pack(side=tk.RIGHT)
+        
+        ttk.Label(search_frame, text="Tìm kiếm:").pack(side=tk.LEFT)
+        self.animal_search_entry = ttk.Entry(search_frame, width=30)
+        self.animal_search_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Tìm", command=self.search_animals).pack(side=tk.LEFT)
+        self.animal_live_search = LiveSearch(
+            self.animal_search_entry, self.animal_manager.iter_search,
+            self.animal_manager.matches_search, self.show_animal_results,
+            stamp=self.animal_manager.change_stamp
+        )
+        
+        # Lọc theo loại và trạng thái
+        filter_frame = ttk.Frame(self.root, padding=(10, 0))
+        filter_frame.pack(fill=tk.X)
+        self.animal_filter = FacetFilter(filter_frame, self.animal_manager,
+                                      [("type", "Loại"), ("status", "Trạng thái")], self.filter_animals)
+        
+        # Tạo Treeview để hiển thị dữ liệu
+        self.animal_tree = ttk.Treeview(self.root, columns=("ID", "Tên", "Loại", "Ngày nhập", "Số lượng", "Trạng thái"), show="headings")
+        
+        # Đặt tên cho các cột
+        self.animal_tree.heading("ID", text="ID")
+        self.animal_tree.heading("Tên", text="Tên")
+        self.animal_tree.heading("Loại", text="Loại")
+        self.animal_tree.heading("Ngày nhập", text="Ngày nhập")
+        self.animal_tree.heading("Số lượng", text="Số lượng")
+        self.animal_tree.heading("Trạng thái", text="Trạng thái")
+        
+        # Đặt độ rộng các cột
+        self.animal_tree.column("ID", width=50, anchor=tk.CENTER)
+        self.animal_tree.column("Tên", width=150)
+        self.animal_tree.column("Loại", width=100)
+        self.animal_tree.column("Ngày nhập", width=100, anchor=tk.CENTER)
+        self.animal_tree.column("Số lượng", width=80, anchor=tk.CENTER)
+        self.animal_tree.column("Trạng thái", width=100)
+        
+        self.animal_tree.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
+        
+        # Thêm thanh cuộn, chỉ các dòng đang nhìn thấy được tạo trên Treeview
+        scrollbar = ttk.Scrollbar(self.animal_tree, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.animal_view = VirtualTreeview(self.animal_tree, scrollbar, self.animal_row_values)
+        
+        # Nút sửa và xóa
+        action_frame = ttk.Frame(self.root, padding="10")
+        action_frame.pack(fill=tk.X)
+        
+        ttk.Button(action_frame, text="Sửa", command=self.edit_animal).pack(side=tk.LEFT, padx=5)
+        ttk.Button(action_frame, text="Xóa", command=self.delete_animal).pack(side=tk.LEFT, padx=5)
+        ttk.Button(action_frame, text="Quay lại", command=self.show_main_menu).pack(side=tk.RIGHT)
+        
+        # Hiển thị dữ liệu
+        self.display_animals()
+    
+    @timed("gui.display_animals")
+    def display_animals(self, animals=None, matches=None):
+        """Hiển thị danh sách vật nuôi trên Treeview"""
+        animals_to_display = animals if animals is not None else self.animal_manager.animals
+        self.animal_view.set_rows(animals_to_display, matches)
+    
+    def animal_row_values(self, animal):
+        """Giá trị các cột của một vật nuôi trên Treeview"""
+        return (
+            animal["id"],
+            animal["name"],
+            animal["type"],
+            animal["entry_date"],
+            animal["quantity"],
+            animal["status"]
+        )
+    
+    def search_animals(self):
+        """Tìm kiếm vật nuôi"""
+        self.animal_live_search.search_now()
+    
+    @timed("gui.show_animal_results")
+    def show_animal_results(self, keyword, animals):
+        """Hiển thị kết quả tìm kiếm vật nuôi (None là hiển thị tất cả), kết hợp bộ lọc"""
+        filters = self.animal_filter.selected()
+        if animals is None and not filters:
+            self.display_animals()
+            return
+        if animals is None:
+            # Giao danh sách ID trên chỉ mục lọc thay vì duyệt toàn bộ danh sách
+            animals = self.animal_manager.filter_records(filters)
+        elif filters:
+            animals = [animal for animal in animals if matches_filters(animal, filters)]
+        
+        def matches(animal):
+            if keyword and not self.animal_manager.matches_search(animal, keyword):
+                return False
+            return matches_filters(animal, filters)
+        
+        self.display_animals(animals, matches)
+    
+    def filter_animals(self):
+        """Lọc vật nuôi theo loại và trạng thái đã chọn"""
+        self.animal_live_search.reapply()
+    
+    def show_add_animal_form(self):
+        """Hiển thị form thêm vật nuôi mới"""
+        add_window = tk.Toplevel(self.root)
+        add_window.title("Thêm vật nuôi mới")
+        add_window.geometry("500x400")
+        
+        ttk.Label(add_window, text="THÊM VẬT NUÔI MỚI", font=('Arial', 14)).pack(pady=10)
+        
+        form_frame = ttk.Frame(add_window, padding="10")
+        form_frame.pack(expand=True, fill=tk.BOTH)
+        
+        # Các trường thông tin
+        ttk.Label(form_frame, text="Tên vật nuôi:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        name_entry = ttk.Entry(form_frame)
+        name_entry.grid(row=0, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Loại vật nuôi:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        type_entry = ttk.Entry(form_frame)
+        type_entry.grid(row=1, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Ngày nhập:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        date_entry = ttk.Entry(form_frame)
+        date_entry.grid(row=2, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Số lượng:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        quantity_entry = ttk.Entry(form_frame)
+        quantity_entry.grid(row=3, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Trạng thái:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        status_entry = ttk.Entry(form_frame)
+        status_entry.grid(row=4, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Ghi chú:").grid(row=5, column=0, sticky=tk.W, pady=5)
+        notes_entry = tk.Text(form_frame, height=5, width=30)
+        notes_entry.grid(row=5, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        def save_animal():
+            try:
+                new_animal = {
+                    "name": name_entry.get(),
+                    "type": type_entry.get(),
+                    "entry_date": date_entry.get(),
+                    "quantity": int(quantity_entry.get()),
+                    "status": status_entry.get(),
+                    "notes": notes_entry.get("1.0", tk.END).strip()
+                }
+            except ValueError:
+                messagebox.showerror("Lỗi", "Số lượng phải là số nguyên")
+                return
+            
+            if not new_animal["name"] or not new_animal["type"]:
+                messagebox.showerror("Lỗi", "Tên và loại vật nuôi không được để trống")
+                return
+            
+            # Chỉ cấp mã sau khi dữ liệu hợp lệ (SQLite cấp mã bằng một giao dịch)
+            new_animal = {"id": self.animal_manager.next_id(), **new_animal}
+            self.animal_manager.add_animal(new_animal)
+            self.schedule_save(self.animal_manager)
+            self.animal_view.insert_row(new_animal)
+            add_window.destroy()
+            messagebox.showinfo("Thành công", "Đã thêm vật nuôi mới")
+        
+        ttk.Button(form_frame, text="Lưu", command=save_animal).grid(row=6, column=0, columnspan=2, pady=15)
+    
+    def edit_animal(self):
+        """Sửa thông tin vật nuôi"""
+        selected_item = self.animal_tree.selection()
+        if not selected_item:
+            messagebox.showwarning("Cảnh báo", "Vui lòng chọn vật nuôi cần sửa")
+            return
+        
+        item_data = self.animal_tree.item(selected_item[0], "values")
+        animal_id = int(item_data[0])
+        
+        # Tìm vật nuôi cần sửa
+        animal_to_edit = self.animal_manager.get_animal_by_id(animal_id)
+        
+        if not animal_to_edit:
+            messagebox.showerror("Lỗi", "Không tìm thấy vật nuôi cần sửa")
+            return
+        
+        # Hiển thị form sửa
+        edit_window = tk.Toplevel(self.root)
+        edit_window.title("Sửa thông tin vật nuôi")
+        edit_window.geometry("500x400")
+        
+        ttk.Label(edit_window, text="SỬA THÔNG TIN VẬT NUÔI", font=('Arial', 14)).pack(pady=10)
+        
+        form_frame = ttk.Frame(edit_window, padding="10")
+        form_frame.pack(expand=True, fill=tk.BOTH)
+        
+        # Các trường thông tin
+        ttk.Label(form_frame, text="Tên vật nuôi:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        name_entry = ttk.Entry(form_frame)
+        name_entry.insert(0, animal_to_edit["name"])
+        name_entry.grid(row=0, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Loại vật nuôi:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        type_entry = ttk.Entry(form_frame)
+        type_entry.insert(0, animal_to_edit["type"])
+        type_entry.grid(row=1, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Ngày nhập:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        date_entry = ttk.Entry(form_frame)
+        date_entry.insert(0, animal_to_edit["entry_date"])
+        date_entry.grid(row=2, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Số lượng:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        quantity_entry = ttk.Entry(form_frame)
+        quantity_entry.insert(0, str(animal_to_edit["quantity"]))
+        quantity_entry.grid(row=3, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Trạng thái:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        status_entry = ttk.Entry(form_frame)
+        status_entry.insert(0, animal_to_edit["status"])
+        status_entry.grid(row=4, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Ghi chú:").grid(row=5, column=0, sticky=tk.W, pady=5)
+        notes_entry = tk.Text(form_frame, height=5, width=30)
+        notes_entry.insert("1.0", animal_to_edit.get("notes", ""))
+        notes_entry.grid(row=5, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        def update_animal():
+            try:
+                updated_animal = {
+                    "id": animal_id,
+                    "name": name_entry.get(),
+                    "type": type_entry.get(),
+                    "entry_date": date_entry.get(),
+                    "quantity": int(quantity_entry.get()),
+                    "status": status_entry.get(),
+                    "notes": notes_entry.get("1.0", tk.END).strip()
+                }
+            except ValueError:
+                messagebox.showerror("Lỗi", "Số lượng phải là số nguyên")
+                return
+            
+            if not updated_animal["name"] or not updated_animal["type"]:
+                messagebox.showerror("Lỗi", "Tên và loại vật nuôi không được để trống")
+                return
+            
+            self.animal_manager.update_animal(animal_id, updated_animal)
+            self.schedule_save(self.animal_manager)
+            self.animal_view.update_row(updated_animal)
+            edit_window.destroy()
+            messagebox.showinfo("Thành công", "Đã cập nhật thông tin vật nuôi")
+        
+        ttk.Button(form_frame, text="Cập nhật", command=update_animal).grid(row=6, column=0, columnspan=2, pady=15)
+    
+    def delete_animal(self):
+        """Xóa vật nuôi"""
+        selected_item = self.animal_tree.selection()
+        if not selected_item:
+            messagebox.showwarning("Cảnh báo", "Vui lòng chọn vật nuôi cần xóa")
+            return
+        
+        item_data = self.animal_tree.item(selected_item[0], "values")
+        animal_id = int(item_data[0])
+        
+        confirm = messagebox.askyesno("Xác nhận", "Bạn có chắc chắn muốn xóa vật nuôi này?")
+        if confirm:
+            self.animal_manager.delete_animal(animal_id)
+            self.schedule_save(self.animal_manager)
+            self.animal_view.remove_row(animal_id)
+            messagebox.showinfo("Thành công", "Đã xóa vật nuôi")
+    
+    @timed("gui.show_activity_management")
+    def show_activity_management(self):
+        """Hiển thị màn hình quản lý hoạt động"""
+        if not self.data_ready("activities", self.show_activity_management):
+            return
+        self.clear_window()
+        
+        # Tạo frame chứa các control
+        control_frame = ttk.Frame(self.root, padding="10")
+        control_frame.pack(fill=tk.X)
+        
+        # Nút thêm mới
+        ttk.Button(control_frame, text="Thêm hoạt động", command=self.show_add_activity_form).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="Nhập từ file", command=lambda: self.import_from_file("activities")).pack(side=tk.LEFT, padx=5)
+        
+        # Ô tìm kiếm
+        search_frame = ttk.Frame(control_frame)
+        search_frame.pack(side=tk.RIGHT)
+        
+        ttk.Label(search_frame, text="Tìm kiếm:").pack(side=tk.LEFT)
+        self.activity_search_entry = ttk.Entry(search_frame, width=30)
+        self.activity_search_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Tìm", command=self.search_activities).pack(side=tk.LEFT)
+        self.activity_live_search = LiveSearch(
+            self.activity_search_entry, self.activity_manager.iter_search,
+            self.activity_manager.matches_search, self.show_activity_results,
+            stamp=self.activity_manager.change_stamp
+        )
+        
+        # Lọc theo trạng thái, người phụ trách
+        filter_frame = ttk.Frame(self.root, padding=(10, 0))
+        filter_frame.pack(fill=tk.X)
+        self.activity_filter = FacetFilter(filter_frame, self.activity_manager,
+                                           [("status", "Trạng thái"), ("responsible", "Người phụ trách")],
+                                           self.filter_activities)
+        
+        # Lọc theo khoảng ngày
+        self.activity_date_range = None
+        date_frame = ttk.Frame(self.root, padding=(10, 0))
+        date_frame.pack(fill=tk.X)
+        ttk.Label(date_frame, text="Thời gian:").pack(side=tk.LEFT)
+        self.activity_period = ttk.Combobox(date_frame, values=PERIODS, state="readonly", width=12)
+        self.activity_period.set(PERIODS[0])
+        self.activity_period.pack(side=tk.LEFT, padx=5)
+        self.activity_period.bind("<<ComboboxSelected>>", lambda e: self.select_activity_period())
+        ttk.Label(date_frame, text="Từ:").pack(side=tk.LEFT)
+        self.activity_from_entry = ttk.Entry(date_frame, width=12)
+        self.activity_from_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Label(date_frame, text="Đến:").pack(side=tk.LEFT)
+        self.activity_to_entry = ttk.Entry(date_frame, width=12)
+        self.activity_to_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Button(date_frame, text="Lọc", command=self.filter_activities_by_date).pack(side=tk.LEFT)
+        ttk.Label(date_frame, text="(dd/mm/yyyy hoặc mm/yyyy)", foreground="gray").pack(side=tk.LEFT, padx=5)
+        
+        # Tạo Treeview để hiển thị dữ liệu
+        self.activity_tree = ttk.Treeview(self.root, columns=("ID", "Tên", "Loại", "Ngày", "Người phụ trách", "Trạng thái"), show="headings")
+        
+        # Đặt tên cho các cột
+        self.activity_tree.heading("ID", text="ID")
+        self.activity_tree.heading("Tên", text="Tên hoạt động")
+        self.activity_tree.heading("Loại", text="Loại hoạt động")
+        self.activity_tree.heading("Ngày", text="Ngày thực hiện")
+        self.activity_tree.heading("Người phụ trách", text="Người phụ trách")
+        self.activity_tree.heading("Trạng thái", text="Trạng thái")
+        
+        # Đặt độ rộng các cột
+        self.activity_tree.column("ID", width=50, anchor=tk.CENTER)
+        self.activity_tree.column("Tên", width=200)
+        self.activity_tree.column("Loại", width=120)
+        self.activity_tree.column("Ngày", width=100, anchor=tk.CENTER)
+        self.activity_tree.column("Người phụ trách", width=150)
+        self.activity_tree.column("Trạng thái", width=100)
+        
+        self.activity_tree.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
+        
+        # Thêm thanh cuộn, chỉ các dòng đang nhìn thấy được tạo trên Treeview
+        scrollbar = ttk.Scrollbar(self.activity_tree, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.activity_view = VirtualTreeview(self.activity_tree, scrollbar, self.activity_row_values)
+        
+        # Nút sửa và xóa
+        action_frame = ttk.Frame(self.root, padding="10")
+        action_frame.pack(fill=tk.X)
+        
+        ttk.Button(action_frame, text="Sửa", command=self.edit_activity).pack(side=tk.LEFT, padx=5)
+        ttk.Button(action_frame, text="Xóa", command=self.delete_activity).pack(side=tk.LEFT, padx=5)
+        ttk.Button(action_frame, text="Quay lại", command=self.show_main_menu).pack(side=tk.RIGHT)
+        
+        # Hiển thị dữ liệu
+        self.display_activities()
+    
+    @timed("gui.display_activities")
+    def display_activities(self, activities=None, matches=None):
+        """Hiển thị danh sách hoạt động trên Treeview"""
+        activities_to_display = activities if activities is not None else self.activity_manager.activities
+        self.activity_view.set_rows(activities_to_display, matches)
+    
+    def activity_row_values(self, activity):
+        """Giá trị các cột của một hoạt động trên Treeview"""
+        return (
+            activity["id"],
+            activity["name"],
+            activity["type"],
+            activity["date"],
+            activity["responsible"],
+            activity["status"]
+        )
+    
+    def search_activities(self):
+        """Tìm kiếm hoạt động"""
+        self.activity_live_search.search_now()
+    
+    @timed("gui.show_activity_results")
+    def show_activity_results(self, keyword, activities):
+        """Hiển thị kết quả tìm kiếm hoạt động (None là hiển thị tất cả), kết hợp bộ lọc và khoảng ngày"""
+        filters = self.activity_filter.selected()
+        date_range = self.activity_date_range
+        if activities is None and not filters and date_range is None:
+            self.display_activities()
+            return
+        
+        def in_date_range(activity):
+            return date_range is None or in_range(activity.get("date", ""), *date_range)
+        
+        if activities is None and filters:
+            # Giao danh sách ID trên chỉ mục lọc, khoảng ngày được lọc trên kết quả đã thu hẹp
+            activities = self.activity_manager.filter_records(filters)
+            if date_range is not None:
+                activities = [activity for activity in activities if in_date_range(activity)]
+        elif activities is None:
+            # Tra chỉ mục ngày thay vì duyệt toàn bộ danh sách
+            activities = self.activity_manager.records_between(*date_range)
+        elif filters or date_range is not None:
+            activities = [activity for activity in activities
+                          if matches_filters(activity, filters) and in_date_range(activity)]
+        
+        def matches(activity):
+            if keyword and not self.activity_manager.matches_search(activity, keyword):
+                return False
+            return matches_filters(activity, filters) and in_date_range(activity)
+        
+        self.display_activities(activities, matches)
+    
+    def filter_activities(self):
+        """Lọc hoạt động theo trạng thái và người phụ trách đã chọn"""
+        self.activity_live_search.reapply()
+    
+    def select_activity_period(self):
+        """Điền khoảng ngày của lựa chọn nhanh (hôm nay, tuần này...) và lọc"""
+        period = period_range(self.activity_period.get())
+        self.activity_from_entry.delete(0, tk.END)
+        self.activity_to_entry.delete(0, tk.END)
+        if period is not None:
+            self.activity_from_entry.insert(0, period[0].strftime("%d/%m/%Y"))
+            self.activity_to_entry.insert(0, period[1].strftime("%d/%m/%Y"))
+        self.filter_activities_by_date()
+    
+    def filter_activities_by_date(self):
+        """Lọc hoạt động theo khoảng ngày đã nhập"""
+        try:
+            start = parse_bound(self.activity_from_entry.get())
+            end = parse_bound(self.activity_to_entry.get(), end=True)
+        except ValueError as e:
+            messagebox.showerror("Lỗi", str(e))
+            return
+        self.activity_date_range = None if start is None and end is None else (start, end)
+        self.filter_activities()
+    
+    def show_add_activity_form(self):
+        """Hiển thị form thêm hoạt động mới"""
+        add_window = tk.Toplevel(self.root)
+        add_window.title("Thêm hoạt động mới")
+        add_window.geometry("500x400")
+        
+        ttk.Label(add_window, text="THÊM HOẠT ĐỘNG MỚI", font=('Arial', 14)).pack(pady=10)
+        
+        form_frame = ttk.Frame(add_window, padding="10")
+        form_frame.pack(expand=True, fill=tk.BOTH)
+        
+        # Các trường thông tin
+        ttk.Label(form_frame, text="Tên hoạt động:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        name_entry = ttk.Entry(form_frame)
+        name_entry.grid(row=0, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Loại hoạt động:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        type_entry = ttk.Entry(form_frame)
+        type_entry.grid(row=1, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Ngày thực hiện:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        date_entry = ttk.Entry(form_frame)
+        date_entry.grid(row=2, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Người phụ trách:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        responsible_entry = ttk.Entry(form_frame)
+        responsible_entry.grid(row=3, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Trạng thái:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        status_entry = ttk.Entry(form_frame)
+        status_entry.grid(row=4, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Mô tả:").grid(row=5, column=0, sticky=tk.W, pady=5)
+        description_entry = tk.Text(form_frame, height=5, width=30)
+        description_entry.grid(row=5, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        def save_activity():
+            new_activity = {
+                "name": name_entry.get(),
+                "type": type_entry.get(),
+                "date": date_entry.get(),
+                "responsible": responsible_entry.get(),
+                "status": status_entry.get(),
+                "description": description_entry.get("1.0", tk.END).strip()
+            }
+            
+            if not new_activity["name"] or not new_activity["type"]:
+                messagebox.showerror("Lỗi", "Tên và loại hoạt động không được để trống")
+                return
+            
+            # Chỉ cấp mã sau khi dữ liệu hợp lệ (SQLite cấp mã bằng một giao dịch)
+            new_activity = {"id": self.activity_manager.next_id(), **new_activity}
+            self.activity_manager.add_activity(new_activity)
+            self.schedule_save(self.activity_manager)
+            self.activity_view.insert_row(new_activity)
+            add_window.destroy()
+            messagebox.showinfo("Thành công", "Đã thêm hoạt động mới")
+        
+        ttk.Button(form_frame, text="Lưu", command=save_activity).grid(row=6, column=0, columnspan=2, pady=15)
+    
+    def edit_activity(self):
+        """Sửa thông tin hoạt động"""
+        selected_item = self.activity_tree.selection()
+        if not selected_item:
+            messagebox.showwarning("Cảnh báo", "Vui lòng chọn hoạt động cần sửa")
+            return
+        
+        item_data = self.activity_tree.item(selected_item[0], "values")
+        activity_id = int(item_data[0])
+        
+        # Tìm hoạt động cần sửa
+        activity_to_edit = self.activity_manager.get_activity_by_id(activity_id)
+        
+        if not activity_to_edit:
+            messagebox.showerror("Lỗi", "Không tìm thấy hoạt động cần sửa")
+            return
+        
+        # Hiển thị form sửa
+        edit_window = tk.Toplevel(self.root)
+        edit_window.title("Sửa thông tin hoạt động")
+        edit_window.geometry("500x400")
+        
+        ttk.Label(edit_window, text="SỬA THÔNG TIN HOẠT ĐỘNG", font=('Arial', 14)).pack(pady=10)
+        
+        form_frame = ttk.Frame(edit_window, padding="10")
+        form_frame.pack(expand=True, fill=tk.BOTH)
+        
+        # Các trường thông tin
+        ttk.Label(form_frame, text="Tên hoạt động:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        name_entry = ttk.Entry(form_frame)
+        name_entry.insert(0, activity_to_edit["name"])
+        name_entry.grid(row=0, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Loại hoạt động:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        type_entry = ttk.Entry(form_frame)
+        type_entry.insert(0, activity_to_edit["type"])
+        type_entry.grid(row=1, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Ngày thực hiện:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        date_entry = ttk.Entry(form_frame)
+        date_entry.insert(0, activity_to_edit["date"])
+        date_entry.grid(row=2, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Người phụ trách:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        responsible_entry = ttk.Entry(form_frame)
+        responsible_entry.insert(0, activity_to_edit["responsible"])
+        responsible_entry.grid(row=3, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Trạng thái:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        status_entry = ttk.Entry(form_frame)
+        status_entry.insert(0, activity_to_edit["status"])
+        status_entry.grid(row=4, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        ttk.Label(form_frame, text="Mô tả:").grid(row=5, column=0, sticky=tk.W, pady=5)
+        description_entry = tk.Text(form_frame, height=5, width=30)
+        description_entry.insert("1.0", activity_to_edit.get("description", ""))
+        description_entry.grid(row=5, column=1, pady=5, padx=5, sticky=tk.EW)
+        
+        def update_activity():
+            updated_activity = {
+                "id": activity_id,
+                "name": name_entry.get(),
+                "type": type_entry.get(),
+                "date": date_entry.get(),
+                "responsible": responsible_entry.get(),
+                "status": status_entry.get(),
+                "description": description_entry.get("1.0", tk.END).strip()
+            }
+            
+            if not updated_activity["name"] or not updated_activity["type"]:
+                messagebox.showerror("Lỗi", "Tên và loại hoạt động không được để trống")
+                return
+            
+            self.activity_manager.update_activity(activity_id, updated_activity)
+            self.schedule_save(self.activity_manager)
+            self.activity_view.update_row(updated_activity)
+            edit_window.destroy()
+            messagebox.showinfo("Thành công", "Đã cập nhật thông tin hoạt động")
+        
+        ttk.Button(form_frame, text="Cập nhật", command=update_activity).grid(row=6, column=0, columnspan=2, pady=15)
+    
+    def delete_activity(self):
+        """Xóa hoạt động"""
+        selected_item = self.activity_tree.selection()
+        if not selected_item:
+            messagebox.showwarning("Cảnh báo", "Vui lòng chọn hoạt động cần xóa")
+            return
+        
+        item_data = self.activity_tree.item(selected_item[0], "values")
+        activity_id = int(item_data[0])
+        
+        confirm = messagebox.askyesno("Xác nhận", "Bạn có chắc chắn muốn xóa hoạt động này?")
+        if confirm:
+            self.activity_manager.delete_activity(activity_id)
+            self.schedule_save(self.activity_manager)
+            self.activity_view.remove_row(activity_id)
+            messagebox.showinfo("Thành công", "Đã xóa hoạt động")
+    
+    def import_from_file(self, data_type):
+        """Nhập dữ liệu hàng loạt từ file CSV hoặc Excel"""
+        filepath = askopenfilename(
+            title="Chọn file dữ liệu",
+            filetypes=[("Excel / CSV", "*.xlsx *.csv"), ("Excel", "*.xlsx"), ("CSV", "*.csv")]
+        )
+        if not filepath:
+            return
+
+        manager = self.datasets[data_type]
+        importer = BulkImporter(manager, data_type)
+        cancel_event = threading.Event()
+        # Ít lô chờ để luồng đọc file không chạy quá xa giao diện
+        batches = queue.Queue(maxsize=4)
+        state = {"finished": False, "lines": 0, "imported": 0, "errors": []}
+
+        progress_window = tk.Toplevel(self.root)
+        progress_window.title("Đang nhập dữ liệu")
+        progress_window.geometry("360x140")
+        progress_window.transient(self.root)
+
+        status_label = ttk.Label(progress_window, text="Đang đọc file...")
+        status_label.pack(pady=10)
+        progress_bar = ttk.Progressbar(progress_window, length=300, mode="indeterminate")
+        progress_bar.pack(pady=5)
+        progress_bar.start(10)
+
+        def cancel():
+            cancel_event.set()
+            status_label.config(text="Đang hủy...")
+            cancel_button.config(state=tk.DISABLED)
+
+        cancel_button = ttk.Button(progress_window, text="Hủy", command=cancel)
+        cancel_button.pack(pady=10)
+        progress_window.protocol("WM_DELETE_WINDOW", cancel)
+
+        def stopped():
+            return cancel_event.is_set() or self.closing.is_set()
+
+        def work():
+            # Đọc và kiểm tra dữ liệu trên luồng nền; các lô được thêm vào manager trên luồng giao diện
+            for batch in importer.read_batches(read_rows(filepath)):
+                while not stopped():
+                    try:
+                        batches.put(batch, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stopped():
+                    return
+
+        def apply_batches():
+            while True:
+                try:
+                    lines, records, errors = batches.get_nowait()
+                except queue.Empty:
+                    return
+                if cancel_event.is_set():
+                    continue
+                state["lines"] = lines
+                state["errors"].extend(errors)
+                if records:
+                    importer.add_batch(records)
+                    # Làm mới giao diện một lần cho mỗi lô thay vì mỗi bản ghi; màn hình
+                    # quản lý có thể chưa mở hoặc đã đóng trong lúc nhập
+                    view = self.open_view(data_type)
+                    if view is not None:
+                        view.insert_rows(records)
+                    state["imported"] += len(records)
+                    self.schedule_save(manager)
+                status_label.config(text=f"Đã đọc {state['lines']} dòng, nhập {state['imported']} bản ghi...")
+
+        def poll():
+            if state["finished"]:
+                return
+            apply_batches()
+            self.root.after(100, poll)
+
+        def on_done(future):
+            state["finished"] = True
+            apply_batches()
+            progress_window.destroy()
+            if future.exception() is not None:
+                messagebox.showerror("Lỗi", f"Không thể nhập dữ liệu: {str(future.exception())}")
+                return
+            result = BulkImporter.result(state["imported"], state["errors"])
+            message = result["message"]
+            if cancel_event.is_set():
+                message = "Đã hủy nhập dữ liệu. " + message
+            if result["errors"]:
+                message += "\n\n" + "\n".join(result["errors"][:10])
+            if result["success"]:
+                messagebox.showinfo("Kết quả nhập dữ liệu", message)
+            else:
+                messagebox.showerror("Lỗi", message)
+
+        self.run_in_background(work, on_done)
+        self.root.after(100, poll)
+
+    def export_excel(self):
+        """Xuất báo cáo Excel"""
+        if self.current_user["type"] != "admin":
+            messagebox.showerror("Lỗi", "Chỉ quản trị viên mới có quyền xuất báo cáo")
+            return
+
+        # Hiển thị hộp thoại chọn loại báo cáo
+        report_type = tk.StringVar(value="crops")
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Chọn loại báo cáo")
+        dialog.geometry("300x400")
+
+        ttk.Label(dialog, text="Chọn loại báo cáo:", font=("Arial", 12)).pack(pady=10)
+        ttk.Radiobutton(dialog, text="Cây trồng", variable=report_type, value="crops").pack(anchor=tk.W, padx=20)
+        ttk.Radiobutton(dialog, text="Vật nuôi", variable=report_type, value="animals").pack(anchor=tk.W, padx=20)
+        ttk.Radiobutton(dialog, text="Hoạt động", variable=report_type, value="activities").pack(anchor=tk.W, padx=20)
+
+        report_format = tk.StringVar(value="xlsx")
+        compress = tk.BooleanVar(value=False)
+        ttk.Label(dialog, text="Định dạng:", font=("Arial", 12)).pack(pady=(10, 0))
+        format_frame = ttk.Frame(dialog)
+        format_frame.pack()
+        for text, value in (("Excel", "xlsx"), ("CSV", "csv"), ("JSON Lines", "jsonl")):
+            ttk.Radiobutton(format_frame, text=text, variable=report_format, value=value).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(dialog, text="Nén gzip (CSV, JSON Lines)", variable=compress).pack()
+
+        range_frame = ttk.Frame(dialog)
+        range_frame.pack(pady=(10, 0))
+        ttk.Label(range_frame, text="Từ ngày:").grid(row=0, column=0, sticky=tk.W)
+        from_entry = ttk.Entry(range_frame, width=12)
+        from_entry.grid(row=0, column=1, padx=5)
+        ttk.Label(range_frame, text="Đến ngày:").grid(row=1, column=0, sticky=tk.W)
+        to_entry = ttk.Entry(range_frame, width=12)
+        to_entry.grid(row=1, column=1, padx=5)
+        ttk.Label(range_frame, text="(để trống là tất cả)", foreground="gray").grid(row=2, column=0, columnspan=2)
+
+        def generate_report():
+            selected_type = report_type.get()
+            managers = {
+                "crops": self.crop_manager,
+                "animals": self.animal_manager,
+                "activities": self.activity_manager,
+            }
+            if selected_type not in managers:
+                messagebox.showerror("Lỗi", "Loại báo cáo không hợp lệ")
+                return
+            load = self.data_loads[selected_type]
+            if not load.done():
+                messagebox.showinfo("Thông báo", "Dữ liệu đang được tải, vui lòng thử lại sau giây lát")
+                return
+            if load.exception() is not None:
+                messagebox.showerror("Lỗi", f"Không thể tải dữ liệu: {str(load.exception())}")
+                return
+
+            try:
+                start = parse_bound(from_entry.get())
+                end = parse_bound(to_entry.get(), end=True)
+            except ValueError as e:
+                messagebox.showerror("Lỗi", str(e))
+                return
+            date_range = None if start is None and end is None else (start, end)
+
+            # Chụp dữ liệu ngay lúc bấm nút để báo cáo không bị ảnh hưởng bởi các thay đổi sau đó
+            data = managers[selected_type].snapshot(date_range)
+            dialog.destroy()
+            self.run_report_in_background(data, selected_type, report_format.get(), compress.get())
+
+        ttk.Button(dialog, text="Xuất báo cáo", command=generate_report).pack(pady=10)
+        ttk.Button(dialog, text="Hủy", command=dialog.destroy).pack()
+
+
+    def run_report_in_background(self, data, report_type, report_format="xlsx", compress=False):
+        """Tạo báo cáo (Excel, CSV hoặc JSON Lines) trên luồng nền, hiển thị tiến độ và cho phép hủy"""
+        cancel_event = threading.Event()
+        events = queue.Queue()
+
+        progress_window = tk.Toplevel(self.root)
+        progress_window.title("Đang xuất báo cáo")
+        progress_window.geometry("360x140")
+        progress_window.transient(self.root)
+
+        status_label = ttk.Label(progress_window, text=f"Đang ghi 0/{len(data)} dòng...")
+        status_label.pack(pady=10)
+        progress_bar = ttk.Progressbar(progress_window, length=300, mode="determinate", maximum=max(len(data), 1))
+        progress_bar.pack(pady=5)
+
+        def cancel():
+            cancel_event.set()
+            status_label.config(text="Đang hủy...")
+            cancel_button.config(state=tk.DISABLED)
+
+        cancel_button = ttk.Button(progress_window, text="Hủy", command=cancel)
+        cancel_button.pack(pady=10)
+        progress_window.protocol("WM_DELETE_WINDOW", cancel)
+
+        def worker():
+            # Không được gọi Tkinter từ luồng này, chỉ gửi sự kiện qua hàng đợi.
+            # openpyxl chỉ được nạp ở lần xuất báo cáo đầu tiên để khởi động nhanh hơn
+            try:
+                from modules.report_generator import ReportGenerator, ReportCancelled
+            except ImportError as e:
+                events.put(("error", str(e)))
+                return
+            options = {
+                "progress_callback": lambda done, total: events.put(("progress", done, total)),
+                "cancel_event": cancel_event,
+            }
+            try:
+                if report_format == "csv":
+                    filepath = ReportGenerator.generate_csv_report(data, report_type, compress=compress, **options)
+                elif report_format == "jsonl":
+                    filepath = ReportGenerator.generate_jsonl_report(data, report_type, compress=compress, **options)
+                else:
+                    from modules.farm_stats import statistics_tables
+                    filepath = ReportGenerator.generate_excel_report(
+                        data, report_type, streaming=True,
+                        statistics=lambda: statistics_tables(report_type, data), **options)
+                events.put(("done", filepath))
+            except ReportCancelled:
+                events.put(("cancelled",))
+            except Exception as e:
+                events.put(("error", str(e)))
+
+        def poll():
+            try:
+                while True:
+                    event = events.get_nowait()
+                    if event[0] == "progress":
+                        _, done, total = event
+                        progress_bar.config(value=done)
+                        if cancel_event.is_set():
+                            pass
+                        elif done == total:
+                            # Đã ghi xong các dòng, còn tính thống kê và lưu file
+                            status_label.config(text="Đang hoàn tất báo cáo...")
+                        else:
+                            status_label.config(text=f"Đang ghi {done}/{total} dòng...")
+                        continue
+                    progress_window.destroy()
+                    if event[0] == "done":
+                        messagebox.showinfo("Thành công", f"Báo cáo đã được lưu tại: {event[1]}")
+                    elif event[0] == "cancelled":
+                        messagebox.showinfo("Thông báo", "Đã hủy xuất báo cáo")
+                    else:
+                        messagebox.showerror("Lỗi", f"Không thể tạo báo cáo: {event[1]}")
+                    return
+            except queue.Empty:
+                pass
+            self.root.after(100, poll)
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(100, poll)
+
+    def logout(self):
+        """Đăng xuất"""
+        self.save_data()
+        self.current_user = None
+        self.show_login_screen()
+    
+    def exit_app(self):
+        """Thoát ứng dụng"""
+        if not self.save_data() and not messagebox.askyesno(
+                "Xác nhận", "Một số thay đổi chưa được lưu và sẽ bị mất. Vẫn thoát?"):
+            return
+        self.closing.set()
+        self.root.quit()
+    
+    def clear_window(self):
+        """Xóa tất cả widget trên cửa sổ chính"""
+        for widget in self.root.winfo_children():
+            widget.destroy()
+        
+        # Xóa thanh menu nếu có
+        try:
+            self.root.config(menu=tk.Menu(self.root))
+        except:
+            pass
\ No newline at end of file
@@ -0,0 +1,130 @@
+from itertools import islice
+
+from modules.search_index import fold_text
+
+class LiveSearch:
+    """
+    Tìm kiếm ngay khi gõ trên một ô nhập liệu
+
+    Truy vấn chỉ chạy sau khi người dùng ngừng gõ một khoảng ngắn (debounce bằng
+    after()). Mỗi lần gõ mới sẽ hủy truy vấn đang chờ hoặc đang chạy. Khi truy
+    vấn mới chỉ gõ thêm vào truy vấn trước (thu hẹp), kết quả trước được lọc lại
+    theo từng phần trên vòng lặp sự kiện thay vì tìm lại trên toàn bộ dữ liệu.
+    Kết quả trước chỉ được dùng lại khi dữ liệu chưa thay đổi (theo stamp).
+    """
+
+    def __init__(self, entry, search, matches, on_results, delay=250, chunk_size=2000, stamp=None):
+        """
+        Args:
+            entry: Ô nhập từ khóa
+            search: Hàm tìm trên toàn bộ dữ liệu, nhận từ khóa và trả về danh sách bản ghi
+                hoặc một iterator (được lấy dần theo từng phần trên vòng lặp sự kiện)
+            matches: Hàm kiểm tra một bản ghi có khớp từ khóa không
+            on_results: Hàm nhận (từ khóa, danh sách kết quả); kết quả None khi từ khóa rỗng
+            delay: Thời gian chờ sau lần gõ cuối (ms)
+            chunk_size: Số bản ghi lọc trong mỗi lượt của vòng lặp sự kiện
+            stamp: Hàm trả về mốc thay đổi của dữ liệu (ví dụ manager.change_stamp);
+                None là không theo dõi được, kết quả trước không bao giờ được dùng lại
+        """
+        self.entry = entry
+        self.search = search
+        self.matches = matches
+        self.on_results = on_results
+        self.delay = delay
+        self.chunk_size = chunk_size
+        self.last_query = ""
+        self.last_results = None
+        self.stamp = stamp or (lambda: None)
+        # Mốc thay đổi của dữ liệu lúc tìm ra last_results
+        self._results_stamp = None
+        self._generation = 0
+        self._after_id = None
+
+        self.entry.bind("<KeyRelease>", self._on_key, add="+")
+        self.entry.bind("<Return>", lambda e: self.search_now(), add="+")
+
+    def _on_key(self, event):
+        self._cancel()
+        self._after_id = self.entry.after(self.delay, self._start)
+
+    def _cancel(self):
+        # Làm cũ mọi truy vấn đang chạy và bỏ truy vấn đang chờ
+        self._generation += 1
+        if self._after_id is not None:
+            self.entry.after_cancel(self._after_id)
+            self._after_id = None
+
+    def search_now(self):
+        """Chạy truy vấn ngay (nút Tìm hoặc phím Enter)"""
+        self._cancel()
+        self.last_query = None
+        self._start()
+
+    def results_current(self):
+        """Dữ liệu chưa thay đổi kể từ lần tìm ra last_results"""
+        stamp = self.stamp()
+        return stamp is not None and stamp == self._results_stamp
+
+    def reapply(self):
+        """Hiển thị lại kết quả hiện có (khi đổi bộ lọc), tìm lại nếu dữ liệu đã thay đổi"""
+        if self.last_results is not None and not self.results_current():
+            self.search_now()
+        else:
+            self.on_results(self.last_query, self.last_results)
+
+    def _start(self):
+        self._after_id = None
+        query = self.entry.get().strip()
+        if query == self.last_query:
+            return
+        stamp = self.stamp()
+        if not query:
+            self._finish(query, None, stamp)
+            return
+
+        generation = self._generation
+        previous = self.last_results
+        if (isinstance(previous, list) and self.last_query and self.results_current()
+                and fold_text(query).startswith(fold_text(self.last_query))):
+            self._filter_chunk(generation, query, stamp, previous, 0, [])
+            return
+        results = self.search(query)
+        if hasattr(results, "__len__"):
+            self._finish(query, results, stamp)
+        else:
+            self._collect_chunk(generation, query, stamp, iter(results), [])
+
+    def _filter_chunk(self, generation, query, stamp, source, start, results):
+        if generation != self._generation:
+            # Đã có lần gõ mới hơn
+            return
+        end = min(start + self.chunk_size, len(source))
+        results.extend(record for record in source[start:end] if self.matches(record, query))
+        if end < len(source):
+            self._after_id = self.entry.after(1, self._filter_chunk, generation, query, stamp, source, end, results)
+        else:
+            self._after_id = None
+            self._finish(query, results, stamp)
+
+    def _collect_chunk(self, generation, query, stamp, source, results):
+        if generation != self._generation:
+            return
+        chunk = list(islice(source, self.chunk_size))
+        results.extend(record for record in chunk if record is not None)
+        if len(chunk) == self.chunk_size:
+            self._after_id = self.entry.after(1, self._collect_chunk, generation, query, stamp, source, results)
+        else:
+            self._after_id = None
+            self._finish(query, results, stamp)
+
+    def _finish(self, query, results, stamp):
+        if stamp != self.stamp():
+            # Dữ liệu thay đổi trong lúc lấy kết quả theo từng phần: tìm lại
+            self.last_query = None
+            self.last_results = None
+            self._start()
+            return
+        self.last_query = query
+        self.last_results = results
+        self._results_stamp = stamp
+        self.on_results(query, results)
\ No newline at end of file
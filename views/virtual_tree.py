@@ -0,0 +1,233 @@
+import tkinter as tk
+from tkinter import ttk
+
+class VirtualTreeview:
+    """
+    Hiển thị danh sách lớn trên ttk.Treeview ở chế độ ảo
+
+    Chỉ các dòng nằm trong vùng đang nhìn thấy (cộng thêm vài dòng dự phòng)
+    được tạo thành item của Treeview; khi cuộn, các item có sẵn được dùng lại
+    với giá trị mới thay vì xóa và tạo lại. Danh sách nguồn chỉ cần hỗ trợ
+    len() và cắt lát (list hoặc danh sách SQLite).
+    """
+
+    def __init__(self, tree, scrollbar, row_values, overscan=5):
+        """
+        Args:
+            tree: Treeview dùng để hiển thị
+            scrollbar: Thanh cuộn dọc gắn với Treeview
+            row_values: Hàm chuyển một bản ghi thành tuple giá trị các cột
+            overscan: Số dòng tạo thêm ngoài vùng nhìn thấy
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_values = row_values
+        self.overscan = overscan
+        self.rows = []
+        self.matches = None
+        self._positions = None
+        self.first = 0
+        self._selected_ids = set()
+        self._restoring_selection = False
+        self._render_pending = False
+
+        style_height = ttk.Style(tree).lookup("Treeview", "rowheight")
+        self.row_height = int(style_height) if style_height else 20
+
+        self.scrollbar.configure(command=self.yview)
+        self.tree.bind("<Configure>", lambda e: self.schedule_render())
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._scroll_key(-self.visible_count()))
+        self.tree.bind("<Next>", lambda e: self._scroll_key(self.visible_count()))
+        self.tree.bind("<Home>", lambda e: self._scroll_key(-len(self.rows)))
+        self.tree.bind("<End>", lambda e: self._scroll_key(len(self.rows)))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+
+    def set_rows(self, rows, matches=None, keep_position=False):
+        """
+        Đặt danh sách bản ghi cần hiển thị
+
+        Args:
+            rows: Danh sách bản ghi
+            matches: Điều kiện lọc đã tạo ra rows. None nghĩa là rows chính là
+                danh sách dữ liệu của manager (luôn được cập nhật sẵn); kết quả
+                truy vấn theo nhu cầu (không phải list) cũng luôn cập nhật sẵn
+            keep_position: Giữ nguyên vị trí cuộn hiện tại
+        """
+        self.rows = rows
+        self.matches = matches
+        self._positions = None
+        if not keep_position:
+            self.first = 0
+            self._selected_ids = set()
+        self.render()
+
+    def _owns_rows(self):
+        # Danh sách đã lọc do view giữ, cần tự cập nhật khi dữ liệu thay đổi
+        return self.matches is not None and isinstance(self.rows, list)
+
+    def _position_of(self, record_id):
+        # Chỉ mục id -> vị trí trong danh sách đã lọc, tạo lại khi cần
+        if self._positions is None:
+            self._positions = {record["id"]: i for i, record in enumerate(self.rows)}
+        return self._positions.get(record_id)
+
+    def insert_rows(self, records):
+        """Hiển thị thêm các bản ghi vừa được thêm, giữ nguyên bộ lọc và vị trí cuộn"""
+        if self._owns_rows():
+            for record in records:
+                if not self.matches(record):
+                    continue
+                if self._positions is not None:
+                    self._positions[record["id"]] = len(self.rows)
+                self.rows.append(record)
+        self.render()
+
+    def insert_row(self, record):
+        self.insert_rows([record])
+
+    def update_row(self, record):
+        """Cập nhật dòng của một bản ghi vừa được sửa"""
+        if self._owns_rows():
+            pos = self._position_of(record["id"])
+            if pos is None:
+                self.insert_row(record)
+                return
+            if not self.matches(record):
+                self.remove_row(record["id"])
+                return
+            self.rows[pos] = record
+        # Chỉ cần sửa item nếu dòng đang nằm trong vùng nhìn thấy
+        for item in self.tree.get_children():
+            values = self.tree.item(item, "values")
+            if values and int(values[0]) == record["id"]:
+                self.tree.item(item, values=self.row_values(record))
+                return
+
+    def remove_row(self, record_id):
+        """Bỏ dòng của một bản ghi vừa bị xóa"""
+        self._selected_ids.discard(record_id)
+        if self._owns_rows():
+            pos = self._position_of(record_id)
+            if pos is None:
+                return
+            del self.rows[pos]
+            self._positions = None
+        self.render()
+
+    def visible_count(self):
+        height = self.tree.winfo_height()
+        if height <= 1:
+            # Treeview chưa được vẽ, dùng số dòng mặc định
+            return int(self.tree.cget("height"))
+        # Trừ phần tiêu đề cột (xấp xỉ một dòng)
+        return max(1, height // self.row_height - 1)
+
+    def schedule_render(self):
+        if not self._render_pending:
+            self._render_pending = True
+            self.tree.after_idle(self._deferred_render)
+
+    def _deferred_render(self):
+        self._render_pending = False
+        if self.tree.winfo_exists():
+            self.render()
+
+    def render(self):
+        """Vẽ lại các dòng trong vùng nhìn thấy, dùng lại các item đã có"""
+        total = len(self.rows)
+        visible = self.visible_count()
+        self.first = max(0, min(self.first, total - visible))
+        window = self.rows[self.first:self.first + visible + self.overscan]
+
+        items = self.tree.get_children()
+        restore = []
+        for i, record in enumerate(window):
+            values = self.row_values(record)
+            if i < len(items):
+                item = items[i]
+                self.tree.item(item, values=values)
+            else:
+                item = self.tree.insert("", tk.END, values=values)
+            if record["id"] in self._selected_ids:
+                restore.append(item)
+        if len(items) > len(window):
+            self.tree.delete(*items[len(window):])
+        self.tree.yview_moveto(0)
+
+        if set(restore) != set(self.tree.selection()):
+            self._restoring_selection = True
+            self.tree.selection_set(restore)
+            self.tree.after_idle(self._end_restore)
+
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _end_restore(self):
+        self._restoring_selection = False
+
+    def _on_select(self, event):
+        if self._restoring_selection:
+            return
+        self._selected_ids = set()
+        for item in self.tree.selection():
+            values = self.tree.item(item, "values")
+            if values:
+                self._selected_ids.add(int(values[0]))
+
+    def scroll(self, delta):
+        """Cuộn delta dòng (âm là cuộn lên)"""
+        first = self.first + delta
+        if first != self.first:
+            self.first = first
+            self.render()
+        return "break"
+
+    def yview(self, *args):
+        """Xử lý lệnh từ thanh cuộn (moveto / scroll units|pages)"""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * len(self.rows))
+            self.render()
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2] == "pages":
+                amount *= self.visible_count()
+            self.scroll(amount)
+
+    def _on_mousewheel(self, event):
+        # Windows: delta là bội số của 120, macOS: delta nhỏ
+        step = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self.scroll(-step * 3)
+
+    def _scroll_key(self, delta):
+        self.scroll(delta)
+        return "break"
+
+    def _move_selection(self, delta):
+        items = self.tree.get_children()
+        if not items:
+            return "break"
+        selection = self.tree.selection()
+        index = items.index(selection[0]) if selection else -1
+        target = self.first + index + delta
+        if target < 0 or target >= len(self.rows):
+            return "break"
+        # Cuộn nếu dòng mới nằm ngoài vùng nhìn thấy
+        visible = self.visible_count()
+        if target < self.first:
+            self.first = target
+        elif target >= self.first + visible:
+            self.first = target - visible + 1
+        self._selected_ids = {self.rows[target]["id"]}
+        self.render()
+        item = self.tree.get_children()[target - self.first]
+        self.tree.focus(item)
+        return "break"
\ No newline at end of file